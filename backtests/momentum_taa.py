@@ -14,21 +14,34 @@ from qstrader.signals.signals_collection import SignalsCollection
 from qstrader.statistics.tearsheet import TearsheetStatistics
 from qstrader.trading.backtest import BacktestTradingSession
 
-if __name__ == "__main__":
-    # Duration of the backtest
-    start_dt = pd.Timestamp("1998-12-22 14:30:00", tz=pytz.UTC)
-    burn_in_dt = pd.Timestamp("1999-12-22 14:30:00", tz=pytz.UTC)
-    end_dt = pd.Timestamp("2020-12-31 23:59:00", tz=pytz.UTC)
+# Duration of the backtest
+start_dt = pd.Timestamp("1998-12-22 14:30:00", tz=pytz.UTC)
+burn_in_dt = pd.Timestamp("1999-12-22 14:30:00", tz=pytz.UTC)
+end_dt = pd.Timestamp("2020-12-31 23:59:00", tz=pytz.UTC)
 
-    # Model parameters
-    mom_lookback = 126  # Six months worth of business days
-    mom_top_n = 3  # Number of assets to include at any one time
+# Construct the symbols and assets necessary for the backtest
+# This utilises the SPDR US sector ETFs, all beginning with XL
+strategy_symbols = ["XL%s" % sector for sector in "BCEFIKPUVY"]
+assets = ["EQ:%s" % symbol for symbol in strategy_symbols]
+
+csv_dir = os.environ.get("QSTRADER_CSV_DATA_DIR", "./data")
 
-    # Construct the symbols and assets necessary for the backtest
-    # This utilises the SPDR US sector ETFs, all beginning with XL
-    strategy_symbols = ["XL%s" % sector for sector in "BCEFIKPUVY"]
-    assets = ["EQ:%s" % symbol for symbol in strategy_symbols]
 
+def create_data():
+    """
+    Load the strategy pricing data once, such that it can be
+    shared between the backtests of a parameter sweep.
+    """
+    # To avoid loading all CSV files in the directory, set the
+    # data source to load only those provided symbols
+    return CSVDailyBarDataSource(csv_dir, Equity, csv_symbols=strategy_symbols)
+
+
+def create_session(strategy_data_source, mom_lookback=126, mom_top_n=3):
+    """
+    Construct the (unrun) strategy backtest for the provided
+    momentum lookback and number of assets held.
+    """
     # As this is a dynamic universe of assets (XLC is added later)
     # we need to tell QSTrader when XLC can be included. This is
     # achieved using an asset dates dictionary
@@ -39,13 +52,6 @@ if __name__ == "__main__":
 
     # a dynamic universe is used when stocks are added to the univrse. stocks cannot be removeds
     strategy_universe = DynamicUniverse(asset_dates)
-
-    # To avoid loading all CSV files in the directory, set the
-    # data source to load only those provided symbols
-    csv_dir = os.environ.get("QSTRADER_CSV_DATA_DIR", "./data")
-    strategy_data_source = CSVDailyBarDataSource(
-        csv_dir, Equity, csv_symbols=strategy_symbols
-    )
     strategy_data_handler = BacktestDataHandler(
         strategy_universe, data_sources=[strategy_data_source]
     )
@@ -60,8 +66,8 @@ if __name__ == "__main__":
         signals, mom_lookback, mom_top_n, strategy_universe, strategy_data_handler
     )
 
-    # Construct the strategy backtest and run it
-    strategy_backtest = BacktestTradingSession(
+    # Construct the strategy backtest
+    return BacktestTradingSession(
         start_dt,
         end_dt,
         strategy_universe,
@@ -73,6 +79,15 @@ if __name__ == "__main__":
         burn_in_dt=burn_in_dt,
         data_handler=strategy_data_handler,
     )
+
+
+if __name__ == "__main__":
+    # Model parameters
+    mom_lookback = 126  # Six months worth of business days
+    mom_top_n = 3  # Number of assets to include at any one time
+
+    # Construct the strategy backtest and run it
+    strategy_backtest = create_session(create_data(), mom_lookback, mom_top_n)
     strategy_backtest.run()
 
     # Construct benchmark assets (buy & hold SPY)
@@ -1,36 +1,43 @@
 import argparse
-import os
 
-import yfinance as yf
+from qstrader.data.ingestion import (
+    CSVFileDataProvider,
+    DataIngester,
+    YahooFinanceDataProvider,
+)
 
 
-def download_stock_data(input_file, output_directory):
+def download_stock_data(
+    input_file,
+    output_directory,
+    incremental=False,
+    max_workers=4,
+    max_retries=3,
+    provider=None,
+    adjust=False,
+):
     """Reads the input file, fetches stock data, and saves it to the output directory."""
-    os.makedirs(output_directory, exist_ok=True)
+    if provider is None:
+        provider = YahooFinanceDataProvider()
 
-    with open(input_file, "r") as file:
-        for line in file:
-            parts = line.strip().split(",")
-            if len(parts) != 3:
-                print(f"Skipping invalid line: {line.strip()}")
-                continue
-
-            ticker, start_date, end_date = parts
-            print(f"Fetching data for {ticker} from {start_date} to {end_date}...")
-
-            try:
-                data = yf.download(ticker, start=start_date, end=end_date)
-                if data.empty:
-                    print(f"No data found for {ticker}. Skipping.")
-                    continue
-
-                output_file = os.path.join(output_directory, f"{ticker}.csv")
-                data.columns = data.columns.droplevel(1)
-                data.to_csv(output_file)
-                print(f"Saved {ticker} data to {output_file}")
+    ingester = DataIngester(
+        provider,
+        output_directory,
+        incremental=incremental,
+        max_workers=max_workers,
+        max_retries=max_retries,
+        adjust=adjust,
+    )
+    results = ingester.ingest(ingester.read_ticker_file(input_file))
 
-            except Exception as e:
-                print(f"Error fetching data for {ticker}: {e}")
+    failed = [ticker for ticker, outcome in results.items() if outcome == "failed"]
+    print(
+        f"Ingested {len(results) - len(failed)} of {len(results)} tickers "
+        f"into {output_directory}"
+    )
+    if failed:
+        print(f"Failed tickers: {', '.join(failed)}")
+    return results
 
 
 def main():
@@ -44,11 +51,50 @@ def main():
         "--output_directory",
         type=str,
         default="./data",
-        help="Directory where output CSV files will be saved (default: ./dataa).",
+        help="Directory where output CSV files will be saved (default: ./data).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch and append the dates missing from existing CSV files.",
+    )
+    parser.add_argument(
+        "--max_workers",
+        type=int,
+        default=4,
+        help="Maximum number of concurrent downloads (default: 4).",
+    )
+    parser.add_argument(
+        "--max_retries",
+        type=int,
+        default=3,
+        help="Number of retries for each failed download (default: 3).",
+    )
+    parser.add_argument(
+        "--adjust",
+        action="store_true",
+        help="Store split/dividend adjusted bars and factors alongside the raw bars.",
+    )
+    parser.add_argument(
+        "--source_directory",
+        type=str,
+        default=None,
+        help="Ingest from a directory of CSV files rather than Yahoo Finance.",
     )
 
     args = parser.parse_args()
-    download_stock_data(args.input_file, args.output_directory)
+    provider = None
+    if args.source_directory is not None:
+        provider = CSVFileDataProvider(args.source_directory)
+    download_stock_data(
+        args.input_file,
+        args.output_directory,
+        incremental=args.incremental,
+        max_workers=args.max_workers,
+        max_retries=args.max_retries,
+        provider=provider,
+        adjust=args.adjust,
+    )
 
 
 if __name__ == "__main__":
@@ -7,6 +7,7 @@ from qstrader.broker.broker import Broker
 from qstrader.broker.fee_model.fee_model import FeeModel
 from qstrader.broker.portfolio.portfolio import Portfolio
 from qstrader.broker.transaction.transaction import Transaction
+from qstrader.data.backtest_data_handler import get_assets_latest_prices
 from qstrader.broker.fee_model.zero_fee_model import ZeroFeeModel
 
 
@@ -658,12 +659,16 @@ class SimulatedBroker(Broker):
         """
         self.current_dt = dt
 
-        # Update portfolio asset values
+        # Update portfolio asset values, obtaining the
+        # prices for all of a portfolio's assets at once
         for portfolio in self.portfolios:
-            for asset in self.portfolios[portfolio].pos_handler.positions:
-                mid_price = self.data_handler.get_asset_latest_mid_price(
-                    dt, asset
-                )
+            assets = list(self.portfolios[portfolio].pos_handler.positions)
+            if len(assets) == 0:
+                continue
+            mid_prices = get_assets_latest_prices(
+                self.data_handler, dt, assets, "mid"
+            )
+            for asset, mid_price in zip(assets, mid_prices):
                 self.portfolios[portfolio].update_market_value_of_asset(
                     asset, mid_price, self.current_dt
                 )
@@ -680,3 +685,83 @@ class SimulatedBroker(Broker):
             sorted_orders = sorted(orders, key=lambda x: x[1].direction)
             for portfolio, order in sorted_orders:
                 self._execute_order(dt, portfolio, order)
+
+    def has_open_orders(self):
+        """
+        Check whether any sub-portfolio has orders awaiting execution.
+
+        Returns
+        -------
+        `Boolean`
+            Whether there are any open orders.
+        """
+        return any(
+            not open_orders.empty() for open_orders in self.open_orders.values()
+        )
+
+    def fast_forward(self, dts):
+        """
+        Advance the SimulatedBroker across many timestamps at which
+        no orders are open in a single vectorised step, rather than
+        calling 'update' at each of them.
+
+        The positions of every sub-portfolio are marked to market at
+        all of the timestamps at once from the data handler, giving the
+        total account equity at each timestamp. The positions are then
+        left marked at the final timestamp, as if 'update' had been
+        called in turn at each timestamp. As with 'update', a price
+        which is not positive at any of the timestamps raises.
+
+        Parameters
+        ----------
+        dts : `pd.DatetimeIndex`
+            The sorted timestamps to advance the broker across.
+
+        Returns
+        -------
+        `np.ndarray`
+            The total account ('master') equity at each timestamp.
+        """
+        if self.has_open_orders():
+            raise ValueError(
+                "Unable to fast forward the simulated broker from %s "
+                "while orders are awaiting execution." % self.current_dt
+            )
+
+        master_equity = np.zeros(len(dts))
+        for portfolio in self.portfolios.values():
+            positions = portfolio.pos_handler.positions
+            assets = list(positions)
+            market_value = np.zeros(len(dts))
+            if len(assets) > 0:
+                mid_prices = self.data_handler.get_assets_mid_price_history(
+                    dts, assets
+                )
+                # As with updating the positions timestamp by timestamp,
+                # prices which are not positive are rejected
+                for i, asset in enumerate(assets):
+                    non_positive = np.flatnonzero(mid_prices[:, i] <= 0.0)
+                    if len(non_positive) > 0:
+                        raise ValueError(
+                            'Market price "%s" of asset "%s" at "%s" must be '
+                            'positive to update the position.' % (
+                                mid_prices[non_positive[0], i], asset,
+                                dts[non_positive[0]]
+                            )
+                        )
+
+                # Accumulate the market values asset by asset, in the
+                # same order as the portfolio, such that the equity is
+                # identical to that obtained timestamp by timestamp
+                for i, asset in enumerate(assets):
+                    market_value = market_value + (
+                        mid_prices[:, i] * positions[asset].net_quantity
+                    )
+                for asset, mid_price in zip(assets, mid_prices[-1]):
+                    portfolio.update_market_value_of_asset(
+                        asset, mid_price, dts[-1]
+                    )
+            master_equity = master_equity + (market_value + portfolio.cash)
+
+        self.current_dt = dts[-1]
+        return master_equity
@@ -0,0 +1,138 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+RAW_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+ADJUSTED_COLUMNS = ["Adj Open", "Adj High", "Adj Low", "Adj Close", "Adj Volume"]
+ADJ_FACTOR_COLUMN = "Adj Factor"
+
+
+def compute_adjustment_factors(bar_df):
+    """
+    Compute the cumulative split/dividend adjustment factor of each daily
+    bar, i.e. the ratio of the adjusted to the raw closing price.
+
+    Parameters
+    ----------
+    bar_df : `pd.DataFrame`
+        The raw daily bars, including 'Close' and 'Adj Close' columns.
+
+    Returns
+    -------
+    `pd.Series`
+        The adjustment factors.
+    """
+    if "Adj Close" not in bar_df.columns:
+        raise ValueError(
+            "Unable to locate Adjusted Close pricing column in CSV data file. "
+            "Prices cannot be adjusted."
+        )
+    return (bar_df["Adj Close"] / bar_df["Close"]).rename(ADJ_FACTOR_COLUMN)
+
+
+def adjusted_view(bar_df):
+    """
+    Produce the adjusted OHLC (and volume, if present) view of raw
+    daily bars, utilising the stored adjustment factors if available.
+
+    Prices are multiplied by the adjustment factor, whereas volume is
+    divided by it, such that the traded value of each bar is unchanged.
+
+    Parameters
+    ----------
+    bar_df : `pd.DataFrame`
+        The raw daily bars, with either an 'Adj Factor' or an
+        'Adj Close' column.
+
+    Returns
+    -------
+    `pd.DataFrame`
+        The adjusted bars, with the raw column names.
+    """
+    if ADJ_FACTOR_COLUMN in bar_df.columns:
+        factors = bar_df[ADJ_FACTOR_COLUMN].to_numpy()
+    else:
+        factors = compute_adjustment_factors(bar_df).to_numpy()
+    columns = [column for column in RAW_COLUMNS if column in bar_df.columns]
+    values = bar_df[columns].to_numpy(dtype=np.float64)
+    scale = np.array([-1.0 if column == "Volume" else 1.0 for column in columns])
+    return pd.DataFrame(
+        values * factors[:, np.newaxis] ** scale,
+        index=bar_df.index, columns=columns
+    )
+
+
+def raw_view(adjusted_df, factors):
+    """
+    Produce the raw view of adjusted daily bars from their
+    adjustment factors, reversing 'adjusted_view'.
+
+    Parameters
+    ----------
+    adjusted_df : `pd.DataFrame`
+        The adjusted bars, with the raw column names.
+    factors : `pd.Series` or `np.ndarray`
+        The adjustment factor of each bar.
+
+    Returns
+    -------
+    `pd.DataFrame`
+        The raw bars.
+    """
+    factors = np.asarray(factors, dtype=np.float64)
+    columns = list(adjusted_df.columns)
+    scale = np.array([-1.0 if column == "Volume" else 1.0 for column in columns])
+    return pd.DataFrame(
+        adjusted_df.to_numpy(dtype=np.float64) / factors[:, np.newaxis] ** scale,
+        index=adjusted_df.index, columns=columns
+    )
+
+
+def add_adjusted_columns(bar_df):
+    """
+    Append the adjusted OHLCV columns and the adjustment factors
+    to a raw daily bar DataFrame.
+
+    Parameters
+    ----------
+    bar_df : `pd.DataFrame`
+        The raw daily bars, including an 'Adj Close' column.
+
+    Returns
+    -------
+    `pd.DataFrame`
+        The raw bars along with the 'Adj Open', 'Adj High', 'Adj Low',
+        'Adj Close', 'Adj Volume' and 'Adj Factor' columns.
+    """
+    factors = compute_adjustment_factors(bar_df)
+    raw_df = bar_df.drop(
+        columns=[column for column in ADJUSTED_COLUMNS + [ADJ_FACTOR_COLUMN]
+                 if column in bar_df.columns and column != "Adj Close"]
+    )
+    adjusted_df = adjusted_view(raw_df.assign(**{ADJ_FACTOR_COLUMN: factors}))
+    adjusted_df.columns = ["Adj %s" % column for column in adjusted_df.columns]
+    # Retain the provider's adjusted closes rather than recomputed ones
+    adjusted_df["Adj Close"] = bar_df["Adj Close"]
+    return pd.concat(
+        [raw_df.drop(columns=["Adj Close"]), adjusted_df, factors], axis=1
+    )
+
+
+def adjust_csv_file(csv_path):
+    """
+    Run the adjustment stage upon a stored daily bar CSV file, rewriting
+    it with the adjusted OHLCV columns and adjustment factors alongside
+    the raw data. The file is replaced atomically.
+
+    Parameters
+    ----------
+    csv_path : `str`
+        The path to the CSV file.
+    """
+    bar_df = pd.read_csv(csv_path, index_col=0)
+    adjusted_df = add_adjusted_columns(bar_df)
+    tmp_path = "%s.%d.%d.tmp" % (csv_path, os.getpid(), threading.get_ident())
+    adjusted_df.to_csv(tmp_path)
+    os.replace(tmp_path, csv_path)
@@ -1,37 +1,228 @@
 import numpy as np
 
 
+# Coverage bounds for data sources unable to report their coverage
+MIN_TIMESTAMP = np.iinfo(np.int64).min
+MAX_TIMESTAMP = np.iinfo(np.int64).max
+
+
+def get_assets_latest_prices(data_handler, dt, asset_symbols, price):
+    """
+    Obtain the latest prices of many assets from a data handler, using
+    its batch method (e.g. 'get_assets_latest_mid_prices') if provided
+    and its single asset method (e.g. 'get_asset_latest_mid_price')
+    otherwise, such that data handlers lacking the batch methods
+    remain supported.
+
+    Parameters
+    ----------
+    data_handler : `DataHandler`
+        The data handler to obtain the prices from.
+    dt : `pd.Timestamp`
+        The timestamp to obtain the prices for.
+    asset_symbols : `list[str]`
+        The asset symbols to obtain the prices for.
+    price : `str`
+        The price type, e.g. 'mid' or 'ask'.
+
+    Returns
+    -------
+    `np.ndarray`
+        The prices aligned to the provided asset order.
+    """
+    batch_method = getattr(data_handler, "get_assets_latest_%s_prices" % price, None)
+    if batch_method is not None:
+        return batch_method(dt, asset_symbols)
+    point_method = getattr(data_handler, "get_asset_latest_%s_price" % price)
+    return np.array(
+        [point_method(dt, asset) for asset in asset_symbols], dtype=np.float64
+    )
+
+
 class BacktestDataHandler(object):
-    """ """
+    """
+    Provides the latest and historical asset prices to the
+    components of a backtest from one or more data sources,
+    listed in order of priority.
+
+    Each asset is routed to the data sources providing it via a
+    routing table, built when the asset is first requested. Data
+    sources exposing 'get_asset_coverage' report the timestamp range
+    they cover for each asset. A request is sent to the highest
+    priority source covering its timestamp, such that a lower
+    priority (fallback) source serves any timestamps outside of the
+    coverage of the higher priority sources, without attempting
+    (and failing) lookups against sources lacking the asset.
+
+    Sources without coverage information are assumed to cover all
+    assets and timestamps, with their lookup failures treated
+    as missing prices.
+
+    Parameters
+    ----------
+    universe : `Universe`
+        The Asset Universe of the backtest.
+    data_sources : `list`, optional
+        The data sources, in order of priority.
+    """
 
     def __init__(self, universe, data_sources=None):
         self.universe = universe
         self.data_sources = data_sources
+        self.asset_routes = {}
 
-    def get_asset_latest_bid_price(self, dt, asset_symbol):
-        """ """
-        bid = np.nan
+    def prefetch(self, dt):
+        """
+        Begin loading, in the background, the pricing data of the
+        assets within the universe at the provided timestamp, for
+        those data sources supporting lazy loading.
 
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp at which to determine the universe assets.
+        """
+        assets = self.universe.get_assets(dt)
         for ds in self.data_sources:
-            try:
-                bid = ds.get_bid(dt, asset_symbol)
-                if not np.isnan(bid):
-                    return bid
-            except Exception:
-                bid = np.nan
-        return bid
+            if hasattr(ds, "prefetch"):
+                ds.prefetch(assets)
 
-    def get_asset_latest_ask_price(self, dt, asset_symbol):
-        """ """
-        ask = np.nan
+    def shutdown_prefetch(self):
+        """
+        Wait for any background loads of the data sources
+        to complete and shut down their background threads.
+        """
         for ds in self.data_sources:
-            try:
-                ask = ds.get_ask(dt, asset_symbol)
-                if not np.isnan(ask):
-                    return ask
-            except Exception:
-                ask = np.nan
-        return ask
+            if hasattr(ds, "shutdown_prefetch"):
+                ds.shutdown_prefetch()
+
+    def reset_routes(self):
+        """
+        Discard the routing table, e.g. if the data sources have
+        been modified, such that it is rebuilt upon request.
+        """
+        self.asset_routes = {}
+
+    def _get_asset_routes(self, asset_symbol):
+        """
+        Obtain (building if necessary) the routing table entries of
+        an asset. Each entry consists of a data source, the first and
+        last int64 nanosecond timestamps it covers for the asset and
+        whether its lookups must be guarded against failure.
+
+        Parameters
+        ----------
+        asset_symbol : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `list[tuple]`
+            The routes of the asset, in order of data source priority.
+        """
+        routes = self.asset_routes.get(asset_symbol)
+        if routes is None:
+            routes = []
+            for ds in self.data_sources:
+                if hasattr(ds, "get_asset_coverage"):
+                    coverage = ds.get_asset_coverage(asset_symbol)
+                    if coverage is not None:
+                        routes.append(
+                            (ds, coverage[0].value, coverage[1].value, False)
+                        )
+                else:
+                    routes.append((ds, MIN_TIMESTAMP, MAX_TIMESTAMP, True))
+            self.asset_routes[asset_symbol] = routes
+        return routes
+
+    def _route(self, dt, asset_symbol):
+        """
+        Determine the candidate data sources for an asset at a
+        particular timestamp. Sources covering the timestamp are
+        preferred, followed by those whose coverage ended beforehand
+        (which provide their final, stale, price). Sources whose
+        coverage begins afterwards are excluded.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp of the request.
+        asset_symbol : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `list[tuple]`
+            The routes of the candidate data sources.
+        """
+        routes = self._get_asset_routes(asset_symbol)
+        ts = dt.value
+        covering = [route for route in routes if route[1] <= ts <= route[2]]
+        if len(covering) == len(routes):
+            return covering
+        return covering + [route for route in routes if route[2] < ts]
+
+    @staticmethod
+    def _query_source(route, method, dt, asset_symbol):
+        """
+        Query a single data source for an asset value.
+
+        Parameters
+        ----------
+        route : `tuple`
+            The routing table entry of the data source.
+        method : `str`
+            The name of the data source lookup method.
+        dt : `pd.Timestamp`
+            The timestamp of the request.
+        asset_symbol : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `float`
+            The value, NaN if unavailable.
+        """
+        ds, _, _, guarded = route
+        if not guarded:
+            return getattr(ds, method)(dt, asset_symbol)
+        try:
+            return getattr(ds, method)(dt, asset_symbol)
+        except Exception:
+            return np.nan
+
+    def _get_asset_latest_value(self, dt, asset_symbol, method):
+        """
+        Obtain the latest value of a pricing field for an asset from
+        the routed data sources.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp of the request.
+        asset_symbol : `str`
+            The asset symbol.
+        method : `str`
+            The name of the data source lookup method.
+
+        Returns
+        -------
+        `float`
+            The value, NaN if no data source provides one.
+        """
+        for route in self._route(dt, asset_symbol):
+            value = self._query_source(route, method, dt, asset_symbol)
+            if not np.isnan(value):
+                return value
+        return np.nan
+
+    def get_asset_latest_bid_price(self, dt, asset_symbol):
+        """Retrieve the latest bid price for an asset."""
+        return self._get_asset_latest_value(dt, asset_symbol, "get_bid")
+
+    def get_asset_latest_ask_price(self, dt, asset_symbol):
+        """Retrieve the latest ask price for an asset."""
+        return self._get_asset_latest_value(dt, asset_symbol, "get_ask")
 
     def get_asset_latest_bid_ask_price(self, dt, asset_symbol):
         """ """
@@ -49,40 +240,346 @@ class BacktestDataHandler(object):
 
     def get_asset_latest_high_price(self, dt, asset_symbol):
         """Retrieve the latest high price for an asset."""
-        high = np.nan
-        for ds in self.data_sources:
-            try:
-                high = ds.get_high(dt, asset_symbol)
-                if not np.isnan(high):
-                    return high
-            except Exception:
-                high = np.nan
-        return high
+        return self._get_asset_latest_value(dt, asset_symbol, "get_high")
 
     def get_asset_latest_low_price(self, dt, asset_symbol):
         """Retrieve the latest low price for an asset."""
-        low = np.nan
-        for ds in self.data_sources:
-            try:
-                low = ds.get_low(dt, asset_symbol)
-                if not np.isnan(low):
-                    return low
-            except Exception:
-                low = np.nan
-        return low
+        return self._get_asset_latest_value(dt, asset_symbol, "get_low")
 
     def get_asset_latest_open_price(self, dt, asset_symbol):
         """Retrieve the latest open price for an asset."""
-        open = np.nan
-        for ds in self.data_sources:
-            try:
+        return self._get_asset_latest_value(dt, asset_symbol, "get_open")
 
-                open = ds.get_open(dt, asset_symbol)
-                if not np.isnan(open):
-                    return open
-            except Exception:
-                open = np.nan
-        return open
+    def get_asset_latest_volume(self, dt, asset_symbol):
+        """Retrieve the volume of the latest closed bar for an asset."""
+        return self.get_assets_latest_volume(dt, [asset_symbol])[0]
+
+    def _get_assets_latest_values(
+        self, dt, asset_symbols, batch_method, point_method
+    ):
+        """
+        Obtain the latest values of a pricing field for many assets,
+        aligned to the provided asset order.
+
+        Assets are grouped by their routed data source, such that each
+        source is queried once for all of its assets, using its batch
+        interface if available and per-asset lookups otherwise. Assets
+        still lacking a value are then grouped by their next
+        candidate source, and so on.
+
+        As with single asset lookups, failures of data sources without
+        coverage information are treated as missing prices. A failed
+        batch lookup is retried asset by asset, such that only the
+        assets the source lacks are missing.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to obtain the values for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the values for.
+        batch_method : `str`
+            The name of the data source batch lookup method.
+        point_method : `str`
+            The name of the data source single asset lookup method.
+
+        Returns
+        -------
+        `np.ndarray`
+            The values, NaN where no data source provides a value.
+        """
+        asset_symbols = list(asset_symbols)
+        values = np.full(len(asset_symbols), np.nan)
+        asset_routes = [self._route(dt, asset) for asset in asset_symbols]
+
+        depth = 0
+        while True:
+            groups = {}
+            for i in np.flatnonzero(np.isnan(values)):
+                if depth < len(asset_routes[i]):
+                    route = asset_routes[i][depth]
+                    groups.setdefault(id(route[0]), (route, []))[1].append(i)
+            if len(groups) == 0:
+                break
+
+            for route, indices in groups.values():
+                ds, _, _, guarded = route
+                assets = [asset_symbols[i] for i in indices]
+                if hasattr(ds, batch_method):
+                    if not guarded:
+                        values[indices] = getattr(ds, batch_method)(dt, assets)
+                        continue
+                    try:
+                        values[indices] = getattr(ds, batch_method)(dt, assets)
+                        continue
+                    except Exception:
+                        pass
+                if not hasattr(ds, point_method):
+                    # The data source does not provide the field
+                    continue
+                values[indices] = [
+                    self._query_source(route, point_method, dt, asset)
+                    for asset in assets
+                ]
+            depth += 1
+        return values
+
+    def get_assets_latest_bid_prices(self, dt, asset_symbols):
+        """
+        Retrieve the latest bid prices for many assets.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to obtain the prices for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The bid prices aligned to the provided asset order.
+        """
+        return self._get_assets_latest_values(
+            dt, asset_symbols, "get_assets_bid", "get_bid"
+        )
+
+    def get_assets_latest_ask_prices(self, dt, asset_symbols):
+        """
+        Retrieve the latest ask prices for many assets.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to obtain the prices for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The ask prices aligned to the provided asset order.
+        """
+        return self._get_assets_latest_values(
+            dt, asset_symbols, "get_assets_ask", "get_ask"
+        )
+
+    def get_assets_latest_bid_ask_prices(self, dt, asset_symbols):
+        """
+        Retrieve the latest bid and ask prices for many assets.
+
+        As with the single asset equivalent, the bid price
+        is currently utilised for both.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to obtain the prices for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the prices for.
+
+        Returns
+        -------
+        `tuple(np.ndarray, np.ndarray)`
+            The bid and ask prices aligned to the provided asset order.
+        """
+        bids = self.get_assets_latest_bid_prices(dt, asset_symbols)
+        return (bids, bids)
+
+    def get_assets_latest_mid_prices(self, dt, asset_symbols):
+        """
+        Retrieve the latest mid prices for many assets.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to obtain the prices for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The mid prices aligned to the provided asset order.
+        """
+        bid_ask = self.get_assets_latest_bid_ask_prices(dt, asset_symbols)
+        return (bid_ask[0] + bid_ask[1]) / 2.0
+
+    def get_assets_mid_price_history(self, dts, asset_symbols):
+        """
+        Retrieve the mid prices of many assets at many timestamps,
+        e.g. to mark positions to market across a span of events.
+
+        Assets whose sole route is a data source providing a bid/ask
+        history are obtained with a single vectorised lookup per source,
+        as their routing cannot vary across the timestamps. Any others
+        are obtained timestamp by timestamp.
+
+        Parameters
+        ----------
+        dts : `pd.DatetimeIndex`
+            The sorted timestamps to obtain the prices for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The (num_timestamps, num_assets) mid prices aligned to the
+            provided timestamp and asset order.
+        """
+        asset_symbols = list(asset_symbols)
+        prices = np.full((len(dts), len(asset_symbols)), np.nan)
+
+        groups = {}
+        remaining = []
+        for i, asset in enumerate(asset_symbols):
+            routes = self._get_asset_routes(asset)
+            if (
+                len(routes) == 1 and not routes[0][3] and
+                hasattr(routes[0][0], "get_assets_bid_ask_history")
+            ):
+                groups.setdefault(id(routes[0][0]), (routes[0][0], []))[1].append(i)
+            elif len(routes) > 0:
+                remaining.append(i)
+
+        for ds, indices in groups.values():
+            # As with the latest mid prices, the bid
+            # price is currently utilised for both
+            bids, _ = ds.get_assets_bid_ask_history(
+                dts, [asset_symbols[i] for i in indices]
+            )
+            prices[:, indices] = (bids + bids) / 2.0
+
+        if len(remaining) > 0:
+            assets = [asset_symbols[i] for i in remaining]
+            for t, dt in enumerate(dts):
+                prices[t, remaining] = self.get_assets_latest_mid_prices(dt, assets)
+        return prices
+
+    def get_assets_latest_high_prices(self, dt, asset_symbols):
+        """
+        Retrieve the latest high prices for many assets.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to obtain the prices for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The high prices aligned to the provided asset order.
+        """
+        return self._get_assets_latest_values(
+            dt, asset_symbols, "get_assets_high", "get_high"
+        )
+
+    def get_assets_latest_low_prices(self, dt, asset_symbols):
+        """
+        Retrieve the latest low prices for many assets.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to obtain the prices for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The low prices aligned to the provided asset order.
+        """
+        return self._get_assets_latest_values(
+            dt, asset_symbols, "get_assets_low", "get_low"
+        )
+
+    def get_assets_latest_open_prices(self, dt, asset_symbols):
+        """
+        Retrieve the latest open prices for many assets.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to obtain the prices for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The open prices aligned to the provided asset order.
+        """
+        return self._get_assets_latest_values(
+            dt, asset_symbols, "get_assets_open", "get_open"
+        )
+
+    def get_assets_latest_volume(self, dt, asset_symbols):
+        """
+        Retrieve the traded volumes of the latest daily bars of many
+        assets to have closed at or before the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to obtain the volumes for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the volumes for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The volumes aligned to the provided asset order, NaN for
+            assets whose data sources do not provide volumes.
+        """
+        return self._get_assets_latest_values(
+            dt, asset_symbols, "get_assets_volume", "get_volume"
+        )
+
+    def get_assets_latest_adv(self, dt, asset_symbols):
+        """
+        Retrieve the rolling average daily volumes of many assets, as
+        precomputed by their data sources upon the latest closed bars.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to obtain the average volumes for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the average volumes for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The average volumes aligned to the provided asset order.
+        """
+        return self._get_assets_latest_values(
+            dt, asset_symbols, "get_assets_adv", "get_adv"
+        )
+
+    def get_assets_latest_dollar_adv(self, dt, asset_symbols):
+        """
+        Retrieve the rolling average daily dollar volumes of many assets,
+        as precomputed by their data sources upon the latest closed bars.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to obtain the average dollar volumes for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the average dollar volumes for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The average dollar volumes aligned to the provided asset order.
+        """
+        return self._get_assets_latest_values(
+            dt, asset_symbols, "get_assets_dollar_adv", "get_dollar_adv"
+        )
 
     def get_assets_historical_range_close_price(self, start_dt, end_dt, asset_symbols):
         """ """
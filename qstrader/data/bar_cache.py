@@ -0,0 +1,288 @@
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytz
+
+CACHE_FORMAT_VERSION = 2
+
+
+class BarCache(object):
+    """
+    Persists parsed daily bar DataFrames, along with their derived
+    bid/ask DataFrames, in a compact binary columnar format so that
+    subsequent loads of the same CSV file can skip parsing entirely.
+
+    Each CSV file is stored as a single uncompressed NumPy '.npz'
+    archive, with every column (including the int64 nanosecond UTC
+    timestamp index) held as a separate contiguous array.
+
+    Cache entries are keyed by the absolute CSV path, the CSV file
+    modification time and size, as well as the price adjustment flag.
+    Any change to the underlying CSV file invalidates its entry.
+
+    Parameters
+    ----------
+    cache_dir : `str`
+        The directory used to store the cache files. Created
+        if it does not already exist.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _cache_key(csv_path, adjust_prices):
+        """
+        Create the cache key for a CSV file from its absolute path,
+        modification time and size, along with the adjustment flag.
+
+        Parameters
+        ----------
+        csv_path : `str`
+            The full path to the CSV file.
+        adjust_prices : `Boolean`
+            Whether the cached prices are corporate-action adjusted.
+
+        Returns
+        -------
+        `dict`
+            The cache key.
+        """
+        stat = os.stat(csv_path)
+        return {
+            "version": CACHE_FORMAT_VERSION,
+            "path": os.path.abspath(csv_path),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "adjust_prices": bool(adjust_prices),
+        }
+
+    def _cache_path(self, csv_path, adjust_prices):
+        """
+        Determine the cache filename for a particular CSV file.
+
+        The filename combines the CSV basename (for readability) with
+        a digest of its absolute path, so that identically named CSV
+        files in different directories do not collide.
+
+        Parameters
+        ----------
+        csv_path : `str`
+            The full path to the CSV file.
+        adjust_prices : `Boolean`
+            Whether the cached prices are corporate-action adjusted.
+
+        Returns
+        -------
+        `str`
+            The full path to the cache file.
+        """
+        abs_path = os.path.abspath(csv_path)
+        digest = hashlib.sha1(abs_path.encode("utf-8")).hexdigest()[:16]
+        name = os.path.splitext(os.path.basename(abs_path))[0]
+        suffix = "adj" if adjust_prices else "raw"
+        return os.path.join(
+            self.cache_dir, "%s.%s.%s.npz" % (name, digest, suffix)
+        )
+
+    @staticmethod
+    def _frame_to_arrays(prefix, df):
+        """
+        Flatten a UTC timestamp-indexed DataFrame into a dictionary
+        of column arrays suitable for storage in an '.npz' archive.
+
+        Parameters
+        ----------
+        prefix : `str`
+            The prefix used to namespace the arrays of this frame.
+        df : `pd.DataFrame`
+            The DataFrame to flatten.
+
+        Returns
+        -------
+        `dict{str: np.ndarray}`
+            The column arrays, including the int64 timestamp index.
+        """
+        arrays = {
+            "%s__index" % prefix: df.index.as_unit("ns").asi8,
+        }
+        for i, column in enumerate(df.columns):
+            arrays["%s__%d" % (prefix, i)] = df[column].to_numpy(dtype=np.float64)
+        return arrays
+
+    @staticmethod
+    def _arrays_to_frame(archive, prefix, columns):
+        """
+        Reconstruct a UTC timestamp-indexed DataFrame from the
+        column arrays stored in an '.npz' archive.
+
+        Parameters
+        ----------
+        archive : `np.lib.npyio.NpzFile`
+            The opened cache archive.
+        prefix : `str`
+            The prefix used to namespace the arrays of this frame.
+        columns : `list[str]`
+            The column names of the stored frame.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The reconstructed DataFrame.
+        """
+        index = pd.DatetimeIndex(
+            archive["%s__index" % prefix].view("datetime64[ns]"), name="Date"
+        ).tz_localize(pytz.UTC)
+        data = {
+            column: archive["%s__%d" % (prefix, i)]
+            for i, column in enumerate(columns)
+        }
+        return pd.DataFrame(data, index=index, columns=columns)
+
+    def load(self, csv_path, adjust_prices):
+        """
+        Load the cached bar and bid/ask DataFrames for a CSV file,
+        provided a valid (non-stale) cache entry exists.
+
+        Parameters
+        ----------
+        csv_path : `str`
+            The full path to the CSV file.
+        adjust_prices : `Boolean`
+            Whether the cached prices are corporate-action adjusted.
+
+        Returns
+        -------
+        `tuple(pd.DataFrame, pd.DataFrame)` or `None`
+            The bar and bid/ask DataFrames, or None on a cache miss.
+        """
+        cache_path = self._cache_path(csv_path, adjust_prices)
+        if not os.path.exists(cache_path):
+            return None
+
+        key = self._cache_key(csv_path, adjust_prices)
+        try:
+            with np.load(cache_path, allow_pickle=False) as archive:
+                meta = json.loads(str(archive["meta"]))
+                if meta["key"] != key:
+                    return None
+                bar_df = self._arrays_to_frame(archive, "bar", meta["bar_columns"])
+                bid_ask_df = self._arrays_to_frame(
+                    archive, "bid_ask", meta["bid_ask_columns"]
+                )
+        except (OSError, ValueError, KeyError):
+            # Treat truncated or otherwise unreadable entries as a miss
+            return None
+        return bar_df, bid_ask_df
+
+    def store(self, csv_path, adjust_prices, bar_df, bid_ask_df):
+        """
+        Store the bar and bid/ask DataFrames for a CSV file.
+
+        The archive is written to a temporary file and then atomically
+        moved into place so that concurrent readers never observe
+        a partially written entry.
+
+        Parameters
+        ----------
+        csv_path : `str`
+            The full path to the CSV file.
+        adjust_prices : `Boolean`
+            Whether the cached prices are corporate-action adjusted.
+        bar_df : `pd.DataFrame`
+            The parsed daily bar DataFrame.
+        bid_ask_df : `pd.DataFrame`
+            The derived bid/ask DataFrame.
+        """
+        cache_path = self._cache_path(csv_path, adjust_prices)
+        meta = {
+            "key": self._cache_key(csv_path, adjust_prices),
+            "bar_columns": [str(column) for column in bar_df.columns],
+            "bid_ask_columns": [str(column) for column in bid_ask_df.columns],
+        }
+        arrays = {"meta": np.array(json.dumps(meta))}
+        arrays.update(self._frame_to_arrays("bar", bar_df))
+        arrays.update(self._frame_to_arrays("bid_ask", bid_ask_df))
+
+        tmp_path = "%s.%d.%d.tmp" % (
+            cache_path, os.getpid(), threading.get_ident()
+        )
+        with open(tmp_path, "wb") as tmp_file:
+            np.savez(tmp_file, **arrays)
+        os.replace(tmp_path, cache_path)
+
+    def _validation_path(self, csv_path, adjust_prices):
+        """
+        Determine the filename of the validation result for a particular
+        CSV file, stored alongside its cache file.
+        """
+        return "%s.validation.json" % os.path.splitext(
+            self._cache_path(csv_path, adjust_prices)
+        )[0]
+
+    def load_validation(self, csv_path, adjust_prices):
+        """
+        Load the cached data-quality validation issue counts for
+        a CSV file, provided a valid (non-stale) entry exists.
+
+        Parameters
+        ----------
+        csv_path : `str`
+            The full path to the CSV file.
+        adjust_prices : `Boolean`
+            Whether the cached prices are corporate-action adjusted.
+
+        Returns
+        -------
+        `dict{str: int}` or `None`
+            The issue counts, or None on a cache miss.
+        """
+        validation_path = self._validation_path(csv_path, adjust_prices)
+        if not os.path.exists(validation_path):
+            return None
+        try:
+            with open(validation_path, "r") as validation_file:
+                entry = json.load(validation_file)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != self._cache_key(csv_path, adjust_prices):
+            return None
+        return entry["issues"]
+
+    def store_validation(self, csv_path, adjust_prices, issues):
+        """
+        Store the data-quality validation issue counts for a CSV file.
+
+        Parameters
+        ----------
+        csv_path : `str`
+            The full path to the CSV file.
+        adjust_prices : `Boolean`
+            Whether the cached prices are corporate-action adjusted.
+        issues : `dict{str: int}`
+            The issue counts.
+        """
+        validation_path = self._validation_path(csv_path, adjust_prices)
+        entry = {
+            "key": self._cache_key(csv_path, adjust_prices),
+            "issues": issues,
+        }
+        tmp_path = "%s.%d.%d.tmp" % (
+            validation_path, os.getpid(), threading.get_ident()
+        )
+        with open(tmp_path, "w") as tmp_file:
+            json.dump(entry, tmp_file)
+        os.replace(tmp_path, validation_path)
+
+    def clear(self):
+        """
+        Remove all cache files from the cache directory.
+        """
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(".npz") or filename.endswith(".validation.json"):
+                os.remove(os.path.join(self.cache_dir, filename))
@@ -0,0 +1,90 @@
+import numpy as np
+
+# Beyond this many single-row steps a forward move falls back
+# to a binary search over the remaining timestamps
+MAX_LINEAR_STEPS = 8
+
+
+class ForwardCursor(object):
+    """
+    Locates the latest timestamp at or before a query timestamp
+    within a sorted timestamp array, exploiting the fact that
+    simulation time generally only moves forward.
+
+    The cursor retains the position of the previous lookup. When
+    the query time is equal to or later than the previous query the
+    position is advanced a row at a time, which is O(1) for the
+    typical simulation step. Large forward jumps and backwards moves
+    fall back to a binary search.
+
+    Parameters
+    ----------
+    timestamps : `np.ndarray`
+        The sorted int64 nanosecond UTC timestamps.
+    """
+
+    def __init__(self, timestamps):
+        self.timestamps = timestamps
+        self.position = -1
+        self.last_ts = None
+
+    def _search(self, ts, lo=0):
+        """
+        Binary search for the latest row at or before the
+        provided timestamp, starting from row 'lo'.
+
+        Parameters
+        ----------
+        ts : `int`
+            The int64 nanosecond UTC query timestamp.
+        lo : `int`, optional
+            The row from which to begin the search.
+
+        Returns
+        -------
+        `int`
+            The row position, or -1 if it precedes all rows.
+        """
+        return lo + int(
+            np.searchsorted(self.timestamps[lo:], ts, side="right")
+        ) - 1
+
+    def locate(self, ts):
+        """
+        Determine the row of the latest timestamp at or before
+        the provided timestamp, updating the cursor position.
+
+        Parameters
+        ----------
+        ts : `int`
+            The int64 nanosecond UTC query timestamp.
+
+        Returns
+        -------
+        `int`
+            The row position, or -1 if it precedes all rows.
+        """
+        if self.last_ts is None or ts < self.last_ts:
+            # Time has moved backwards so the cursor cannot be used
+            pos = self._search(ts)
+        else:
+            pos = self.position
+            num_rows = len(self.timestamps)
+            steps = 0
+            while pos + 1 < num_rows and self.timestamps[pos + 1] <= ts:
+                pos += 1
+                steps += 1
+                if steps == MAX_LINEAR_STEPS:
+                    pos = self._search(ts, lo=pos)
+                    break
+
+        self.position = pos
+        self.last_ts = ts
+        return pos
+
+    def reset(self):
+        """
+        Reset the cursor to the start of the timestamp array.
+        """
+        self.position = -1
+        self.last_ts = None
@@ -1,10 +1,142 @@
-import functools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import os
+import threading
 
 import numpy as np
 import pandas as pd
 import pytz
 from qstrader import settings
+from qstrader.data.adjustment import adjusted_view, ADJ_FACTOR_COLUMN
+from qstrader.data.bar_cache import BarCache
+from qstrader.data.cursor import ForwardCursor
+from qstrader.data.price_cache import PriceCache
+from qstrader.data.price_panel import PricePanel
+from qstrader.data.validation import (
+    repair_bar_frame,
+    validate_bar_frames,
+    ValidationReport,
+    VALIDATION_POLICIES,
+)
+
+BAR_FIELDS = ["Open", "High", "Low", "Close"]
+BID_ASK_FIELDS = ["Bid", "Ask"]
+BAR_TIME_OFFSETS = pd.to_timedelta(["14h30min", "17h", "19h", "21h"])
+PRICE_LOOKUP_METHODS = ["get_bid", "get_ask", "get_open", "get_high", "get_low"]
+LIQUIDITY_FIELDS = ["Volume", "Dollar Volume", "ADV", "Dollar ADV"]
+DEFAULT_ADV_WINDOW = 20
+
+
+def compute_liquidity_frame(bar_df, adjust_prices, adv_window=DEFAULT_ADV_WINDOW):
+    """
+    Derive the traded volume, dollar volume and their rolling averages
+    (ADV) from a daily bar DataFrame, in a single vectorised pass.
+
+    The values are timestamped at the close of each daily bar (21:00
+    UTC), as the volume of a bar is only known once it has closed.
+    When adjusting prices the volume is corporate-action adjusted
+    inversely to the prices, such that it is in the same units as the
+    adjusted share quantities. The dollar volume is unaffected by the
+    adjustment. The averages are taken over up to 'adv_window' bars,
+    ignoring bars without a volume.
+
+    Parameters
+    ----------
+    bar_df : `pd.DataFrame`
+        The daily bar DataFrame.
+    adjust_prices : `Boolean`
+        Whether to utilise corporate-action adjusted volumes.
+    adv_window : `int`, optional
+        The number of daily bars averaged. Defaults to 20.
+
+    Returns
+    -------
+    `pd.DataFrame`
+        The 'Date' indexed DataFrame of the liquidity fields.
+    """
+    if "Volume" in bar_df.columns:
+        raw_volume = bar_df["Volume"].to_numpy(dtype=np.float64)
+    else:
+        raw_volume = np.full(len(bar_df), np.nan)
+    volume = raw_volume
+    if adjust_prices and len(bar_df) > 0:
+        volume = adjusted_view(bar_df.assign(Volume=raw_volume))["Volume"].to_numpy()
+
+    liquidity_df = pd.DataFrame(
+        {
+            "Volume": volume,
+            "Dollar Volume": raw_volume * bar_df["Close"].to_numpy(dtype=np.float64),
+        },
+        index=pd.DatetimeIndex(bar_df.index + BAR_TIME_OFFSETS[-1], name="Date"),
+    )
+    averages = liquidity_df.rolling(adv_window, min_periods=1).mean()
+    liquidity_df["ADV"] = averages["Volume"]
+    liquidity_df["Dollar ADV"] = averages["Dollar Volume"]
+    return liquidity_df
+
+
+def convert_bar_frame_into_bid_ask_df(bar_df, adjust_prices):
+    """
+    Convert a daily OHLC 'bar' DataFrame into an individually
+    timestamped bid/ask DataFrame, with four prices per day.
+
+    The open, high, low and close prices are interleaved into a
+    single series and timestamped at 14:30, 17:00, 19:00 and 21:00
+    UTC respectively. Missing prices are forward-filled.
+
+    Parameters
+    ----------
+    bar_df : `pd.DataFrame`
+        The daily bar DataFrame.
+    adjust_prices : `Boolean`
+        Whether to utilise corporate-action adjusted prices.
+
+    Returns
+    -------
+    `pd.DataFrame`
+        The 'Date' indexed DataFrame of bid and ask prices.
+    """
+    bar_df = bar_df.sort_index()
+
+    if adjust_prices:
+        if ADJ_FACTOR_COLUMN in bar_df.columns:
+            # Utilise the factors persisted by the adjustment stage
+            adj_factor = bar_df[ADJ_FACTOR_COLUMN].to_numpy()
+            adj_close = adj_factor * bar_df["Close"].to_numpy()
+        elif "Adj Close" in bar_df.columns:
+            adj_factor = (bar_df["Adj Close"] / bar_df["Close"]).to_numpy()
+            adj_close = bar_df["Adj Close"].to_numpy()
+        else:
+            raise ValueError(
+                "Unable to locate Adjusted Close pricing column in CSV data file. "
+                "Prices cannot be adjusted. Exiting."
+            )
+
+        prices = np.column_stack(
+            [
+                adj_factor * bar_df["Open"].to_numpy(),
+                adj_factor * bar_df["High"].to_numpy(),
+                adj_factor * bar_df["Low"].to_numpy(),
+                adj_close,
+            ]
+        )
+    else:
+        prices = bar_df[BAR_FIELDS].to_numpy()
+
+    # Interleave the prices day by day in open, high, low, close
+    # order, offsetting each daily timestamp accordingly
+    prices = prices.astype(np.float64).ravel()
+    dates = bar_df.index.repeat(len(BAR_FIELDS)) + np.tile(
+        BAR_TIME_OFFSETS, len(bar_df)
+    )
+
+    # Forward-fill missing prices from the last valid price
+    valid_pos = np.where(np.isnan(prices), 0, np.arange(len(prices)))
+    prices = prices[np.maximum.accumulate(valid_pos)] if len(prices) else prices
+
+    return pd.DataFrame(
+        {"Bid": prices, "Ask": prices.copy()},
+        index=pd.DatetimeIndex(dates, name="Date"),
+    )
 
 
 class CSVDailyBarDataSource(object):
@@ -30,31 +162,381 @@ class CSVDailyBarDataSource(object):
         An optional list of CSV symbols to restrict the data source to.
         The alternative is to convert all CSVs found within the
         provided directory.
+    cache_dir : `str`, optional
+        An optional directory in which to persist the parsed bar and
+        bid/ask DataFrames in a binary format. Subsequent loads of
+        unmodified CSV files are served from this cache, skipping CSV
+        parsing and bid/ask conversion. Defaults to no caching.
+    panel : `Boolean`, optional
+        Whether to align all assets onto a shared timestamp axis and
+        store each pricing field as a dense time x asset array. Point
+        lookups then require a single binary search and cross-sections
+        are obtained as one vector. The per-asset bid/ask DataFrames
+        are released once the panel is built. Defaults to False.
+    cursor : `Boolean`, optional
+        Whether to use forward-only cursors for point price lookups.
+        Each asset (or each panel) retains the position of its last
+        lookup and advances it as simulation time progresses, falling
+        back to a binary search only if time moves backwards. As
+        lookups become O(1) the memoisation of price lookups is
+        disabled in this mode. Defaults to False.
+    max_workers : `int`, optional
+        The number of workers used to parse and convert CSV files
+        concurrently. Defaults to None, i.e. sequential loading.
+    use_processes : `Boolean`, optional
+        Whether the concurrent workers are processes rather than
+        threads. Processes avoid contention on the interpreter lock
+        at the cost of transferring the loaded DataFrames back to
+        the parent process. Defaults to False. Lazy loading
+        always utilises threads.
+    lazy : `Boolean`, optional
+        Whether to defer loading each CSV file until its asset is first
+        requested by a price lookup or historical range query, rather
+        than loading all CSV files upon instantiation. Loading is
+        thread-safe and assets can be loaded ahead of time in the
+        background via 'prefetch'. Defaults to False.
+    price_cache_size : `int` or `None`, optional
+        The maximum number of memoised point price lookups held by this
+        instance. None leaves the cache unbounded and zero disables it.
+        Defaults to 1024 * 1024.
+    price_cache_policy : `str`, optional
+        The eviction policy of the price cache once full, either 'lru'
+        or 'fifo'. Defaults to 'lru'.
+    adv_window : `int`, optional
+        The number of daily bars averaged by the rolling average daily
+        (dollar) volume lookups. Defaults to 20.
+    validation_policy : `str`, optional
+        Whether and how to validate the daily bars as they are loaded.
+        The bars of all assets loaded together are checked at once for
+        missing or non-positive prices, highs below lows and duplicated
+        dates, with the outcome held in 'validation_report' (and cached
+        alongside the binary cache, if used). Invalid bars are either
+        dropped ('drop'), replaced by the preceding valid bar ('ffill')
+        or cause loading to fail ('reject'). Defaults to None, i.e.
+        no validation.
     """
 
-    def __init__(self, csv_dir, asset_type, adjust_prices=True, csv_symbols=None):
+    def __init__(
+        self,
+        csv_dir,
+        asset_type,
+        adjust_prices=True,
+        csv_symbols=None,
+        cache_dir=None,
+        panel=False,
+        cursor=False,
+        max_workers=None,
+        use_processes=False,
+        lazy=False,
+        price_cache_size=1024 * 1024,
+        price_cache_policy="lru",
+        adv_window=DEFAULT_ADV_WINDOW,
+        validation_policy=None
+    ):
+        if validation_policy is not None and (
+            validation_policy not in VALIDATION_POLICIES
+        ):
+            raise ValueError(
+                "Unknown validation policy '%s'. Must be one of %s." % (
+                    validation_policy, VALIDATION_POLICIES
+                )
+            )
         self.csv_dir = csv_dir
         self.asset_type = asset_type
         self.adjust_prices = adjust_prices
         self.csv_symbols = csv_symbols
+        self.cache_dir = cache_dir
+        self.bar_cache = BarCache(cache_dir) if cache_dir is not None else None
+
+        self.panel = panel
+        self.cursor = cursor
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.lazy = lazy
+        self.price_cache_size = price_cache_size
+        self.price_cache_policy = price_cache_policy
+        self.adv_window = adv_window
+        self.validation_policy = validation_policy
+        self.validation_report = ValidationReport()
+
+        self.asset_csv_files = self._obtain_asset_csv_files_by_symbol()
+        self.loaded_assets = set()
+        self.load_lock = threading.Lock()
+        self.prefetch_lock = threading.Lock()
+        self.prefetch_executor = None
+
+        self.asset_bar_frames = {}
+        self.asset_bid_ask_frames = {}
+        self.bar_panel = None
+        self.bid_ask_panel = None
+        self.close_panel = None
+        self.liquidity_panel = None
+        if not self.lazy:
+            self._add_loaded_frames(*self._load_csvs_into_dfs())
+
+        self.asset_cursors = {}
+        self.price_cache = None
+        if not self.cursor:
+            self._memoise_price_lookups()
+
+    def _memoise_price_lookups(self):
+        """
+        Wrap the point price lookup methods of this instance
+        in a price cache keyed by timestamp and asset.
+        """
+        self.price_cache = PriceCache(
+            maxsize=self.price_cache_size, policy=self.price_cache_policy
+        )
+        for method_name in PRICE_LOOKUP_METHODS:
+            setattr(
+                self,
+                method_name,
+                self.price_cache.memoise(getattr(self, method_name))
+            )
+
+    def __getstate__(self):
+        """
+        Exclude the locks, background executor and memoised lookups,
+        none of which can be pickled, e.g. when sending the instance to
+        worker processes. The price cache is recreated empty.
+        """
+        state = self.__dict__.copy()
+        state["load_lock"] = None
+        state["prefetch_lock"] = None
+        state["prefetch_executor"] = None
+        state["price_cache"] = None
+        for method_name in PRICE_LOOKUP_METHODS:
+            state.pop(method_name, None)
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restore a pickled instance, recreating its locks and
+        memoised lookups.
+        """
+        self.__dict__.update(state)
+        self.load_lock = threading.Lock()
+        self.prefetch_lock = threading.Lock()
+        if not self.cursor:
+            self._memoise_price_lookups()
+
+    def _add_loaded_frames(self, asset_bar_frames, asset_bid_ask_frames):
+        """
+        Store newly loaded bar and bid/ask DataFrames, aligning them
+        into (or extending) the price panels if panel mode is used.
+        In panel mode the bid/ask DataFrames are subsequently served
+        entirely from the panel and are not retained.
+
+        Parameters
+        ----------
+        asset_bar_frames : `dict{str: pd.DataFrame}`
+            The asset-symbol keyed bar DataFrames.
+        asset_bid_ask_frames : `dict{str: pd.DataFrame}`
+            The asset-symbol keyed bid/ask DataFrames.
+        """
+        self.asset_bar_frames.update(asset_bar_frames)
+        if self.panel:
+            if self.bar_panel is None:
+                if settings.PRINT_EVENTS:
+                    print("Aligning CSV data into price panels...")
+                self.bar_panel = PricePanel.from_frames(
+                    asset_bar_frames, BAR_FIELDS, forward_cursor=self.cursor
+                )
+                self.bid_ask_panel = PricePanel.from_frames(
+                    asset_bid_ask_frames, BID_ASK_FIELDS, forward_cursor=self.cursor
+                )
+            else:
+                self.bar_panel.add_assets(asset_bar_frames)
+                self.bid_ask_panel.add_assets(asset_bid_ask_frames)
+        else:
+            self.asset_bid_ask_frames.update(asset_bid_ask_frames)
+        if self.close_panel is not None:
+            self.close_panel.add_assets(asset_bar_frames)
+        if self.liquidity_panel is not None:
+            self.liquidity_panel.add_assets(
+                self._compute_liquidity_frames(asset_bar_frames)
+            )
+        self.loaded_assets.update(asset_bar_frames.keys())
+
+    def _ensure_assets_loaded(self, assets):
+        """
+        In lazy mode, load and convert the CSV files of any of the
+        provided assets that have not yet been loaded. Assets without
+        a corresponding CSV file are ignored.
+
+        Parameters
+        ----------
+        assets : `list[str]`
+            The asset symbols required.
+        """
+        if not self.lazy:
+            return
+        if all(asset in self.loaded_assets for asset in assets):
+            return
+
+        with self.load_lock:
+            # Another thread may have loaded the assets while waiting
+            missing_assets = [
+                asset for asset in dict.fromkeys(assets)
+                if asset not in self.loaded_assets and asset in self.asset_csv_files
+            ]
+            if len(missing_assets) == 0:
+                return
+            self._add_loaded_frames(
+                *self._load_csv_files(
+                    [self.asset_csv_files[asset] for asset in missing_assets]
+                )
+            )
+
+    def prefetch(self, assets):
+        """
+        In lazy mode, begin loading the provided assets in a background
+        thread so that they are available by the time they are first
+        requested. Has no effect if all assets are loaded upfront.
+
+        Parameters
+        ----------
+        assets : `list[str]`
+            The asset symbols to load.
+
+        Returns
+        -------
+        `concurrent.futures.Future` or `None`
+            The future of the background load, if one was started.
+        """
+        if not self.lazy:
+            return None
+        with self.prefetch_lock:
+            if self.prefetch_executor is None:
+                self.prefetch_executor = ThreadPoolExecutor(max_workers=1)
+            return self.prefetch_executor.submit(
+                self._ensure_assets_loaded, list(assets)
+            )
+
+    def shutdown_prefetch(self):
+        """
+        Wait for any background loads to complete and shut down the
+        background thread. A subsequent prefetch starts a new thread.
+        """
+        with self.prefetch_lock:
+            if self.prefetch_executor is not None:
+                self.prefetch_executor.shutdown(wait=True)
+                self.prefetch_executor = None
+
+    def get_asset_coverage(self, asset):
+        """
+        Obtain the range of timestamps for which the data source
+        provides prices for an asset, from the date of the first
+        daily bar through to the close of the final daily bar.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `tuple(pd.Timestamp, pd.Timestamp)` or `None`
+            The first and last timestamps covered, or None if the
+            data source does not provide the asset.
+        """
+        if asset not in self.asset_csv_files:
+            return None
+        self._ensure_assets_loaded([asset])
+        bar_df = self.asset_bar_frames[asset]
+        if bar_df.empty:
+            return None
+        return (bar_df.index[0], bar_df.index[-1] + BAR_TIME_OFFSETS[-1])
 
-        self.asset_bar_frames = self._load_csvs_into_dfs()
-        self.asset_bid_ask_frames = self._convert_bars_into_bid_ask_dfs()
+    def get_asset_bars(self, asset, adjusted=False):
+        """
+        Obtain the daily OHLC bars of an asset. Only the raw bars are
+        held in memory, with the adjusted view derived upon request
+        from the adjustment factors (or adjusted closes).
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+        adjusted : `Boolean`, optional
+            Whether to obtain the corporate-action adjusted bars.
+            Defaults to False.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The daily bars of the asset.
+        """
+        self._ensure_assets_loaded([asset])
+        bar_df = self.asset_bar_frames[asset]
+        if adjusted:
+            return adjusted_view(bar_df)
+        return bar_df[
+            [column for column in BAR_FIELDS + ["Volume"] if column in bar_df.columns]
+        ].copy()
+
+    def _get_frame_value_by_cursor(self, frame_type, dt, asset, column):
+        """
+        Obtain the latest value of a column at or before the provided
+        timestamp from a per-asset DataFrame using a forward cursor.
+
+        Parameters
+        ----------
+        frame_type : `str`
+            Either 'bar' or 'bid_ask', determining the DataFrame used.
+        dt : `pd.Timestamp`
+            The timestamp to obtain the value for.
+        asset : `str`
+            The asset symbol.
+        column : `str`
+            The DataFrame column, e.g. 'Bid'.
+
+        Returns
+        -------
+        `float`
+            The value, or NaN if prior to the asset's first row.
+        """
+        if frame_type == "bar":
+            df = self.asset_bar_frames[asset]
+        else:
+            df = self.asset_bid_ask_frames[asset]
+
+        cursor_key = (frame_type, asset)
+        if cursor_key not in self.asset_cursors:
+            self.asset_cursors[cursor_key] = ForwardCursor(
+                df.index.as_unit("ns").asi8
+            )
+        pos = self.asset_cursors[cursor_key].locate(dt.value)
+        if pos < 0:
+            return np.nan
+        return df[column].iat[pos]
 
-    @functools.lru_cache(maxsize=1024 * 1024)
     def get_high(self, dt, asset):
+        self._ensure_assets_loaded([asset])
+        if self.bar_panel is not None:
+            return self.bar_panel.get_value("High", dt, asset)
+        if self.cursor:
+            return self._get_frame_value_by_cursor("bar", dt, asset, "High")
         bar_df = self.asset_bar_frames[asset]
         high_series = bar_df.iloc[bar_df.index.get_indexer([dt], method="pad")]["High"]
         return high_series.iloc[0] if not high_series.empty else np.nan
 
-    @functools.lru_cache(maxsize=1024 * 1024)
     def get_low(self, dt, asset):
+        self._ensure_assets_loaded([asset])
+        if self.bar_panel is not None:
+            return self.bar_panel.get_value("Low", dt, asset)
+        if self.cursor:
+            return self._get_frame_value_by_cursor("bar", dt, asset, "Low")
         bar_df = self.asset_bar_frames[asset]
         low_series = bar_df.iloc[bar_df.index.get_indexer([dt], method="pad")]["Low"]
         return low_series.iloc[0] if not low_series.empty else np.nan
 
-    @functools.lru_cache(maxsize=1024 * 1024)
     def get_open(self, dt, asset):
+        self._ensure_assets_loaded([asset])
+        if self.bar_panel is not None:
+            return self.bar_panel.get_value("Open", dt, asset)
+        if self.cursor:
+            return self._get_frame_value_by_cursor("bar", dt, asset, "Open")
         bar_df = self.asset_bar_frames[asset]
         low_series = bar_df.iloc[bar_df.index.get_indexer([dt], method="pad")]["Open"]
         return low_series.iloc[0] if not low_series.empty else np.nan
@@ -91,115 +573,283 @@ class CSVDailyBarDataSource(object):
     def _load_csv_into_df(self, csv_file):
         csv_df = pd.read_csv(
             os.path.join(self.csv_dir, csv_file), index_col="Date", parse_dates=True
-        ).sort_index()
+        )
+        return self._prepare_bar_df(csv_df)
+
+    def _prepare_bar_df(self, csv_df):
+        """
+        Sort a parsed daily bar DataFrame, converting its timestamps
+        to UTC and retaining only the necessary columns.
+
+        Parameters
+        ----------
+        csv_df : `pd.DataFrame`
+            The parsed daily bar DataFrame.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The prepared daily bar DataFrame.
+        """
+        csv_df = csv_df.sort_index()
 
         # Ensure all timestamps are set to UTC for consistency
         csv_df = csv_df.set_index(csv_df.index.tz_convert(pytz.UTC))
 
-        # Keep only necessary columns
-        csv_df = csv_df[["Open", "High", "Low", "Close", "Adj Close"]]
+        # Keep only necessary columns, including the traded volume if
+        # available, for liquidity lookups. Files processed by the adjustment
+        # stage provide adjustment factors, from which the adjusted
+        # prices are derived, in place of the adjusted closes
+        volume = ["Volume"] if "Volume" in csv_df.columns else []
+        if ADJ_FACTOR_COLUMN in csv_df.columns:
+            csv_df = csv_df[BAR_FIELDS + volume + [ADJ_FACTOR_COLUMN]]
+        else:
+            csv_df = csv_df[BAR_FIELDS + volume + ["Adj Close"]]
+
+        # Integral volumes are stored as floats, as in the binary cache
+        csv_df = csv_df.astype(np.float64)
 
         return csv_df
 
-    def _load_csvs_into_dfs(self):
+    def _obtain_csv_files_to_load(self):
         """
-        Load all CSVs in the CSV directory into Pandas DataFrames.
+        Determine the CSV filenames to load, either from the provided
+        CSV symbols or from all CSVs in the CSV directory.
 
         Returns
         -------
-        `dict{pd.DataFrame}`
-            The asset-symbol keyed dictionary of Pandas DataFrames
-            containing the timestamped price/volume data.
+        `list[str]`
+            The list of CSV filenames to load.
         """
-        if settings.PRINT_EVENTS:
-            print("Loading CSV files into DataFrames...")
         if self.csv_symbols is not None:
             # TODO/NOTE: This assumes existence of CSV symbols
             # within the provided directory.
-            csv_files = ["%s.csv" % symbol for symbol in self.csv_symbols]
+            return ["%s.csv" % symbol for symbol in self.csv_symbols]
+        return self._obtain_asset_csv_files()
+
+    def _obtain_asset_csv_files_by_symbol(self):
+        """
+        Map each asset symbol of the data source to its CSV filename.
+
+        Returns
+        -------
+        `dict{str: str}`
+            The asset symbol keyed CSV filenames.
+        """
+        return {
+            self._obtain_asset_symbol_from_filename(csv_file): csv_file
+            for csv_file in self._obtain_csv_files_to_load()
+        }
+
+    def _load_csv_into_frames(self, csv_file):
+        """
+        Load a single CSV file into its bar DataFrame and the derived
+        bid/ask DataFrame, utilising the binary cache if available.
+
+        Parameters
+        ----------
+        csv_file : `str`
+            The name of the CSV file.
+
+        Returns
+        -------
+        `tuple(pd.DataFrame, pd.DataFrame)`
+            The bar and bid/ask DataFrames.
+        """
+        csv_path = os.path.join(self.csv_dir, csv_file)
+        if self.bar_cache is not None:
+            cached_frames = self.bar_cache.load(csv_path, self.adjust_prices)
+            if cached_frames is not None:
+                return cached_frames
+
+        bar_df = self._load_csv_into_df(csv_file)
+        bid_ask_df = self._convert_bar_frame_into_bid_ask_df(bar_df)
+        if self.bar_cache is not None:
+            self.bar_cache.store(csv_path, self.adjust_prices, bar_df, bid_ask_df)
+        return bar_df, bid_ask_df
+
+    def _create_executor(self):
+        """
+        Create the worker pool used to load CSV files concurrently.
+
+        Returns
+        -------
+        `concurrent.futures.Executor`
+            The thread or process pool executor.
+        """
+        if self.use_processes and not self.lazy:
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def _load_csv_files(self, csv_files):
+        """
+        Load and convert the provided CSV files, either sequentially
+        or concurrently depending upon the number of workers.
+
+        Results are merged in the order of the provided CSV files,
+        independently of the order in which the workers complete.
+        Failures do not abort the remaining files but are collected
+        and reported together once all files have been attempted.
+
+        Parameters
+        ----------
+        csv_files : `list[str]`
+            The CSV filenames to load.
+
+        Returns
+        -------
+        `tuple(dict{pd.DataFrame}, dict{pd.DataFrame})`
+            The asset-symbol keyed bar and bid/ask DataFrames.
+        """
+        if self.max_workers is None:
+            results = []
+            for csv_file in csv_files:
+                try:
+                    results.append((self._load_csv_into_frames(csv_file), None))
+                except Exception as e:
+                    results.append((None, e))
         else:
-            csv_files = self._obtain_asset_csv_files()
+            with self._create_executor() as executor:
+                futures = [
+                    executor.submit(self._load_csv_into_frames, csv_file)
+                    for csv_file in csv_files
+                ]
+                results = [
+                    (None, future.exception())
+                    if future.exception() is not None
+                    else (future.result(), None)
+                    for future in futures
+                ]
 
-        asset_frames = {}
-        for csv_file in csv_files:
+        asset_bar_frames = {}
+        asset_bid_ask_frames = {}
+        failures = []
+        for csv_file, (frames, error) in zip(csv_files, results):
+            if error is not None:
+                failures.append((csv_file, error))
+                continue
             asset_symbol = self._obtain_asset_symbol_from_filename(csv_file)
             if settings.PRINT_EVENTS:
-                print("Loading CSV file for symbol '%s'..." % asset_symbol)
-            csv_df = self._load_csv_into_df(csv_file)
-            asset_frames[asset_symbol] = csv_df
-        return asset_frames
-
-    def _convert_bar_frame_into_bid_ask_df(self, bar_df):
-        bar_df = bar_df.sort_index()
+                print("Loaded CSV file for symbol '%s'..." % asset_symbol)
+            asset_bar_frames[asset_symbol], asset_bid_ask_frames[asset_symbol] = frames
 
-        if self.adjust_prices:
-            if "Adj Close" not in bar_df.columns:
-                raise ValueError(
-                    "Unable to locate Adjusted Close pricing column in CSV data file. "
-                    "Prices cannot be adjusted. Exiting."
+        if len(failures) > 0:
+            raise ValueError(
+                "Unable to load %d of %d CSV files from '%s':\n%s" % (
+                    len(failures), len(csv_files), self.csv_dir,
+                    "\n".join(
+                        "  %s: %s: %s" % (csv_file, type(error).__name__, error)
+                        for csv_file, error in failures
+                    )
                 )
+            ) from failures[0][1]
 
-            bar_df["Adj Open"] = (bar_df["Adj Close"] / bar_df["Close"]) * bar_df[
-                "Open"
-            ]
-            bar_df["Adj High"] = (bar_df["Adj Close"] / bar_df["Close"]) * bar_df[
-                "High"
-            ]
-            bar_df["Adj Low"] = (bar_df["Adj Close"] / bar_df["Close"]) * bar_df["Low"]
+        if self.validation_policy is not None:
+            self._validate_frames(asset_bar_frames, asset_bid_ask_frames)
+        return asset_bar_frames, asset_bid_ask_frames
 
-            bar_df = bar_df[["Adj Open", "Adj High", "Adj Low", "Adj Close"]]
-            bar_df.columns = ["Open", "High", "Low", "Close"]
-        else:
-            bar_df = bar_df[["Open", "High", "Low", "Close"]]
+    def _validate_frames(self, asset_bar_frames, asset_bid_ask_frames):
+        """
+        Validate the newly loaded daily bars of all assets at once,
+        recording the outcome in the validation report and applying
+        the validation policy to any invalid bars.
 
-        seq_df = bar_df.T.unstack(level=0).reset_index()
-        seq_df.columns = ["Date", "Market", "Price"]
+        The issue counts of unmodified CSV files are served from the
+        binary cache directory, if used, such that only new or changed
+        files are checked. Repaired bars are converted into bid/ask
+        prices anew, replacing the provided DataFrames in place.
 
-        # Timestamping Open, High, Low, Close
-        seq_df.loc[seq_df["Market"] == "Open", "Date"] += pd.Timedelta(
-            hours=14, minutes=30
-        )
-        seq_df.loc[seq_df["Market"] == "High", "Date"] += pd.Timedelta(
-            hours=17, minutes=0
-        )
-        seq_df.loc[seq_df["Market"] == "Low", "Date"] += pd.Timedelta(
-            hours=19, minutes=0
-        )
-        seq_df.loc[seq_df["Market"] == "Close", "Date"] += pd.Timedelta(
-            hours=21, minutes=0
-        )
+        Parameters
+        ----------
+        asset_bar_frames : `dict{str: pd.DataFrame}`
+            The asset-symbol keyed bar DataFrames.
+        asset_bid_ask_frames : `dict{str: pd.DataFrame}`
+            The asset-symbol keyed bid/ask DataFrames.
+        """
+        asset_issues = {}
+        unvalidated_frames = {}
+        for asset, bar_df in asset_bar_frames.items():
+            issues = None
+            if self.bar_cache is not None:
+                issues = self.bar_cache.load_validation(
+                    os.path.join(self.csv_dir, self.asset_csv_files[asset]),
+                    self.adjust_prices
+                )
+            if issues is None:
+                unvalidated_frames[asset] = bar_df
+            else:
+                asset_issues[asset] = issues
 
-        dp_df = seq_df[["Date", "Price"]]
-        dp_df["Bid"] = dp_df["Price"]
-        dp_df["Ask"] = dp_df["Price"]
-        dp_df = (
-            dp_df.loc[:, ["Date", "Bid", "Ask"]].ffill().set_index("Date").sort_index()
-        )
+        new_issues, _ = validate_bar_frames(unvalidated_frames)
+        asset_issues.update(new_issues)
+        if self.bar_cache is not None:
+            for asset, issues in new_issues.items():
+                self.bar_cache.store_validation(
+                    os.path.join(self.csv_dir, self.asset_csv_files[asset]),
+                    self.adjust_prices, issues
+                )
+
+        report = ValidationReport(asset_issues)
+        self.validation_report.update(report)
+        if report.is_valid:
+            return
+        if self.validation_policy == "reject":
+            raise ValueError(
+                "Data-quality validation of CSV files from '%s' failed. %s" % (
+                    self.csv_dir, report
+                )
+            )
 
-        return dp_df
+        if settings.PRINT_EVENTS:
+            print("Repairing invalid bars with policy '%s'. %s" % (
+                self.validation_policy, report
+            ))
+        _, asset_masks = validate_bar_frames(
+            {asset: asset_bar_frames[asset] for asset in report.invalid_assets}
+        )
+        for asset, (invalid, duplicated) in asset_masks.items():
+            bar_df = repair_bar_frame(
+                asset_bar_frames[asset], invalid, duplicated, self.validation_policy
+            )
+            asset_bar_frames[asset] = bar_df
+            asset_bid_ask_frames[asset] = self._convert_bar_frame_into_bid_ask_df(
+                bar_df
+            )
 
-    def _convert_bars_into_bid_ask_dfs(self):
+    def _load_csvs_into_dfs(self):
         """
-        Convert all of the daily OHLCV 'bar' based DataFrames into
-        individually-timestamped open/closing price DataFrames.
+        Load all CSVs in the CSV directory into Pandas DataFrames,
+        converting each into individually-timestamped open/closing
+        price DataFrames.
 
         Returns
         -------
-        `dict{pd.DataFrame}`
-            The converted DataFrames.
+        `tuple(dict{pd.DataFrame}, dict{pd.DataFrame})`
+            The asset-symbol keyed dictionaries of Pandas DataFrames
+            containing the timestamped price/volume data and the
+            converted bid/ask data respectively.
         """
         if settings.PRINT_EVENTS:
-            print("Adjusting pricing in CSV files...")
-        asset_bid_ask_frames = {}
-        for asset_symbol, bar_df in self.asset_bar_frames.items():
-            if settings.PRINT_EVENTS:
-                print("Adjusting CSV file for symbol '%s'..." % asset_symbol)
-            asset_bid_ask_frames[asset_symbol] = (
-                self._convert_bar_frame_into_bid_ask_df(bar_df)
-            )
-        return asset_bid_ask_frames
+            print("Loading CSV files into DataFrames...")
+        return self._load_csv_files(list(self.asset_csv_files.values()))
+
+    def _convert_bar_frame_into_bid_ask_df(self, bar_df):
+        """
+        Convert a daily OHLC 'bar' DataFrame into an individually
+        timestamped bid/ask DataFrame, with four prices per day.
+
+        Parameters
+        ----------
+        bar_df : `pd.DataFrame`
+            The daily bar DataFrame.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The 'Date' indexed DataFrame of bid and ask prices.
+        """
+        return convert_bar_frame_into_bid_ask_df(bar_df, self.adjust_prices)
 
-    @functools.lru_cache(maxsize=1024 * 1024)
     def get_bid(self, dt, asset):
         """
         Obtain the bid price of an asset at the provided timestamp.
@@ -216,6 +866,11 @@ class CSVDailyBarDataSource(object):
         `float`
             The bid price.
         """
+        self._ensure_assets_loaded([asset])
+        if self.bid_ask_panel is not None:
+            return self.bid_ask_panel.get_value("Bid", dt, asset)
+        if self.cursor:
+            return self._get_frame_value_by_cursor("bid_ask", dt, asset, "Bid")
         bid_ask_df = self.asset_bid_ask_frames[asset]
         bid_series = bid_ask_df.iloc[bid_ask_df.index.get_indexer([dt], method="pad")][
             "Bid"
@@ -226,7 +881,6 @@ class CSVDailyBarDataSource(object):
             return np.nan
         return bid
 
-    @functools.lru_cache(maxsize=1024 * 1024)
     def get_ask(self, dt, asset):
         """
         Obtain the ask price of an asset at the provided timestamp.
@@ -243,6 +897,11 @@ class CSVDailyBarDataSource(object):
         `float`
             The ask price.
         """
+        self._ensure_assets_loaded([asset])
+        if self.bid_ask_panel is not None:
+            return self.bid_ask_panel.get_value("Ask", dt, asset)
+        if self.cursor:
+            return self._get_frame_value_by_cursor("bid_ask", dt, asset, "Ask")
         bid_ask_df = self.asset_bid_ask_frames[asset]
         ask_series = bid_ask_df.iloc[bid_ask_df.index.get_indexer([dt], method="pad")][
             "Ask"
@@ -253,11 +912,358 @@ class CSVDailyBarDataSource(object):
             return np.nan
         return ask
 
+    def _get_assets_values(self, dt, assets, panel, field, lookup):
+        """
+        Obtain the latest values of a pricing field for many assets
+        at the provided timestamp, aligned to the provided asset order.
+
+        In panel mode the full cross-section is obtained with a single
+        vectorised lookup. Otherwise each asset is looked up in turn.
+        Assets unknown to the data source are set to NaN.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to obtain the values for.
+        assets : `list[str]`
+            The asset symbols to obtain the values for.
+        panel : `PricePanel` or `None`
+            The price panel containing the field, if in panel mode.
+        field : `str`
+            The pricing field, e.g. 'Bid'.
+        lookup : `callable`
+            The single asset lookup method for the field.
+
+        Returns
+        -------
+        `np.ndarray`
+            The values aligned to the provided asset order.
+        """
+        self._ensure_assets_loaded(assets)
+        values = np.full(len(assets), np.nan)
+        if panel is not None:
+            known = [i for i, asset in enumerate(assets) if asset in panel.asset_index]
+            if len(known) > 0:
+                values[known] = panel.get_cross_section(
+                    field, dt, [assets[i] for i in known]
+                )
+            return values
+
+        for i, asset in enumerate(assets):
+            if asset in self.asset_bar_frames:
+                values[i] = lookup(dt, asset)
+        return values
+
+    def get_assets_bid(self, dt, assets):
+        """
+        Obtain the bid prices of many assets at the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the bid prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the bid prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The bid prices aligned to the provided asset order.
+        """
+        return self._get_assets_values(
+            dt, assets, self.bid_ask_panel, "Bid", self.get_bid
+        )
+
+    def get_assets_ask(self, dt, assets):
+        """
+        Obtain the ask prices of many assets at the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the ask prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the ask prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The ask prices aligned to the provided asset order.
+        """
+        return self._get_assets_values(
+            dt, assets, self.bid_ask_panel, "Ask", self.get_ask
+        )
+
+    def get_assets_bid_ask_history(self, dts, assets):
+        """
+        Obtain the bid and ask prices of many assets at many timestamps,
+        with a single vectorised lookup per field in panel mode and per
+        asset otherwise. Assets unknown to the data source are NaN.
+
+        Parameters
+        ----------
+        dts : `pd.DatetimeIndex`
+            The sorted timestamps to obtain the prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the prices for.
+
+        Returns
+        -------
+        `tuple(np.ndarray, np.ndarray)`
+            The (num_timestamps, num_assets) bid and ask prices aligned
+            to the provided timestamp and asset order.
+        """
+        self._ensure_assets_loaded(assets)
+        dts = pd.DatetimeIndex(dts)
+        bids = np.full((len(dts), len(assets)), np.nan)
+        asks = np.full((len(dts), len(assets)), np.nan)
+        panel = self.bid_ask_panel
+        if panel is not None:
+            known = [i for i, asset in enumerate(assets) if asset in panel.asset_index]
+            if len(known) > 0:
+                known_assets = [assets[i] for i in known]
+                bids[:, known] = panel.get_cross_sections("Bid", dts, known_assets)
+                asks[:, known] = panel.get_cross_sections("Ask", dts, known_assets)
+            return bids, asks
+
+        for i, asset in enumerate(assets):
+            if asset not in self.asset_bid_ask_frames:
+                continue
+            bid_ask_df = self.asset_bid_ask_frames[asset]
+            rows = bid_ask_df.index.get_indexer(dts, method="pad")
+            found = rows >= 0
+            bids[found, i] = bid_ask_df["Bid"].to_numpy()[rows[found]]
+            asks[found, i] = bid_ask_df["Ask"].to_numpy()[rows[found]]
+        return bids, asks
+
+    def get_assets_open(self, dt, assets):
+        """
+        Obtain the latest daily opening prices of many assets
+        at the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the opening prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the opening prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The opening prices aligned to the provided asset order.
+        """
+        return self._get_assets_values(
+            dt, assets, self.bar_panel, "Open", self.get_open
+        )
+
+    def get_assets_high(self, dt, assets):
+        """
+        Obtain the latest daily high prices of many assets
+        at the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the high prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the high prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The high prices aligned to the provided asset order.
+        """
+        return self._get_assets_values(
+            dt, assets, self.bar_panel, "High", self.get_high
+        )
+
+    def get_assets_low(self, dt, assets):
+        """
+        Obtain the latest daily low prices of many assets
+        at the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the low prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the low prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The low prices aligned to the provided asset order.
+        """
+        return self._get_assets_values(
+            dt, assets, self.bar_panel, "Low", self.get_low
+        )
+
+    def _obtain_close_panel(self):
+        """
+        Obtain the panel of closing prices of all loaded assets, aligned
+        without padding, creating it upon first use. Once created it is
+        extended as further assets are loaded.
+
+        Returns
+        -------
+        `PricePanel`
+            The closing price panel.
+        """
+        if self.close_panel is None:
+            with self.load_lock:
+                if self.close_panel is None:
+                    self.close_panel = PricePanel.from_frames(
+                        self.asset_bar_frames, ["Close"], pad=False
+                    )
+        return self.close_panel
+
+    def _compute_liquidity_frames(self, asset_bar_frames):
+        """
+        Derive the liquidity DataFrames of many assets from their bars.
+
+        Parameters
+        ----------
+        asset_bar_frames : `dict{str: pd.DataFrame}`
+            The asset-symbol keyed bar DataFrames.
+
+        Returns
+        -------
+        `dict{str: pd.DataFrame}`
+            The asset-symbol keyed liquidity DataFrames.
+        """
+        return {
+            asset: compute_liquidity_frame(bar_df, self.adjust_prices, self.adv_window)
+            for asset, bar_df in asset_bar_frames.items()
+        }
+
+    def _obtain_liquidity_panel(self):
+        """
+        Obtain the panel of volumes and rolling average volumes of all
+        loaded assets, computing it once upon first use. Once created
+        it is extended as further assets are loaded.
+
+        Returns
+        -------
+        `PricePanel`
+            The liquidity panel.
+        """
+        if self.liquidity_panel is None:
+            with self.load_lock:
+                if self.liquidity_panel is None:
+                    self.liquidity_panel = PricePanel.from_frames(
+                        self._compute_liquidity_frames(self.asset_bar_frames),
+                        LIQUIDITY_FIELDS,
+                        forward_cursor=self.cursor
+                    )
+        return self.liquidity_panel
+
+    def _get_liquidity_value(self, dt, asset, field):
+        self._ensure_assets_loaded([asset])
+        return self._obtain_liquidity_panel().get_value(field, dt, asset)
+
+    def get_volume(self, dt, asset):
+        """
+        Obtain the traded volume of the latest daily bar of an asset
+        to have closed at or before the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the volume for.
+        asset : `str`
+            The asset symbol to obtain the volume for.
+
+        Returns
+        -------
+        `float`
+            The volume.
+        """
+        return self._get_liquidity_value(dt, asset, "Volume")
+
+    def get_adv(self, dt, asset):
+        return self._get_liquidity_value(dt, asset, "ADV")
+
+    def get_dollar_adv(self, dt, asset):
+        return self._get_liquidity_value(dt, asset, "Dollar ADV")
+
+    def get_assets_volume(self, dt, assets):
+        """
+        Obtain the traded volumes of the latest daily bars of many
+        assets to have closed at or before the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the volumes for.
+        assets : `list[str]`
+            The asset symbols to obtain the volumes for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The volumes aligned to the provided asset order.
+        """
+        self._ensure_assets_loaded(assets)
+        return self._get_assets_values(
+            dt, assets, self._obtain_liquidity_panel(), "Volume", self.get_volume
+        )
+
+    def get_assets_adv(self, dt, assets):
+        """
+        Obtain the rolling average daily volumes of many assets, over
+        the latest 'adv_window' daily bars to have closed at or before
+        the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the average volumes for.
+        assets : `list[str]`
+            The asset symbols to obtain the average volumes for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The average volumes aligned to the provided asset order.
+        """
+        self._ensure_assets_loaded(assets)
+        return self._get_assets_values(
+            dt, assets, self._obtain_liquidity_panel(), "ADV", self.get_adv
+        )
+
+    def get_assets_dollar_adv(self, dt, assets):
+        """
+        Obtain the rolling average daily dollar volumes of many assets,
+        over the latest 'adv_window' daily bars to have closed at or
+        before the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the average dollar volumes for.
+        assets : `list[str]`
+            The asset symbols to obtain the average dollar volumes for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The average dollar volumes aligned to the provided asset order.
+        """
+        self._ensure_assets_loaded(assets)
+        return self._get_assets_values(
+            dt, assets, self._obtain_liquidity_panel(), "Dollar ADV",
+            self.get_dollar_adv
+        )
+
     def get_assets_historical_closes(self, start_dt, end_dt, assets):
         """
         Obtain a multi-asset historical range of closing prices as a DataFrame,
         indexed by timestamp with asset symbols as columns.
 
+        The range is sliced from the closing price panel and is always
+        a copy, which may be modified without affecting the panel.
+
         Parameters
         ----------
         start_dt : `pd.Timestamp`
@@ -272,13 +1278,13 @@ class CSVDailyBarDataSource(object):
         `pd.DataFrame`
             The multi-asset closing prices DataFrame.
         """
-        close_series = []
-        for asset in assets:
-            if asset in self.asset_bar_frames.keys():
-                asset_close_prices = self.asset_bar_frames[asset][["Close"]]
-                asset_close_prices.columns = [asset]
-                close_series.append(asset_close_prices)
+        self._ensure_assets_loaded(assets)
+        close_panel = self._obtain_close_panel()
+        known_assets = [asset for asset in assets if asset in close_panel.asset_index]
+        prices_df = close_panel.get_range("Close", start_dt, end_dt, known_assets)
 
-        prices_df = pd.concat(close_series, axis=1).dropna(how="all")
-        prices_df = prices_df.loc[start_dt:end_dt]
+        # Remove timestamps at which none of the assets have a close price
+        has_prices = ~np.isnan(prices_df.to_numpy()).all(axis=1)
+        if not has_prices.all():
+            prices_df = prices_df[has_prices]
         return prices_df
@@ -0,0 +1,487 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from qstrader import settings
+from qstrader.data.adjustment import add_adjusted_columns, ADJ_FACTOR_COLUMN
+
+
+class DataProvider(object):
+    """
+    Abstract interface for a source of daily bar data, used by
+    the DataIngester to fetch the bars of individual tickers.
+    """
+
+    def fetch(self, ticker, start_date, end_date):
+        """
+        Fetch the daily bars of a ticker.
+
+        Parameters
+        ----------
+        ticker : `str`
+            The ticker symbol.
+        start_date : `pd.Timestamp`
+            The first date to fetch, inclusive.
+        end_date : `pd.Timestamp`
+            The final date to fetch, exclusive.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The daily bars, indexed by date, possibly empty.
+        """
+        raise NotImplementedError(
+            "Should implement fetch()"
+        )
+
+
+class YahooFinanceDataProvider(DataProvider):
+    """
+    Fetches daily bars from Yahoo Finance via the optional
+    'yfinance' package.
+
+    As 'yfinance' logs failed downloads and returns an empty (or all
+    NaN) DataFrame, rather than raising, such a DataFrame is treated as
+    a failed download, which is raised such that it may be retried.
+    """
+
+    def fetch(self, ticker, start_date, end_date):
+        import yfinance as yf
+
+        data = yf.download(
+            ticker,
+            start=start_date.strftime("%Y-%m-%d"),
+            end=end_date.strftime("%Y-%m-%d"),
+            progress=False
+        )
+        if data is None or data.empty or data.isna().all().all():
+            raise IOError(
+                'Yahoo Finance download of "%s" from %s to %s returned '
+                'no bars.' % (ticker, start_date.date(), end_date.date())
+            )
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.droplevel(1)
+        return data
+
+
+class CSVFileDataProvider(DataProvider):
+    """
+    Fetches daily bars from a directory of per-ticker CSV files,
+    e.g. a previously downloaded archive. Primarily a network-free
+    stand-in for remote providers.
+
+    Parameters
+    ----------
+    source_dir : `str`
+        The directory containing the '<ticker>.csv' files.
+    """
+
+    def __init__(self, source_dir):
+        self.source_dir = source_dir
+
+    def fetch(self, ticker, start_date, end_date):
+        csv_path = os.path.join(self.source_dir, "%s.csv" % ticker)
+        if not os.path.exists(csv_path):
+            return pd.DataFrame()
+        data = pd.read_csv(csv_path, index_col="Date", parse_dates=True)
+        dates = data.index.tz_localize(None) if data.index.tz else data.index
+        return data[(dates >= start_date) & (dates < end_date)]
+
+
+class DataIngester(object):
+    """
+    Downloads the daily bars of many tickers from a DataProvider into
+    a directory of per-ticker CSV files, concurrently and with retries.
+
+    In incremental mode the last stored date of each existing CSV file
+    is read from its final line, only the bars from that date onwards
+    are fetched and those after it are appended to the file. Otherwise
+    each CSV file is rewritten with the full requested range.
+
+    The re-fetched final stored bar confirms that the download succeeded
+    (an empty download is treated as a failure and retried) and allows
+    corporate actions occurring since the last ingest to be detected.
+    Should its adjustment factor (the ratio of the adjusted to the raw
+    closing price) have changed, the adjusted prices of the full stored
+    history are restated onto the new adjustment basis.
+
+    When adjusting, the split/dividend adjustment stage is run upon the
+    fetched bars before they are stored, such that the adjusted OHLCV
+    columns and adjustment factors are persisted alongside the raw bars
+    and need not be recomputed when the CSV files are loaded.
+
+    Parameters
+    ----------
+    provider : `DataProvider`
+        The source of the daily bars.
+    output_dir : `str`
+        The directory in which to store the CSV files.
+    incremental : `Boolean`, optional
+        Whether to only fetch and append the bars missing from
+        existing CSV files. Defaults to True.
+    max_workers : `int`, optional
+        The maximum number of concurrent downloads. Defaults to 4.
+    max_retries : `int`, optional
+        The number of times a failed download is retried. Defaults to 3.
+    backoff : `float`, optional
+        The delay in seconds before the first retry, doubling for
+        each subsequent retry. Defaults to 1.0.
+    adjust : `Boolean`, optional
+        Whether to store the adjusted bars and adjustment factors
+        alongside the raw bars. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        provider,
+        output_dir,
+        incremental=True,
+        max_workers=4,
+        max_retries=3,
+        backoff=1.0,
+        adjust=False
+    ):
+        self.provider = provider
+        self.output_dir = output_dir
+        self.incremental = incremental
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.adjust = adjust
+
+    @staticmethod
+    def read_ticker_file(input_file):
+        """
+        Read the tickers and date ranges to ingest from a file of
+        'ticker,start_date,end_date' lines. Invalid lines are skipped.
+
+        Parameters
+        ----------
+        input_file : `str`
+            The path to the ticker file.
+
+        Returns
+        -------
+        `list[tuple(str, pd.Timestamp, pd.Timestamp)]`
+            The tickers along with their start and end dates.
+        """
+        ticker_ranges = []
+        with open(input_file, "r") as ticker_file:
+            for line in ticker_file:
+                parts = line.strip().split(",")
+                if len(parts) != 3:
+                    print("Skipping invalid line: %s" % line.strip())
+                    continue
+                ticker, start_date, end_date = parts
+                ticker_ranges.append(
+                    (ticker, pd.Timestamp(start_date), pd.Timestamp(end_date))
+                )
+        return ticker_ranges
+
+    def _csv_path(self, ticker):
+        return os.path.join(self.output_dir, "%s.csv" % ticker)
+
+    @staticmethod
+    def _read_header_and_last_line(csv_path):
+        """
+        Read the header and final line of a CSV file, seeking to the
+        end of the file rather than reading its full contents.
+
+        Parameters
+        ----------
+        csv_path : `str`
+            The path to the CSV file.
+
+        Returns
+        -------
+        `tuple(str, str)`
+            The header and final non-empty line.
+        """
+        with open(csv_path, "rb") as csv_file:
+            header = csv_file.readline().decode("utf-8").strip()
+            csv_file.seek(0, os.SEEK_END)
+            pos = csv_file.tell()
+            block = b""
+            while pos > 0 and block.strip().count(b"\n") < 1:
+                step = min(4096, pos)
+                pos -= step
+                csv_file.seek(pos)
+                block = csv_file.read(step) + block
+        return header, block.strip().split(b"\n")[-1].decode("utf-8").strip()
+
+    def last_stored_date(self, ticker):
+        """
+        Determine the date of the final bar stored for a ticker.
+
+        Parameters
+        ----------
+        ticker : `str`
+            The ticker symbol.
+
+        Returns
+        -------
+        `pd.Timestamp` or `None`
+            The final stored date (timezone-naive), or None if no
+            bars are stored.
+        """
+        csv_path = self._csv_path(ticker)
+        if not os.path.exists(csv_path):
+            return None
+        header, last_line = self._read_header_and_last_line(csv_path)
+        if last_line == header:
+            return None
+        last_date = pd.Timestamp(last_line.split(",")[0])
+        if last_date.tz is not None:
+            last_date = last_date.tz_localize(None)
+        return last_date.normalize()
+
+    def _fetch_with_retry(self, ticker, start_date, end_date, require_bars=False):
+        """
+        Fetch the bars of a ticker, retrying failures with
+        exponential backoff.
+
+        Parameters
+        ----------
+        ticker : `str`
+            The ticker symbol.
+        start_date : `pd.Timestamp`
+            The first date to fetch, inclusive.
+        end_date : `pd.Timestamp`
+            The final date to fetch, exclusive.
+        require_bars : `Boolean`, optional
+            Whether the range is known to contain stored bars, such that
+            an empty download is a failure. Defaults to False.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The daily bars.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                data = self.provider.fetch(ticker, start_date, end_date)
+                if require_bars and data.empty:
+                    raise IOError(
+                        'No bars were downloaded for "%s" from %s, which is '
+                        'already stored.' % (ticker, start_date.date())
+                    )
+                return data
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                if settings.PRINT_EVENTS:
+                    print(
+                        "Retrying download of '%s' (attempt %d of %d)..." % (
+                            ticker, attempt + 2, self.max_retries + 1
+                        )
+                    )
+                time.sleep(self.backoff * 2 ** attempt)
+
+    @staticmethod
+    def _adjustment_factor(bars):
+        """
+        Obtain the adjustment factor of the final of some bars, or
+        NaN if the bars do not provide adjusted closing prices.
+        """
+        if len(bars) == 0 or "Adj Close" not in bars.columns:
+            return np.nan
+        close = float(bars["Close"].iloc[-1])
+        if close == 0.0:
+            return np.nan
+        return float(bars["Adj Close"].iloc[-1]) / close
+
+    def _stored_adjustment_factor(self, csv_path):
+        """
+        Obtain the adjustment factor of the final stored bar of
+        a CSV file, reading only its header and final line.
+        """
+        header, last_line = self._read_header_and_last_line(csv_path)
+        columns = header.split(",")
+        values = last_line.split(",")
+        if len(values) != len(columns):
+            return np.nan
+        try:
+            last_bar = pd.DataFrame(
+                [[float(value) for value in values[1:]]], columns=columns[1:]
+            )
+        except ValueError:
+            return np.nan
+        return self._adjustment_factor(last_bar)
+
+    def _restate_bars(self, csv_path, data, last_date, ratio):
+        """
+        Rewrite a CSV file with its stored adjusted prices restated by
+        the change in adjustment factor since the last ingest, along
+        with the newly fetched bars. The file is replaced atomically.
+
+        Parameters
+        ----------
+        csv_path : `str`
+            The path to the CSV file.
+        data : `pd.DataFrame`
+            The newly fetched bars.
+        last_date : `pd.Timestamp`
+            The final date already stored.
+        ratio : `float`
+            The ratio of the new to the stored adjustment factor.
+        """
+        stored = pd.read_csv(csv_path, index_col=0, parse_dates=True)
+        stored["Adj Close"] = stored["Adj Close"] * ratio
+        dates = data.index.tz_localize(None) if data.index.tz else data.index
+        combined = pd.concat([stored, data[dates.normalize() > last_date]])
+        if self.adjust or ADJ_FACTOR_COLUMN in stored.columns:
+            combined = add_adjusted_columns(combined)
+        self._replace_csv(csv_path, combined)
+
+    @staticmethod
+    def _replace_csv(csv_path, data):
+        """
+        Write bars to a temporary file and atomically replace a CSV file
+        with it, such that an interrupted write never truncates the file.
+
+        Parameters
+        ----------
+        csv_path : `str`
+            The path to the CSV file.
+        data : `pd.DataFrame`
+            The bars to write.
+        """
+        tmp_path = "%s.%d.%d.tmp" % (csv_path, os.getpid(), threading.get_ident())
+        try:
+            data.to_csv(tmp_path)
+            os.replace(tmp_path, csv_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _append_bars(self, csv_path, data, last_date):
+        """
+        Append newly fetched bars to an existing CSV file, matching its
+        column order. Should the columns differ the file is rewritten
+        with the combined bars instead, atomically.
+
+        Parameters
+        ----------
+        csv_path : `str`
+            The path to the CSV file.
+        data : `pd.DataFrame`
+            The newly fetched bars.
+        last_date : `pd.Timestamp`
+            The final date already stored.
+        """
+        dates = data.index.tz_localize(None) if data.index.tz else data.index
+        data = data[dates.normalize() > last_date]
+        if data.empty:
+            return
+
+        header, _ = self._read_header_and_last_line(csv_path)
+        columns = header.split(",")[1:]
+        if sorted(columns) == sorted(str(column) for column in data.columns):
+            data[columns].to_csv(csv_path, mode="a", header=False)
+        else:
+            stored = pd.read_csv(csv_path, index_col=0, parse_dates=True)
+            combined = pd.concat([stored, data])
+            if self.adjust or ADJ_FACTOR_COLUMN in stored.columns:
+                combined = add_adjusted_columns(combined)
+            self._replace_csv(csv_path, combined)
+
+    def ingest_ticker(self, ticker, start_date, end_date):
+        """
+        Fetch and store the bars of a single ticker.
+
+        Parameters
+        ----------
+        ticker : `str`
+            The ticker symbol.
+        start_date : `pd.Timestamp`
+            The first date to fetch, inclusive.
+        end_date : `pd.Timestamp`
+            The final date to fetch, exclusive.
+
+        Returns
+        -------
+        `str`
+            The outcome, one of 'written', 'appended', 'restated',
+            'up-to-date' or 'empty'.
+        """
+        csv_path = self._csv_path(ticker)
+        last_date = self.last_stored_date(ticker) if self.incremental else None
+        if last_date is not None:
+            if max(start_date, last_date + pd.Timedelta(days=1)) >= end_date:
+                return "up-to-date"
+            # Re-fetch the final stored bar alongside the missing bars
+            start_date = max(start_date, last_date)
+
+        data = self._fetch_with_retry(
+            ticker, start_date, end_date,
+            require_bars=last_date is not None and start_date == last_date
+        )
+        if data.empty:
+            return "empty"
+
+        if self.adjust:
+            data = add_adjusted_columns(data)
+        if last_date is not None:
+            dates = data.index.tz_localize(None) if data.index.tz else data.index
+            overlap = data[dates.normalize() == last_date]
+            ratio = (
+                self._adjustment_factor(overlap) /
+                self._stored_adjustment_factor(csv_path)
+            )
+            if np.isfinite(ratio) and not np.isclose(ratio, 1.0, rtol=1e-8, atol=0.0):
+                self._restate_bars(csv_path, data, last_date, ratio)
+                return "restated"
+            if not (dates.normalize() > last_date).any():
+                return "up-to-date"
+            self._append_bars(csv_path, data, last_date)
+            return "appended"
+        self._replace_csv(csv_path, data)
+        return "written"
+
+    def _ingest_ticker_safely(self, ticker, start_date, end_date):
+        """
+        Ingest a single ticker, reporting (rather than raising)
+        any failure once its retries are exhausted.
+        """
+        try:
+            outcome = self.ingest_ticker(ticker, start_date, end_date)
+        except Exception as e:
+            print("Error fetching data for %s: %s" % (ticker, e))
+            return "failed"
+        if settings.PRINT_EVENTS:
+            print("Ingested '%s' (%s)" % (ticker, outcome))
+        return outcome
+
+    def ingest(self, ticker_ranges):
+        """
+        Ingest many tickers concurrently.
+
+        Parameters
+        ----------
+        ticker_ranges : `list[tuple(str, pd.Timestamp, pd.Timestamp)]`
+            The tickers along with their start and end dates. Only the
+            first occurrence of a repeated ticker is ingested.
+
+        Returns
+        -------
+        `dict{str: str}`
+            The outcome of each ticker, including 'failed' for those
+            which could not be downloaded.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        unique_ranges = {}
+        for ticker, start_date, end_date in ticker_ranges:
+            unique_ranges.setdefault(ticker, (start_date, end_date))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                ticker: executor.submit(
+                    self._ingest_ticker_safely, ticker, start_date, end_date
+                )
+                for ticker, (start_date, end_date) in unique_ranges.items()
+            }
+            return {ticker: future.result() for ticker, future in futures.items()}
@@ -0,0 +1,356 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from qstrader import settings
+
+INTRADAY_FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+TIMESTAMPS_SUFFIX = ".timestamps.npy"
+BARS_SUFFIX = ".bars.npy"
+
+
+class IntradayBarDataSource(object):
+    """
+    Provides prices from intraday OHLCV bars, e.g. of one minute to one
+    hour, stored in a compact binary format and memory-mapped upon use.
+
+    Each asset is stored as a pair of NumPy '.npy' files in the store
+    directory, namely '<ticker>.timestamps.npy', holding the sorted int64
+    nanosecond UTC bar start timestamps, and '<ticker>.bars.npy', holding
+    a (num_bars, 5) float32 or float64 array of the open, high, low, close
+    and volume of each bar. As the files are memory-mapped only the pages
+    touched by lookups are read, so that the store may contain hundreds
+    of millions of bars without being loaded into memory, and no
+    per-asset DataFrames are created.
+
+    Lookups are 'as-of' the query time, via a binary search over the
+    timestamps of the asset. The bid and ask prices at a time within a
+    bar are its opening price, whereas once the bar period has elapsed
+    they are its closing price. Prices are not corporate-action adjusted.
+
+    Parameters
+    ----------
+    store_dir : `str`
+        The directory containing the binary bar files.
+    asset_type : `str`
+        The asset type that the price/volume data is for.
+    bar_period : `pd.Timedelta`, optional
+        The period of each bar. Defaults to one minute.
+    csv_symbols : `list`, optional
+        An optional list of tickers to restrict the data source to.
+    """
+
+    def __init__(
+        self,
+        store_dir,
+        asset_type,
+        bar_period=pd.Timedelta(minutes=1),
+        csv_symbols=None
+    ):
+        self.store_dir = store_dir
+        self.asset_type = asset_type
+        self.bar_period = pd.Timedelta(bar_period)
+        self.csv_symbols = csv_symbols
+        self._attach()
+
+    def _attach(self):
+        """
+        Memory-map the binary bar files of every asset in the store.
+        """
+        if self.csv_symbols is not None:
+            tickers = list(self.csv_symbols)
+        else:
+            tickers = sorted(
+                filename[:-len(TIMESTAMPS_SUFFIX)]
+                for filename in os.listdir(self.store_dir)
+                if filename.endswith(TIMESTAMPS_SUFFIX)
+            )
+        self.asset_timestamps = {}
+        self.asset_bars = {}
+        for ticker in tickers:
+            asset = self._obtain_asset_symbol(ticker)
+            path = os.path.join(self.store_dir, ticker)
+            self.asset_timestamps[asset] = np.load(
+                path + TIMESTAMPS_SUFFIX, mmap_mode="r"
+            )
+            self.asset_bars[asset] = np.load(path + BARS_SUFFIX, mmap_mode="r")
+
+    def __getstate__(self):
+        """
+        Exclude the memory-mapped arrays, which would otherwise be
+        pickled in full, e.g. when sending the instance to worker
+        processes. They are mapped anew upon unpickling.
+        """
+        state = self.__dict__.copy()
+        state["asset_timestamps"] = None
+        state["asset_bars"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._attach()
+
+    @staticmethod
+    def _obtain_asset_symbol(ticker):
+        """
+        Return the QSTrader symbology for the asset.
+
+        TODO: Remove hardcoding to Equity asset types.
+
+        Parameters
+        ----------
+        ticker : `str`
+            The ticker of the asset.
+
+        Returns
+        -------
+        `str`
+            The QSTrader symbology of the asset. e.g. 'EQ:SPY'.
+        """
+        return "EQ:%s" % ticker
+
+    @staticmethod
+    def write_asset(store_dir, ticker, timestamps, bars, dtype=np.float32):
+        """
+        Write the intraday bars of a single asset into the store,
+        replacing any existing bars of the asset.
+
+        Parameters
+        ----------
+        store_dir : `str`
+            The directory containing the binary bar files.
+        ticker : `str`
+            The ticker of the asset.
+        timestamps : `np.ndarray`
+            The int64 nanosecond UTC bar start timestamps.
+        bars : `np.ndarray`
+            The (num_bars, 5) open, high, low, close and volume values.
+        dtype : `np.dtype`, optional
+            The floating point type of the stored values.
+            Defaults to float32.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        bars = np.asarray(bars, dtype=dtype).reshape(len(timestamps), len(INTRADAY_FIELDS))
+        order = np.argsort(timestamps, kind="stable")
+        if not np.array_equal(order, np.arange(len(order))):
+            timestamps = timestamps[order]
+            bars = bars[order]
+
+        os.makedirs(store_dir, exist_ok=True)
+        path = os.path.join(store_dir, ticker)
+        np.save(path + BARS_SUFFIX, np.ascontiguousarray(bars))
+        np.save(path + TIMESTAMPS_SUFFIX, timestamps)
+
+    @classmethod
+    def convert_csv_dir(cls, csv_dir, store_dir, dtype=np.float32):
+        """
+        Convert a directory of intraday bar CSV files, with a timestamp
+        first column and 'Open', 'High', 'Low', 'Close' and 'Volume'
+        columns, into the binary store format.
+
+        Parameters
+        ----------
+        csv_dir : `str`
+            The directory containing the '<ticker>.csv' files.
+        store_dir : `str`
+            The directory in which to write the binary bar files.
+        dtype : `np.dtype`, optional
+            The floating point type of the stored values.
+            Defaults to float32.
+        """
+        for csv_file in sorted(os.listdir(csv_dir)):
+            if not csv_file.endswith(".csv"):
+                continue
+            csv_df = pd.read_csv(
+                os.path.join(csv_dir, csv_file), index_col=0, parse_dates=True
+            )
+            index = csv_df.index
+            index = index.tz_localize(pytz.UTC) if index.tz is None else index
+            cls.write_asset(
+                store_dir,
+                csv_file.replace(".csv", ""),
+                index.tz_convert(pytz.UTC).as_unit("ns").asi8,
+                csv_df[INTRADAY_FIELDS].to_numpy(),
+                dtype=dtype
+            )
+            if settings.PRINT_EVENTS:
+                print("Converted intraday CSV file '%s'..." % csv_file)
+
+    def _locate(self, dt, asset):
+        """
+        Determine the latest bar of an asset starting at or before
+        the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The query timestamp.
+        asset : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `int`
+            The bar position, or -1 if prior to the first bar.
+        """
+        return int(
+            np.searchsorted(self.asset_timestamps[asset], dt.value, side="right")
+        ) - 1
+
+    def _get_bar_value(self, dt, asset, field):
+        pos = self._locate(dt, asset)
+        if pos < 0:
+            return np.nan
+        return float(self.asset_bars[asset][pos, INTRADAY_FIELDS.index(field)])
+
+    def get_asset_coverage(self, asset):
+        """
+        Obtain the range of timestamps for which the data source
+        provides prices for an asset, from the start of the first
+        bar through to the end of the final bar.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `tuple(pd.Timestamp, pd.Timestamp)` or `None`
+            The first and last timestamps covered, or None if the
+            data source does not provide the asset.
+        """
+        timestamps = self.asset_timestamps.get(asset)
+        if timestamps is None or len(timestamps) == 0:
+            return None
+        return (
+            pd.Timestamp(int(timestamps[0]), tz=pytz.UTC),
+            pd.Timestamp(int(timestamps[-1]), tz=pytz.UTC) + self.bar_period
+        )
+
+    def get_bid(self, dt, asset):
+        """
+        Obtain the bid price of an asset at the provided timestamp,
+        being the open of the current bar or the close of the latest
+        completed bar.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the bid price for.
+        asset : `str`
+            The asset symbol to obtain the bid price for.
+
+        Returns
+        -------
+        `float`
+            The bid price.
+        """
+        pos = self._locate(dt, asset)
+        if pos < 0:
+            return np.nan
+        bar_end = int(self.asset_timestamps[asset][pos]) + self.bar_period.value
+        field = "Close" if dt.value >= bar_end else "Open"
+        return float(self.asset_bars[asset][pos, INTRADAY_FIELDS.index(field)])
+
+    def get_ask(self, dt, asset):
+        """
+        Obtain the ask price of an asset at the provided timestamp.
+        Bid and ask prices are identical for bar data.
+        """
+        return self.get_bid(dt, asset)
+
+    def get_open(self, dt, asset):
+        return self._get_bar_value(dt, asset, "Open")
+
+    def get_high(self, dt, asset):
+        return self._get_bar_value(dt, asset, "High")
+
+    def get_low(self, dt, asset):
+        return self._get_bar_value(dt, asset, "Low")
+
+    def get_volume(self, dt, asset):
+        return self._get_bar_value(dt, asset, "Volume")
+
+    def _get_assets_values(self, dt, assets, lookup):
+        """
+        Obtain the latest values of a pricing field for many assets
+        at the provided timestamp, aligned to the provided asset order.
+        Assets unknown to the data source are set to NaN.
+        """
+        values = np.full(len(assets), np.nan)
+        for i, asset in enumerate(assets):
+            if asset in self.asset_timestamps:
+                values[i] = lookup(dt, asset)
+        return values
+
+    def get_assets_bid(self, dt, assets):
+        return self._get_assets_values(dt, assets, self.get_bid)
+
+    def get_assets_ask(self, dt, assets):
+        return self._get_assets_values(dt, assets, self.get_ask)
+
+    def get_assets_open(self, dt, assets):
+        return self._get_assets_values(dt, assets, self.get_open)
+
+    def get_assets_high(self, dt, assets):
+        return self._get_assets_values(dt, assets, self.get_high)
+
+    def get_assets_low(self, dt, assets):
+        return self._get_assets_values(dt, assets, self.get_low)
+
+    def get_assets_historical_closes(self, start_dt, end_dt, assets):
+        """
+        Obtain a multi-asset historical range of bar closing prices as a
+        DataFrame, indexed by bar start timestamp with asset symbols as
+        columns. Only the requested range of each asset is read.
+
+        Parameters
+        ----------
+        start_dt : `pd.Timestamp`
+            The starting datetime of the range to obtain.
+        end_dt : `pd.Timestamp`
+            The ending datetime of the range to obtain.
+        assets : `list[str]`
+            The list of asset symbols to obtain closing prices for.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The multi-asset closing prices DataFrame.
+        """
+        known_assets = [asset for asset in assets if asset in self.asset_timestamps]
+        close_col = INTRADAY_FIELDS.index("Close")
+        asset_ranges = []
+        for asset in known_assets:
+            timestamps = self.asset_timestamps[asset]
+            start = 0 if start_dt is None else int(
+                np.searchsorted(timestamps, start_dt.value, side="left")
+            )
+            end = len(timestamps) if end_dt is None else int(
+                np.searchsorted(timestamps, end_dt.value, side="right")
+            )
+            asset_ranges.append(
+                (
+                    np.asarray(timestamps[start:end]),
+                    np.asarray(self.asset_bars[asset][start:end, close_col])
+                )
+            )
+
+        all_timestamps = np.unique(
+            np.concatenate(
+                [np.empty(0, dtype=np.int64)] + [ts for ts, _ in asset_ranges]
+            )
+        )
+        closes = np.full((len(all_timestamps), len(known_assets)), np.nan)
+        for j, (timestamps, asset_closes) in enumerate(asset_ranges):
+            closes[np.searchsorted(all_timestamps, timestamps), j] = asset_closes
+
+        # Remove timestamps at which none of the assets have a close price
+        has_prices = ~np.isnan(closes).all(axis=1)
+        index = pd.DatetimeIndex(
+            all_timestamps[has_prices].view("datetime64[ns]"), name="Date"
+        ).tz_localize(pytz.UTC)
+        return pd.DataFrame(closes[has_prices], index=index, columns=known_assets)
@@ -0,0 +1,246 @@
+import numpy as np
+import pandas as pd
+import pytz
+
+from qstrader.data.daily_bar_csv import (
+    BAR_TIME_OFFSETS,
+    CSVDailyBarDataSource,
+    DEFAULT_ADV_WINDOW,
+)
+from qstrader.data.memmap_store import MemmapPriceStore
+
+
+class MemmapDailyBarDataSource(object):
+    """
+    Provides daily bar and bid/ask prices from a memory-mapped
+    MemmapPriceStore file, as a drop-in replacement for the
+    CSVDailyBarDataSource within a BacktestDataHandler.
+
+    The store is attached read-only, so that the prices are neither
+    parsed nor copied into each process. When many processes, e.g. the
+    workers of a parameter sweep, attach to the same store they share a
+    single physical copy of the prices via the page cache. Pickling the
+    data source only transfers the path to the store, with the receiving
+    process attaching to it anew.
+
+    Parameters
+    ----------
+    store_path : `str`
+        The path to the store file, as created by 'create'.
+    cursor : `Boolean`, optional
+        Whether to locate rows with a ForwardCursor, making lookups
+        O(1) when successive query timestamps are non-decreasing.
+        Defaults to False.
+    """
+
+    def __init__(self, store_path, cursor=False):
+        self.store_path = store_path
+        self.cursor = cursor
+        self._attach()
+
+    def _attach(self):
+        """
+        Attach to the store file, wrapping its block in a price panel.
+        """
+        self.store = MemmapPriceStore(self.store_path)
+        self.panel = self.store.to_panel(forward_cursor=self.cursor)
+
+    def __getstate__(self):
+        """
+        Exclude the memory-mapped arrays, which would otherwise be
+        pickled in full, retaining only the path to the store.
+        """
+        return {"store_path": self.store_path, "cursor": self.cursor}
+
+    def __setstate__(self, state):
+        """
+        Restore a pickled instance by attaching to the store.
+        """
+        self.__dict__.update(state)
+        self._attach()
+
+    @classmethod
+    def create(
+        cls,
+        store_path,
+        csv_dir,
+        asset_type,
+        adjust_prices=True,
+        csv_symbols=None,
+        max_workers=None,
+        cursor=False,
+        adv_window=DEFAULT_ADV_WINDOW
+    ):
+        """
+        Load a directory of daily bar CSV files, write their prices
+        into a store file and attach to it.
+
+        Parameters
+        ----------
+        store_path : `str`
+            The path of the store file to create.
+        csv_dir : `str`
+            The full path to the directory where the CSVs are located.
+        asset_type : `str`
+            The asset type that the price/volume data is for.
+        adjust_prices : `Boolean`, optional
+            Whether to utilise corporate-action adjusted prices.
+            Defaults to True.
+        csv_symbols : `list`, optional
+            An optional list of CSV symbols to restrict the store to.
+        max_workers : `int`, optional
+            The number of workers used to load the CSV files.
+        cursor : `Boolean`, optional
+            Whether the returned data source uses a ForwardCursor.
+        adv_window : `int`, optional
+            The number of daily bars averaged by the stored rolling
+            average daily (dollar) volumes. Defaults to 20.
+
+        Returns
+        -------
+        `MemmapDailyBarDataSource`
+            The data source attached to the new store.
+        """
+        csv_ds = CSVDailyBarDataSource(
+            csv_dir,
+            asset_type,
+            adjust_prices=adjust_prices,
+            csv_symbols=csv_symbols,
+            max_workers=max_workers,
+            price_cache_size=0,
+            adv_window=adv_window
+        )
+        MemmapPriceStore.write(
+            store_path, csv_ds.asset_bar_frames, csv_ds.asset_bid_ask_frames,
+            csv_ds._compute_liquidity_frames(csv_ds.asset_bar_frames)
+        )
+        return cls(store_path, cursor=cursor)
+
+    def get_asset_coverage(self, asset):
+        """
+        Obtain the range of timestamps for which the data source
+        provides prices for an asset, from the date of the first
+        daily bar through to the close of the final daily bar.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `tuple(pd.Timestamp, pd.Timestamp)` or `None`
+            The first and last timestamps covered, or None if the
+            data source does not provide the asset.
+        """
+        if asset not in self.store.coverage:
+            return None
+        first_ts, last_ts = self.store.coverage[asset]
+        return (
+            pd.Timestamp(first_ts, tz=pytz.UTC),
+            pd.Timestamp(last_ts, tz=pytz.UTC) + BAR_TIME_OFFSETS[-1]
+        )
+
+    def get_bid(self, dt, asset):
+        return self.panel.get_value("Bid", dt, asset)
+
+    def get_ask(self, dt, asset):
+        return self.panel.get_value("Ask", dt, asset)
+
+    def get_open(self, dt, asset):
+        return self.panel.get_value("Open", dt, asset)
+
+    def get_high(self, dt, asset):
+        return self.panel.get_value("High", dt, asset)
+
+    def get_low(self, dt, asset):
+        return self.panel.get_value("Low", dt, asset)
+
+    def get_volume(self, dt, asset):
+        return self.panel.get_value("Volume", dt, asset)
+
+    def get_adv(self, dt, asset):
+        return self.panel.get_value("ADV", dt, asset)
+
+    def get_dollar_adv(self, dt, asset):
+        return self.panel.get_value("Dollar ADV", dt, asset)
+
+    def _get_assets_values(self, dt, assets, field):
+        """
+        Obtain the latest values of a pricing field for many assets
+        at the provided timestamp, aligned to the provided asset order.
+        Assets unknown to the data source are set to NaN.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to obtain the values for.
+        assets : `list[str]`
+            The asset symbols to obtain the values for.
+        field : `str`
+            The pricing field, e.g. 'Bid'.
+
+        Returns
+        -------
+        `np.ndarray`
+            The values aligned to the provided asset order.
+        """
+        values = np.full(len(assets), np.nan)
+        known = [
+            i for i, asset in enumerate(assets) if asset in self.panel.asset_index
+        ]
+        if len(known) > 0:
+            values[known] = self.panel.get_cross_section(
+                field, dt, [assets[i] for i in known]
+            )
+        return values
+
+    def get_assets_bid(self, dt, assets):
+        return self._get_assets_values(dt, assets, "Bid")
+
+    def get_assets_ask(self, dt, assets):
+        return self._get_assets_values(dt, assets, "Ask")
+
+    def get_assets_open(self, dt, assets):
+        return self._get_assets_values(dt, assets, "Open")
+
+    def get_assets_high(self, dt, assets):
+        return self._get_assets_values(dt, assets, "High")
+
+    def get_assets_low(self, dt, assets):
+        return self._get_assets_values(dt, assets, "Low")
+
+    def get_assets_volume(self, dt, assets):
+        return self._get_assets_values(dt, assets, "Volume")
+
+    def get_assets_adv(self, dt, assets):
+        return self._get_assets_values(dt, assets, "ADV")
+
+    def get_assets_dollar_adv(self, dt, assets):
+        return self._get_assets_values(dt, assets, "Dollar ADV")
+
+    def get_assets_historical_closes(self, start_dt, end_dt, assets):
+        """
+        Obtain a multi-asset historical range of closing prices as a DataFrame,
+        indexed by timestamp with asset symbols as columns.
+
+        Parameters
+        ----------
+        start_dt : `pd.Timestamp`
+            The starting datetime of the range to obtain.
+        end_dt : `pd.Timestamp`
+            The ending datetime of the range to obtain.
+        assets : `list[str]`
+            The list of asset symbols to obtain closing prices for.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The multi-asset closing prices DataFrame.
+        """
+        known_assets = [asset for asset in assets if asset in self.panel.asset_index]
+        prices_df = self.panel.get_range("Bar Close", start_dt, end_dt, known_assets)
+
+        # Only the timestamps of daily bars have closing prices
+        has_prices = ~np.isnan(prices_df.to_numpy()).all(axis=1)
+        return prices_df[has_prices]
@@ -0,0 +1,245 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+from qstrader.data.daily_bar_csv import LIQUIDITY_FIELDS
+from qstrader.data.price_panel import PricePanel
+
+MEMMAP_MAGIC = b"QSMMAP01"
+MEMMAP_ALIGNMENT = 64
+
+# The padded bar and bid/ask fields, followed by the unpadded closing
+# prices used for historical ranges and the padded liquidity fields
+MEMMAP_FIELDS = [
+    "Open", "High", "Low", "Close", "Bid", "Ask", "Bar Close"
+] + LIQUIDITY_FIELDS
+
+
+class MemmapPriceStore(object):
+    """
+    A read-only, memory-mapped on-disk store of daily bar and bid/ask
+    prices for many assets, which any number of processes can attach to
+    without copying. The operating system page cache then serves all
+    attached processes from a single physical copy of the prices.
+
+    The file consists of a JSON header, containing the asset symbols,
+    field names and the timestamp range covered by each asset, followed
+    by the sorted int64 nanosecond UTC timestamp axis and a single
+    float64 block of shape (num_timestamps, num_assets, num_fields).
+    Each row of the block is therefore the full cross-section of all
+    assets and fields at one timestamp.
+
+    The timestamp axis is the union of the daily bar and intraday
+    bid/ask timestamps, with every field aligned with 'pad' semantics,
+    except for 'Bar Close' which only holds the closing price at the
+    timestamps of each asset's daily bars. The liquidity fields, i.e.
+    the volumes and rolling average volumes, are aligned from the
+    close of each daily bar.
+
+    Parameters
+    ----------
+    path : `str`
+        The path to the store file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as store_file:
+            if store_file.read(len(MEMMAP_MAGIC)) != MEMMAP_MAGIC:
+                raise ValueError(
+                    "File '%s' is not a memory-mapped price store." % path
+                )
+            header_len = int(np.frombuffer(store_file.read(8), dtype="<u8")[0])
+            header = json.loads(store_file.read(header_len).decode("utf-8"))
+
+        self.assets = header["assets"]
+        self.fields = header["fields"]
+        self.asset_index = {asset: i for i, asset in enumerate(self.assets)}
+        self.field_index = {field: i for i, field in enumerate(self.fields)}
+        self.coverage = header["coverage"]
+
+        num_timestamps = header["num_timestamps"]
+        values_shape = (num_timestamps, len(self.assets), len(self.fields))
+        if num_timestamps == 0 or len(self.assets) == 0:
+            # Empty regions cannot be memory-mapped
+            self.timestamps = np.zeros(num_timestamps, dtype=np.int64)
+            self.values = np.zeros(values_shape)
+            return
+
+        self.timestamps = np.memmap(
+            path, dtype="<i8", mode="r",
+            offset=header["timestamps_offset"], shape=(num_timestamps,)
+        )
+        self.values = np.memmap(
+            path, dtype="<f8", mode="r",
+            offset=header["values_offset"], shape=values_shape
+        )
+
+    @staticmethod
+    def _aligned(offset):
+        return -(-offset // MEMMAP_ALIGNMENT) * MEMMAP_ALIGNMENT
+
+    @classmethod
+    def write(
+        cls, path, asset_bar_frames, asset_bid_ask_frames,
+        asset_liquidity_frames=None
+    ):
+        """
+        Write the daily bar and bid/ask DataFrames of many assets, as
+        prepared by a CSVDailyBarDataSource, into a store file.
+
+        The block is filled one asset at a time through a writable
+        memory map, so that it is never held in memory in full. The
+        file is written alongside the destination and moved into place
+        once complete, such that attached readers never observe a
+        partially written store.
+
+        Parameters
+        ----------
+        path : `str`
+            The path of the store file to create.
+        asset_bar_frames : `dict{str: pd.DataFrame}`
+            The asset-symbol keyed daily bar DataFrames.
+        asset_bid_ask_frames : `dict{str: pd.DataFrame}`
+            The asset-symbol keyed bid/ask DataFrames.
+        asset_liquidity_frames : `dict{str: pd.DataFrame}`, optional
+            The asset-symbol keyed liquidity DataFrames. The liquidity
+            fields are left missing if not provided.
+
+        Returns
+        -------
+        `MemmapPriceStore`
+            The store, attached to the newly written file.
+        """
+        assets = list(asset_bar_frames.keys())
+        if asset_liquidity_frames is None:
+            asset_liquidity_frames = {}
+        bar_timestamps = {
+            asset: asset_bar_frames[asset].index.as_unit("ns").asi8
+            for asset in assets
+        }
+        bid_ask_timestamps = {
+            asset: asset_bid_ask_frames[asset].index.as_unit("ns").asi8
+            for asset in assets
+        }
+        timestamps = np.unique(
+            np.concatenate(
+                [np.empty(0, dtype=np.int64)] +
+                list(bar_timestamps.values()) +
+                list(bid_ask_timestamps.values()) + [
+                    liquidity_df.index.as_unit("ns").asi8
+                    for liquidity_df in asset_liquidity_frames.values()
+                ]
+            )
+        )
+
+        coverage = {}
+        for asset in assets:
+            if len(bar_timestamps[asset]) > 0:
+                coverage[asset] = [
+                    int(bar_timestamps[asset][0]), int(bar_timestamps[asset][-1])
+                ]
+
+        header = {
+            "assets": assets,
+            "fields": MEMMAP_FIELDS,
+            "coverage": coverage,
+            "num_timestamps": len(timestamps),
+        }
+        # The offsets depend upon the header length, which in turn
+        # depends upon the offsets, so reserve space for them first
+        header["timestamps_offset"] = 0
+        header["values_offset"] = 0
+        header_len = len(json.dumps(header).encode("utf-8")) + 64
+        header["timestamps_offset"] = cls._aligned(
+            len(MEMMAP_MAGIC) + 8 + header_len
+        )
+        header["values_offset"] = cls._aligned(
+            header["timestamps_offset"] + timestamps.nbytes
+        )
+        header_bytes = json.dumps(header).encode("utf-8").ljust(header_len)
+        values_shape = (len(timestamps), len(assets), len(MEMMAP_FIELDS))
+
+        tmp_path = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+        with open(tmp_path, "wb") as store_file:
+            store_file.write(MEMMAP_MAGIC)
+            store_file.write(np.array([header_len], dtype="<u8").tobytes())
+            store_file.write(header_bytes)
+            store_file.seek(header["timestamps_offset"])
+            store_file.write(timestamps.astype("<i8").tobytes())
+            store_file.truncate(
+                header["values_offset"] + int(np.prod(values_shape)) * 8
+            )
+
+        if len(timestamps) > 0 and len(assets) > 0:
+            values = np.memmap(
+                tmp_path, dtype="<f8", mode="r+",
+                offset=header["values_offset"], shape=values_shape
+            )
+            for j, asset in enumerate(assets):
+                cls._write_asset(
+                    values, j, timestamps,
+                    bar_timestamps[asset], asset_bar_frames[asset],
+                    bid_ask_timestamps[asset], asset_bid_ask_frames[asset],
+                    asset_liquidity_frames.get(asset)
+                )
+            values.flush()
+            del values
+        os.replace(tmp_path, path)
+        return cls(path)
+
+    @staticmethod
+    def _write_asset(
+        values, j, timestamps, bar_ts, bar_df, bid_ask_ts, bid_ask_df,
+        liquidity_df=None
+    ):
+        """
+        Align the prices of a single asset onto the timestamp axis
+        and write them into its column of the block.
+        """
+        sources = [
+            (bar_ts, bar_df, ["Open", "High", "Low", "Close"], True),
+            (bid_ask_ts, bid_ask_df, ["Bid", "Ask"], True),
+            (bar_ts, bar_df, ["Close"], False),
+        ]
+        if liquidity_df is not None:
+            sources.append(
+                (
+                    liquidity_df.index.as_unit("ns").asi8, liquidity_df,
+                    LIQUIDITY_FIELDS, True
+                )
+            )
+        asset_values = np.full((len(timestamps), len(MEMMAP_FIELDS)), np.nan)
+        f = 0
+        for source_ts, df, columns, pad in sources:
+            pos, valid = PricePanel._align_positions(source_ts, timestamps, pad)
+            for column in columns:
+                asset_values[valid, f] = df[column].to_numpy(
+                    dtype=np.float64
+                )[pos[valid]]
+                f += 1
+        values[:, j, :] = asset_values
+
+    def to_panel(self, forward_cursor=False):
+        """
+        Create a PricePanel whose fields are zero-copy views
+        of the memory-mapped block.
+
+        Parameters
+        ----------
+        forward_cursor : `Boolean`, optional
+            Whether to locate rows with a ForwardCursor.
+
+        Returns
+        -------
+        `PricePanel`
+            The price panel.
+        """
+        fields = {
+            field: self.values[:, :, f] for f, field in enumerate(self.fields)
+        }
+        return PricePanel(
+            self.timestamps, self.assets, fields, forward_cursor=forward_cursor
+        )
@@ -0,0 +1,137 @@
+from collections import namedtuple, OrderedDict
+
+import pandas as pd
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+EVICTION_POLICIES = ["lru", "fifo"]
+
+
+class PriceCache(object):
+    """
+    A bounded memoisation cache for the point price lookups of a
+    single data source instance.
+
+    Entries are keyed by a tuple of small integers, namely the lookup
+    method, the int64 nanosecond UTC timestamp and the asset, rather
+    than by hashing `pd.Timestamp` objects and asset symbol strings.
+    Asset symbols are mapped to integer identifiers upon first use.
+
+    Once the cache is full an entry is evicted for each new entry,
+    either the least recently used ('lru') or the oldest ('fifo').
+
+    Parameters
+    ----------
+    maxsize : `int` or `None`, optional
+        The maximum number of entries held. None leaves the cache
+        unbounded and zero disables caching. Defaults to 1024 * 1024.
+    policy : `str`, optional
+        The eviction policy, either 'lru' or 'fifo'. Defaults to 'lru'.
+    """
+
+    def __init__(self, maxsize=1024 * 1024, policy="lru"):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(
+                "Unknown price cache eviction policy '%s'. "
+                "Must be one of %s." % (policy, EVICTION_POLICIES)
+            )
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(
+                "Price cache maxsize must be non-negative or None, "
+                "not '%s'." % maxsize
+            )
+        self.maxsize = maxsize
+        self.policy = policy
+        self.entries = OrderedDict()
+        self.asset_ids = {}
+        self.num_lookups = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _asset_id(self, asset):
+        """
+        Obtain the integer identifier of an asset symbol,
+        assigning a new identifier if the asset is unseen.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `int`
+            The asset identifier.
+        """
+        asset_id = self.asset_ids.get(asset)
+        if asset_id is None:
+            asset_id = len(self.asset_ids)
+            self.asset_ids[asset] = asset_id
+        return asset_id
+
+    def memoise(self, lookup):
+        """
+        Wrap a point price lookup method in the cache.
+
+        Parameters
+        ----------
+        lookup : `callable`
+            The lookup method, taking a timestamp (e.g. `pd.Timestamp`
+            or `datetime.datetime`) and an asset.
+
+        Returns
+        -------
+        `callable`
+            The memoised lookup method.
+        """
+        lookup_id = self.num_lookups
+        self.num_lookups += 1
+        if self.maxsize == 0:
+            return lookup
+
+        entries = self.entries
+        lru = self.policy == "lru"
+
+        def memoised_lookup(dt, asset):
+            # Other timestamp types (e.g. datetime) lack a 'value'
+            ts = dt.value if isinstance(dt, pd.Timestamp) else pd.Timestamp(dt).value
+            key = (lookup_id, ts, self._asset_id(asset))
+            try:
+                value = entries[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                if lru:
+                    entries.move_to_end(key)
+                return value
+
+            value = lookup(dt, asset)
+            entries[key] = value
+            if self.maxsize is not None and len(entries) > self.maxsize:
+                entries.popitem(last=False)
+            return value
+
+        memoised_lookup.__wrapped__ = lookup
+        memoised_lookup.cache_info = self.cache_info
+        memoised_lookup.cache_clear = self.clear
+        return memoised_lookup
+
+    def cache_info(self):
+        """
+        Report the cache statistics.
+
+        Returns
+        -------
+        `CacheInfo`
+            The hits, misses, maximum size and current size.
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.entries))
+
+    def clear(self):
+        """
+        Remove all cache entries and reset the statistics.
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
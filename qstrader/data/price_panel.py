@@ -0,0 +1,525 @@
+import numpy as np
+import pandas as pd
+import pytz
+
+from qstrader.data.cursor import ForwardCursor
+
+
+class _PanelState(object):
+    """
+    The immutable arrays and lookups of a PricePanel, replaced as a
+    whole when the panel is extended, such that a reader holding a
+    reference to the state always sees a consistent timestamp axis,
+    asset order and set of field arrays.
+
+    Parameters
+    ----------
+    timestamps : `np.ndarray`
+        The sorted int64 nanosecond UTC timestamp axis.
+    assets : `list[str]`
+        The asset symbols, in column order.
+    fields : `dict{str: np.ndarray}`
+        The field name keyed (num_timestamps, num_assets) arrays.
+    forward_cursor : `Boolean`
+        Whether to locate rows with a ForwardCursor.
+    """
+
+    __slots__ = ("timestamps", "assets", "asset_index", "fields", "cursor", "index")
+
+    def __init__(self, timestamps, assets, fields, forward_cursor):
+        self.timestamps = timestamps
+        self.assets = list(assets)
+        self.asset_index = {asset: i for i, asset in enumerate(self.assets)}
+        self.fields = fields
+        self.cursor = ForwardCursor(timestamps) if forward_cursor else None
+        self.index = None
+
+
+class PricePanel(object):
+    """
+    Stores timestamped pricing fields for many assets as dense
+    time x asset arrays sharing a single sorted timestamp axis.
+
+    Timestamps are held as int64 nanoseconds since the UTC epoch and
+    each field (e.g. 'Open' or 'Bid') is a C-contiguous float64 array
+    of shape (num_timestamps, num_assets). A single row is therefore
+    the full cross-section of an asset universe at one timestamp.
+
+    Values are aligned with 'pad' semantics by default. The value of an
+    asset at a panel timestamp is that of the latest row of the asset's
+    own data at or before that timestamp. Timestamps preceding the first
+    row of an asset are NaN. Without padding, values are only present
+    at the asset's own timestamps and NaN elsewhere, as with an outer
+    join of the per-asset data.
+
+    The panel arrays are held in a single state object, which is swapped
+    atomically when assets are added. Lookups obtain the state once, so
+    readers on other threads never observe a timestamp axis that does
+    not match the field arrays, without taking a lock.
+
+    Parameters
+    ----------
+    timestamps : `np.ndarray`
+        The sorted int64 nanosecond UTC timestamp axis.
+    assets : `list[str]`
+        The asset symbols, in column order.
+    fields : `dict{str: np.ndarray}`
+        The field name keyed (num_timestamps, num_assets) arrays.
+    forward_cursor : `Boolean`, optional
+        Whether to locate rows with a ForwardCursor, making lookups
+        O(1) when successive query timestamps are non-decreasing.
+    pad : `Boolean`, optional
+        Whether the values are aligned with 'pad' semantics.
+    """
+
+    def __init__(
+        self, timestamps, assets, fields, forward_cursor=False, pad=True
+    ):
+        self.pad = pad
+        self._state = _PanelState(timestamps, assets, fields, forward_cursor)
+
+    @property
+    def timestamps(self):
+        """
+        The sorted int64 nanosecond UTC timestamp axis.
+        """
+        return self._state.timestamps
+
+    @property
+    def assets(self):
+        """
+        The asset symbols, in column order.
+        """
+        return self._state.assets
+
+    @property
+    def asset_index(self):
+        """
+        The column positions of the assets, keyed by symbol.
+        """
+        return self._state.asset_index
+
+    @property
+    def fields(self):
+        """
+        The field name keyed (num_timestamps, num_assets) arrays.
+        """
+        return self._state.fields
+
+    @property
+    def cursor(self):
+        """
+        The ForwardCursor locating rows, if one is used.
+        """
+        return self._state.cursor
+
+    @staticmethod
+    def _align_positions(source_timestamps, target_timestamps, pad):
+        """
+        Determine, for each target timestamp, the row of the source
+        timestamps providing its value.
+
+        Parameters
+        ----------
+        source_timestamps : `np.ndarray`
+            The sorted int64 nanosecond timestamps of the source rows.
+        target_timestamps : `np.ndarray`
+            The sorted int64 nanosecond timestamps to align onto.
+        pad : `Boolean`
+            Whether to use the latest source row at or before each
+            target timestamp, rather than only an identical timestamp.
+
+        Returns
+        -------
+        `tuple(np.ndarray, np.ndarray)`
+            The source row positions and the mask of target timestamps
+            for which a source row exists.
+        """
+        if pad:
+            pos = np.searchsorted(
+                source_timestamps, target_timestamps, side="right"
+            ) - 1
+            return pos, pos >= 0
+
+        pos = np.searchsorted(source_timestamps, target_timestamps, side="left")
+        valid = pos < len(source_timestamps)
+        valid[valid] = source_timestamps[pos[valid]] == target_timestamps[valid]
+        return pos, valid
+
+    @classmethod
+    def from_frames(cls, asset_frames, columns, forward_cursor=False, pad=True):
+        """
+        Create a PricePanel by aligning per-asset timestamp-indexed
+        DataFrames onto the union of their timestamps.
+
+        Parameters
+        ----------
+        asset_frames : `dict{str: pd.DataFrame}`
+            The asset symbol keyed DataFrames, indexed by UTC timestamp.
+        columns : `list[str]`
+            The DataFrame columns to store as panel fields.
+        forward_cursor : `Boolean`, optional
+            Whether to locate rows with a ForwardCursor.
+        pad : `Boolean`, optional
+            Whether to align the values with 'pad' semantics.
+
+        Returns
+        -------
+        `PricePanel`
+            The aligned price panel.
+        """
+        assets = list(asset_frames.keys())
+        asset_timestamps = [
+            cls._frame_timestamps(asset_frames[asset]) for asset in assets
+        ]
+        if len(asset_timestamps) > 0:
+            timestamps = np.unique(np.concatenate(asset_timestamps))
+        else:
+            timestamps = np.empty(0, dtype=np.int64)
+
+        fields = {
+            column: np.full((len(timestamps), len(assets)), np.nan)
+            for column in columns
+        }
+        for j, asset in enumerate(assets):
+            pos, valid = cls._align_positions(asset_timestamps[j], timestamps, pad)
+            for column in columns:
+                values = asset_frames[asset][column].to_numpy(dtype=np.float64)
+                fields[column][valid, j] = values[pos[valid]]
+        return cls(
+            timestamps, assets, fields, forward_cursor=forward_cursor, pad=pad
+        )
+
+    def add_assets(self, asset_frames):
+        """
+        Extend the panel with further assets, realigning the existing
+        assets onto the union of the current and new timestamps.
+
+        As the current axis contains every timestamp of the existing
+        assets, they are realigned exactly by aligning the current rows
+        onto the new axis in the same manner as the asset data.
+
+        Parameters
+        ----------
+        asset_frames : `dict{str: pd.DataFrame}`
+            The asset symbol keyed DataFrames of the new assets,
+            containing a column for every panel field.
+        """
+        state = self._state
+        new_assets = [
+            asset for asset in asset_frames.keys() if asset not in state.asset_index
+        ]
+        if len(new_assets) == 0:
+            return
+
+        new_panel = PricePanel.from_frames(
+            {asset: asset_frames[asset] for asset in new_assets},
+            list(state.fields.keys()),
+            pad=self.pad
+        )
+        timestamps = np.union1d(state.timestamps, new_panel.timestamps)
+        old_pos, old_valid = self._align_positions(
+            state.timestamps, timestamps, self.pad
+        )
+        new_pos, new_valid = self._align_positions(
+            new_panel.timestamps, timestamps, self.pad
+        )
+
+        fields = {}
+        for field in state.fields.keys():
+            values = np.full(
+                (len(timestamps), len(state.assets) + len(new_assets)), np.nan
+            )
+            values[old_valid, :len(state.assets)] = (
+                state.fields[field][old_pos[old_valid]]
+            )
+            values[new_valid, len(state.assets):] = (
+                new_panel.fields[field][new_pos[new_valid]]
+            )
+            fields[field] = values
+
+        # Publish the extended panel with a single assignment
+        self._state = _PanelState(
+            timestamps, state.assets + new_assets, fields, state.cursor is not None
+        )
+
+    @staticmethod
+    def _frame_timestamps(df):
+        """
+        Obtain the sorted int64 nanosecond UTC timestamps of
+        a DataFrame index.
+
+        Parameters
+        ----------
+        df : `pd.DataFrame`
+            The timestamp-indexed DataFrame.
+
+        Returns
+        -------
+        `np.ndarray`
+            The int64 nanosecond timestamps.
+        """
+        return df.index.as_unit("ns").asi8
+
+    @staticmethod
+    def _timestamp_value(dt):
+        """
+        Convert a timestamp into int64 nanoseconds since the UTC epoch.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to convert.
+
+        Returns
+        -------
+        `int`
+            The nanoseconds since the UTC epoch.
+        """
+        return pd.Timestamp(dt).value
+
+    def locate(self, dt):
+        """
+        Determine the row of the latest panel timestamp at or
+        before the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to locate.
+
+        Returns
+        -------
+        `int`
+            The row position, or -1 if it precedes the panel.
+        """
+        return self._locate(self._state, dt)
+
+    def _locate(self, state, dt):
+        """
+        Determine the row of the latest timestamp of a panel state
+        at or before the provided timestamp.
+        """
+        ts = self._timestamp_value(dt)
+        if state.cursor is not None:
+            return state.cursor.locate(ts)
+        return int(np.searchsorted(state.timestamps, ts, side="right")) - 1
+
+    def get_value(self, field, dt, asset):
+        """
+        Obtain the value of a field for a single asset at the
+        provided timestamp.
+
+        Parameters
+        ----------
+        field : `str`
+            The field name, e.g. 'Bid'.
+        dt : `pd.Timestamp`
+            The timestamp to obtain the value for.
+        asset : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `float`
+            The field value, or NaN prior to the asset's first row.
+        """
+        state = self._state
+        col = state.asset_index[asset]
+        row = self._locate(state, dt)
+        if row < 0:
+            return np.nan
+        return state.fields[field][row, col]
+
+    def get_cross_section(self, field, dt, assets=None):
+        """
+        Obtain the values of a field for many assets at the
+        provided timestamp as a single vector.
+
+        Parameters
+        ----------
+        field : `str`
+            The field name, e.g. 'Bid'.
+        dt : `pd.Timestamp`
+            The timestamp to obtain the values for.
+        assets : `list[str]`, optional
+            The asset symbols. Defaults to all panel assets.
+
+        Returns
+        -------
+        `np.ndarray`
+            The field values aligned to the provided asset order.
+        """
+        state = self._state
+        row = self._locate(state, dt)
+        if assets is None:
+            if row < 0:
+                return np.full(len(state.assets), np.nan)
+            return state.fields[field][row].copy()
+
+        cols = [state.asset_index[asset] for asset in assets]
+        if row < 0:
+            return np.full(len(cols), np.nan)
+        return state.fields[field][row, cols]
+
+    def get_cross_sections(self, field, dts, assets=None):
+        """
+        Obtain the values of a field for many assets at many
+        timestamps with a single vectorised lookup.
+
+        Parameters
+        ----------
+        field : `str`
+            The field name, e.g. 'Bid'.
+        dts : `pd.DatetimeIndex`
+            The sorted timestamps to obtain the values for.
+        assets : `list[str]`, optional
+            The asset symbols. Defaults to all panel assets.
+
+        Returns
+        -------
+        `np.ndarray`
+            The (num_timestamps, num_assets) field values, aligned to
+            the provided timestamp and asset order, NaN prior to the
+            start of the panel.
+        """
+        state = self._state
+        rows = np.searchsorted(
+            state.timestamps, pd.DatetimeIndex(dts).as_unit("ns").asi8, side="right"
+        ) - 1
+        cols = (
+            slice(None) if assets is None
+            else [state.asset_index[asset] for asset in assets]
+        )
+        values = state.fields[field][np.maximum(rows, 0)][:, cols]
+        values[rows < 0] = np.nan
+        return values
+
+    @property
+    def index(self):
+        """
+        The timestamp axis as a UTC DatetimeIndex, created upon
+        first use and retained until the axis is extended.
+        """
+        return self._state_index(self._state)
+
+    @staticmethod
+    def _state_index(state):
+        """
+        Obtain (creating if necessary) the DatetimeIndex of the
+        timestamp axis of a panel state.
+        """
+        if state.index is None:
+            state.index = pd.DatetimeIndex(
+                state.timestamps.view("datetime64[ns]"), name="Date"
+            ).tz_localize(pytz.UTC)
+        return state.index
+
+    @staticmethod
+    def _column_selector(state, assets):
+        """
+        Determine the column selector of the provided assets. Assets
+        occupying consecutive columns in order are selected with a
+        slice, which is cheaper to index with than a list.
+
+        Parameters
+        ----------
+        state : `_PanelState`
+            The panel state.
+        assets : `list[str]`
+            The asset symbols.
+
+        Returns
+        -------
+        `slice` or `list[int]`
+            The column selector.
+        """
+        cols = [state.asset_index[asset] for asset in assets]
+        if len(cols) > 0 and cols == list(range(cols[0], cols[0] + len(cols))):
+            return slice(cols[0], cols[0] + len(cols))
+        return cols
+
+    def get_range(self, field, start_dt, end_dt, assets=None):
+        """
+        Obtain the values of a field for many assets between two
+        timestamps inclusive, as a timestamp-indexed DataFrame with
+        asset symbols as columns.
+
+        The DataFrame always holds a writeable copy of the values, such
+        that it may be modified without affecting the panel, whatever the
+        order of the requested assets.
+
+        Parameters
+        ----------
+        field : `str`
+            The field name, e.g. 'Close'.
+        start_dt : `pd.Timestamp` or `None`
+            The starting timestamp of the range, or None to begin
+            at the start of the panel.
+        end_dt : `pd.Timestamp` or `None`
+            The ending timestamp of the range, or None to finish
+            at the end of the panel.
+        assets : `list[str]`, optional
+            The asset symbols. Defaults to all panel assets.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The field values for the range.
+        """
+        state = self._state
+        if assets is None:
+            assets = state.assets
+        start = 0
+        if start_dt is not None:
+            start = int(np.searchsorted(
+                state.timestamps, self._timestamp_value(start_dt), side="left"
+            ))
+        end = len(state.timestamps)
+        if end_dt is not None:
+            end = int(np.searchsorted(
+                state.timestamps, self._timestamp_value(end_dt), side="right"
+            ))
+        end = max(start, end)
+        cols = self._column_selector(state, assets)
+        values = state.fields[field][start:end, cols]
+        if isinstance(cols, slice):
+            # Slicing produces a view of the panel, so copy it
+            values = values.copy()
+        return pd.DataFrame(
+            values,
+            index=self._state_index(state)[start:end],
+            columns=list(assets),
+            copy=False
+        )
+
+    def to_frame(self, field):
+        """
+        Return a single panel field as a timestamp-indexed DataFrame
+        with asset symbols as columns.
+
+        Parameters
+        ----------
+        field : `str`
+            The field name, e.g. 'Close'.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The field DataFrame.
+        """
+        state = self._state
+        return pd.DataFrame(
+            state.fields[field], index=self._state_index(state),
+            columns=list(state.assets)
+        )
+
+    @property
+    def nbytes(self):
+        """
+        The total memory occupied by the panel arrays in bytes.
+        """
+        state = self._state
+        return state.timestamps.nbytes + sum(
+            values.nbytes for values in state.fields.values()
+        )
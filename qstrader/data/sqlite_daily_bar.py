@@ -0,0 +1,405 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from qstrader import settings
+from qstrader.data.adjustment import ADJ_FACTOR_COLUMN
+from qstrader.data.daily_bar_csv import (
+    BAR_TIME_OFFSETS,
+    convert_bar_frame_into_bid_ask_df,
+    CSVDailyBarDataSource,
+)
+
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close"]
+
+CREATE_BARS_TABLE = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    date INTEGER NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    adj_close REAL,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID
+"""
+
+# Selects the bars of an asset prior to the end of a window, beginning
+# with the latest bar closing at or before the start of the window such
+# that 'pad' lookups at the start of the window are available
+SELECT_WINDOW_BARS = """
+SELECT date, open, high, low, close, adj_close FROM bars
+WHERE symbol = ? AND date < ? AND date >= COALESCE(
+    (SELECT MAX(date) FROM bars WHERE symbol = ? AND date <= ?), ?
+)
+ORDER BY date
+"""
+
+
+class SQLiteDailyBarDataSource(object):
+    """
+    Provides daily bar and bid/ask prices from a local SQLite database
+    of daily bars, indexed on (symbol, date), rather than from a
+    directory of CSV files. Only the bars required by a backtest
+    are ever read from the database.
+
+    Point lookups are served from a per-asset in-memory 'hot window' of
+    bars, converted into bid/ask prices in the same manner as the
+    CSVDailyBarDataSource. When a lookup falls outside of the window of
+    its asset, the window is reloaded from the lookup time onwards.
+    Historical closing price ranges are obtained with indexed range
+    queries.
+
+    The database is opened read-only, such that many backtests may
+    share a single file. It is created from the existing CSV directory
+    layout with 'load_csv_dir'.
+
+    Parameters
+    ----------
+    db_path : `str`
+        The path to the SQLite database file.
+    asset_type : `str`
+        The asset type that the price/volume data is for.
+    adjust_prices : `Boolean`, optional
+        Whether to utilise corporate-action adjusted prices for both
+        the open and closing prices. Defaults to True.
+    window : `pd.DateOffset`, optional
+        The period of bars loaded into each asset's hot window.
+        Defaults to one year.
+    """
+
+    def __init__(
+        self,
+        db_path,
+        asset_type,
+        adjust_prices=True,
+        window=pd.DateOffset(years=1)
+    ):
+        self.db_path = db_path
+        self.asset_type = asset_type
+        self.adjust_prices = adjust_prices
+        self.window = window
+        self.connection = None
+        self.asset_windows = {}
+        self.asset_coverage = {}
+        self.symbols = self._obtain_symbols()
+
+    def __getstate__(self):
+        """
+        Exclude the database connection and hot windows,
+        e.g. when sending the instance to worker processes.
+        """
+        state = self.__dict__.copy()
+        state["connection"] = None
+        state["asset_windows"] = {}
+        return state
+
+    def _connect(self):
+        """
+        Obtain the read-only database connection, opening it if necessary.
+
+        Returns
+        -------
+        `sqlite3.Connection`
+            The database connection.
+        """
+        if self.connection is None:
+            self.connection = sqlite3.connect(
+                "file:%s?mode=ro" % self.db_path, uri=True
+            )
+        return self.connection
+
+    def _obtain_symbols(self):
+        """
+        Obtain the set of asset symbols stored in the database.
+
+        Returns
+        -------
+        `set[str]`
+            The asset symbols.
+        """
+        return {
+            row[0] for row in
+            self._connect().execute("SELECT DISTINCT symbol FROM bars")
+        }
+
+    @classmethod
+    def load_csv_dir(
+        cls,
+        db_path,
+        csv_dir,
+        asset_type,
+        csv_symbols=None,
+        adjust_prices=True,
+        window=pd.DateOffset(years=1)
+    ):
+        """
+        Bulk load a directory of daily bar CSV files, in the layout read
+        by the CSVDailyBarDataSource, into the database (creating it if
+        necessary). Existing bars of the same symbol and date are replaced.
+
+        Parameters
+        ----------
+        db_path : `str`
+            The path to the SQLite database file.
+        csv_dir : `str`
+            The full path to the directory where the CSVs are located.
+        asset_type : `str`
+            The asset type that the price/volume data is for.
+        csv_symbols : `list`, optional
+            An optional list of CSV symbols to restrict the load to.
+        adjust_prices : `Boolean`, optional
+            Whether the returned data source utilises adjusted prices.
+        window : `pd.DateOffset`, optional
+            The hot window period of the returned data source.
+
+        Returns
+        -------
+        `SQLiteDailyBarDataSource`
+            The data source reading from the database.
+        """
+        csv_ds = CSVDailyBarDataSource(
+            csv_dir, asset_type, csv_symbols=csv_symbols, lazy=True
+        )
+        connection = sqlite3.connect(db_path)
+        try:
+            with connection:
+                connection.execute(CREATE_BARS_TABLE)
+                for asset, csv_file in csv_ds.asset_csv_files.items():
+                    bar_df = csv_ds._load_csv_into_df(csv_file)
+                    if ADJ_FACTOR_COLUMN in bar_df.columns:
+                        bar_df = bar_df.assign(
+                            **{"Adj Close": bar_df["Close"] * bar_df[ADJ_FACTOR_COLUMN]}
+                        )
+                    dates = bar_df.index.as_unit("ns").asi8.tolist()
+                    values = bar_df[BAR_COLUMNS].to_numpy(dtype=np.float64).tolist()
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (asset, date,) + tuple(row)
+                            for date, row in zip(dates, values)
+                        ]
+                    )
+                    if settings.PRINT_EVENTS:
+                        print("Loaded CSV file for symbol '%s' into SQLite..." % asset)
+        finally:
+            connection.close()
+        return cls(db_path, asset_type, adjust_prices=adjust_prices, window=window)
+
+    @staticmethod
+    def _rows_to_bar_df(rows):
+        """
+        Convert bar rows of the database into a daily bar DataFrame.
+
+        Parameters
+        ----------
+        rows : `list[tuple]`
+            The (date, open, high, low, close, adj_close) rows.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The UTC timestamp indexed daily bar DataFrame.
+        """
+        data = np.array(
+            [row[1:] for row in rows], dtype=np.float64
+        ).reshape(len(rows), len(BAR_COLUMNS))
+        index = pd.DatetimeIndex(
+            np.array([row[0] for row in rows], dtype=np.int64).view("datetime64[ns]"),
+            name="Date"
+        ).tz_localize(pytz.UTC)
+        return pd.DataFrame(data, index=index, columns=BAR_COLUMNS)
+
+    def _load_window(self, dt, asset):
+        """
+        Load the hot window of an asset beginning at the provided time.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The start of the window.
+        asset : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `tuple`
+            The window start and end int64 nanosecond timestamps,
+            along with its bar and bid/ask DataFrames.
+        """
+        start = dt.value
+        end = (dt + self.window).value
+        rows = self._connect().execute(
+            SELECT_WINDOW_BARS,
+            (asset, end, asset, start - BAR_TIME_OFFSETS[-1].value, start)
+        ).fetchall()
+        bar_df = self._rows_to_bar_df(rows)
+        bid_ask_df = convert_bar_frame_into_bid_ask_df(bar_df, self.adjust_prices)
+        window = (start, end, bar_df, bid_ask_df)
+        self.asset_windows[asset] = window
+        return window
+
+    def _get_window_value(self, dt, asset, frame_type, column):
+        """
+        Obtain the latest value of a column at or before the provided
+        timestamp from the hot window of an asset, reloading the
+        window if the timestamp lies outside of it.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to obtain the value for.
+        asset : `str`
+            The asset symbol.
+        frame_type : `str`
+            Either 'bar' or 'bid_ask', determining the DataFrame used.
+        column : `str`
+            The DataFrame column, e.g. 'Bid'.
+
+        Returns
+        -------
+        `float`
+            The value, or NaN if prior to the asset's first bar.
+        """
+        if asset not in self.symbols:
+            raise KeyError(asset)
+        window = self.asset_windows.get(asset)
+        if window is None or not (window[0] <= dt.value < window[1]):
+            window = self._load_window(dt, asset)
+        df = window[2] if frame_type == "bar" else window[3]
+        pos = int(np.searchsorted(df.index.asi8, dt.value, side="right")) - 1
+        if pos < 0:
+            return np.nan
+        return df[column].iat[pos]
+
+    def get_asset_coverage(self, asset):
+        """
+        Obtain the range of timestamps for which the data source
+        provides prices for an asset, from the date of the first
+        daily bar through to the close of the final daily bar.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `tuple(pd.Timestamp, pd.Timestamp)` or `None`
+            The first and last timestamps covered, or None if the
+            data source does not provide the asset.
+        """
+        if asset not in self.symbols:
+            return None
+        if asset not in self.asset_coverage:
+            first_ts, last_ts = self._connect().execute(
+                "SELECT MIN(date), MAX(date) FROM bars WHERE symbol = ?", (asset,)
+            ).fetchone()
+            self.asset_coverage[asset] = (
+                pd.Timestamp(first_ts, tz=pytz.UTC),
+                pd.Timestamp(last_ts, tz=pytz.UTC) + BAR_TIME_OFFSETS[-1]
+            )
+        return self.asset_coverage[asset]
+
+    def get_bid(self, dt, asset):
+        return self._get_window_value(dt, asset, "bid_ask", "Bid")
+
+    def get_ask(self, dt, asset):
+        return self._get_window_value(dt, asset, "bid_ask", "Ask")
+
+    def get_open(self, dt, asset):
+        return self._get_window_value(dt, asset, "bar", "Open")
+
+    def get_high(self, dt, asset):
+        return self._get_window_value(dt, asset, "bar", "High")
+
+    def get_low(self, dt, asset):
+        return self._get_window_value(dt, asset, "bar", "Low")
+
+    def _get_assets_values(self, dt, assets, lookup):
+        """
+        Obtain the latest values of a pricing field for many assets
+        at the provided timestamp, aligned to the provided asset order.
+        Assets unknown to the data source are set to NaN.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to obtain the values for.
+        assets : `list[str]`
+            The asset symbols to obtain the values for.
+        lookup : `callable`
+            The single asset lookup method for the field.
+
+        Returns
+        -------
+        `np.ndarray`
+            The values aligned to the provided asset order.
+        """
+        values = np.full(len(assets), np.nan)
+        for i, asset in enumerate(assets):
+            if asset in self.symbols:
+                values[i] = lookup(dt, asset)
+        return values
+
+    def get_assets_bid(self, dt, assets):
+        return self._get_assets_values(dt, assets, self.get_bid)
+
+    def get_assets_ask(self, dt, assets):
+        return self._get_assets_values(dt, assets, self.get_ask)
+
+    def get_assets_open(self, dt, assets):
+        return self._get_assets_values(dt, assets, self.get_open)
+
+    def get_assets_high(self, dt, assets):
+        return self._get_assets_values(dt, assets, self.get_high)
+
+    def get_assets_low(self, dt, assets):
+        return self._get_assets_values(dt, assets, self.get_low)
+
+    def get_assets_historical_closes(self, start_dt, end_dt, assets):
+        """
+        Obtain a multi-asset historical range of closing prices as a DataFrame,
+        indexed by timestamp with asset symbols as columns.
+
+        Parameters
+        ----------
+        start_dt : `pd.Timestamp`
+            The starting datetime of the range to obtain.
+        end_dt : `pd.Timestamp`
+            The ending datetime of the range to obtain.
+        assets : `list[str]`
+            The list of asset symbols to obtain closing prices for.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The multi-asset closing prices DataFrame.
+        """
+        known_assets = [asset for asset in assets if asset in self.symbols]
+        start = np.iinfo(np.int64).min if start_dt is None else start_dt.value
+        end = np.iinfo(np.int64).max if end_dt is None else end_dt.value
+        rows = self._connect().execute(
+            "SELECT symbol, date, close FROM bars "
+            "WHERE symbol IN (%s) AND date >= ? AND date <= ? AND close IS NOT NULL"
+            % ", ".join("?" * len(known_assets)),
+            list(dict.fromkeys(known_assets)) + [int(start), int(end)]
+        ).fetchall()
+
+        dates = np.array([row[1] for row in rows], dtype=np.int64)
+        timestamps = np.unique(dates)
+        asset_cols = {}
+        for j, asset in enumerate(known_assets):
+            asset_cols.setdefault(asset, []).append(j)
+        closes = np.full((len(timestamps), len(known_assets)), np.nan)
+        rows_pos = np.searchsorted(timestamps, dates)
+        for (symbol, _, close), row in zip(rows, rows_pos):
+            closes[row, asset_cols[symbol]] = close
+
+        index = pd.DatetimeIndex(
+            timestamps.view("datetime64[ns]"), name="Date"
+        ).tz_localize(pytz.UTC)
+        return pd.DataFrame(closes, index=index, columns=known_assets)
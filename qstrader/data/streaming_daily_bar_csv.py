@@ -0,0 +1,451 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from qstrader import settings
+from qstrader.data.daily_bar_csv import (
+    BAR_TIME_OFFSETS,
+    compute_liquidity_frame,
+    CSVDailyBarDataSource,
+    DEFAULT_ADV_WINDOW,
+)
+
+
+class StreamingCSVDailyBarDataSource(CSVDailyBarDataSource):
+    """
+    A CSVDailyBarDataSource that streams the CSV files forward through
+    time, rather than holding the full history of every asset in memory.
+
+    The bars of all assets are read in consecutive time windows (chunks),
+    e.g. a year at a time, as simulation time reaches the end of the
+    currently loaded chunk. Bars older than the lookback period are then
+    discarded, so that only a sliding window of history, spanning at most
+    the lookback plus one chunk, is resident. The lookback should therefore
+    be at least as long as the longest historical range requested, e.g.
+    by signals or risk models.
+
+    Each CSV file is read from the byte offset at which the previous
+    chunk finished, with skipped rows never parsed. The CSV files must
+    therefore be sorted by date in ascending order, with ISO 8601 dates
+    (e.g. '2020-01-02') in the first column, as stored by 'ingest.py'.
+
+    Queries must not move backwards in time beyond the retained window.
+
+    Parameters
+    ----------
+    csv_dir : `str`
+        The full path to the directory where the CSV is located.
+    asset_type : `str`
+        The asset type that the price/volume data is for.
+    adjust_prices : `Boolean`, optional
+        Whether to utilise corporate-action adjusted prices for both
+        the open and closing prices. Defaults to True.
+    csv_symbols : `list`, optional
+        An optional list of CSV symbols to restrict the data source to.
+    chunk_size : `pd.DateOffset`, optional
+        The length of each time window read from the CSV files.
+        Defaults to one year.
+    lookback : `pd.Timedelta`, optional
+        The period of history retained prior to the latest query.
+        Defaults to 365 days.
+    price_cache_size : `int` or `None`, optional
+        The maximum number of memoised point price lookups held by this
+        instance. Defaults to 1024 * 1024.
+    price_cache_policy : `str`, optional
+        The eviction policy of the price cache once full, either 'lru'
+        or 'fifo'. Defaults to 'lru'.
+    adv_window : `int`, optional
+        The number of daily bars averaged by the rolling average daily
+        (dollar) volume lookups, which should span no more than the
+        lookback period. Defaults to 20.
+    """
+
+    def __init__(
+        self,
+        csv_dir,
+        asset_type,
+        adjust_prices=True,
+        csv_symbols=None,
+        chunk_size=pd.DateOffset(years=1),
+        lookback=pd.Timedelta(days=365),
+        price_cache_size=1024 * 1024,
+        price_cache_policy="lru",
+        adv_window=DEFAULT_ADV_WINDOW
+    ):
+        self.chunk_size = chunk_size
+        self.lookback = lookback
+        self.chunk_end = None
+        self.window_start = None
+        super().__init__(
+            csv_dir,
+            asset_type,
+            adjust_prices=adjust_prices,
+            csv_symbols=csv_symbols,
+            lazy=True,
+            price_cache_size=price_cache_size,
+            price_cache_policy=price_cache_policy,
+            adv_window=adv_window
+        )
+        self.csv_headers = {}
+        self.csv_offsets = {}
+        self.asset_liquidity_frames = {}
+        for asset, csv_file in self.asset_csv_files.items():
+            with open(os.path.join(self.csv_dir, csv_file), "rb") as csv_fp:
+                self.csv_headers[asset] = csv_fp.readline().decode("utf-8")
+                self.csv_offsets[asset] = csv_fp.tell()
+            self.asset_bar_frames[asset] = self._parse_csv_lines(asset, [])
+            self.asset_bid_ask_frames[asset] = (
+                self._convert_bar_frame_into_bid_ask_df(
+                    self.asset_bar_frames[asset]
+                )
+            )
+            self.asset_liquidity_frames[asset] = compute_liquidity_frame(
+                self.asset_bar_frames[asset], self.adjust_prices, self.adv_window
+            )
+
+    def _ensure_assets_loaded(self, assets):
+        """
+        Assets are loaded by time rather than on demand, so that
+        there is nothing to do.
+        """
+        pass
+
+    def _parse_csv_lines(self, asset, lines):
+        """
+        Parse CSV lines of an asset into a prepared daily bar DataFrame.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+        lines : `list[str]`
+            The CSV lines, excluding the header.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The daily bar DataFrame.
+        """
+        csv_df = pd.read_csv(
+            io.StringIO(self.csv_headers[asset] + "".join(lines)),
+            index_col="Date",
+            parse_dates=True
+        )
+        if len(csv_df) == 0:
+            csv_df = csv_df.astype(np.float64)
+            csv_df.index = pd.DatetimeIndex([], tz=pytz.UTC, name="Date")
+        return self._prepare_bar_df(csv_df)
+
+    def _read_csv_chunk(self, asset, start_date, end_date):
+        """
+        Read the CSV lines of an asset dated prior to the end date,
+        continuing from the end of the previous chunk. Lines dated
+        prior to the start date are skipped without being parsed.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+        start_date : `str`
+            The ISO 8601 date from which to retain lines, or None.
+        end_date : `str`
+            The ISO 8601 date at which the chunk ends, exclusive.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The daily bar DataFrame of the chunk.
+        """
+        csv_path = os.path.join(self.csv_dir, self.asset_csv_files[asset])
+        lines = []
+        with open(csv_path, "rb") as csv_fp:
+            csv_fp.seek(self.csv_offsets[asset])
+            while True:
+                offset = csv_fp.tell()
+                line = csv_fp.readline().decode("utf-8")
+                if line.strip() == "":
+                    if line == "":
+                        break
+                    continue
+                date = line[:10]
+                if date >= end_date:
+                    csv_fp.seek(offset)
+                    break
+                if start_date is None or date >= start_date:
+                    lines.append(line)
+            self.csv_offsets[asset] = csv_fp.tell()
+        return self._parse_csv_lines(asset, lines)
+
+    def _advance(self, dt):
+        """
+        Read further chunks until the provided timestamp is covered
+        and discard history older than the lookback period.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The query timestamp.
+        """
+        if self.window_start is not None and dt < self.window_start:
+            raise ValueError(
+                "Unable to query streaming data source at '%s' as data "
+                "prior to '%s' has been discarded." % (dt, self.window_start)
+            )
+        if self.chunk_end is not None and dt < self.chunk_end:
+            return
+
+        start_date = None
+        if self.chunk_end is None:
+            # Skip straight to the start of the lookback window
+            self.window_start = (dt - self.lookback).normalize()
+            self.chunk_end = self.window_start
+            start_date = self.window_start.strftime("%Y-%m-%d")
+
+        while dt >= self.chunk_end:
+            chunk_start = self.chunk_end
+            self.chunk_end = chunk_start + self.chunk_size
+            end_date = self.chunk_end.strftime("%Y-%m-%d")
+            if settings.PRINT_EVENTS:
+                print(
+                    "Streaming CSV data from %s to %s..." % (
+                        chunk_start.strftime("%Y-%m-%d"), end_date
+                    )
+                )
+            for asset in self.asset_csv_files.keys():
+                bar_df = self._read_csv_chunk(asset, start_date, end_date)
+                if len(bar_df) > 0:
+                    self._append_bars(asset, bar_df)
+            start_date = None
+
+        self._discard_history(dt - self.lookback)
+
+    def _append_bars(self, asset, bar_df):
+        """
+        Append newly read bars, and their bid/ask prices, to the
+        retained window of an asset. The volumes and rolling average
+        volumes are recomputed over the retained window.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+        bar_df : `pd.DataFrame`
+            The newly read daily bar DataFrame.
+        """
+        bid_ask_df = self._convert_bar_frame_into_bid_ask_df(bar_df)
+        if len(self.asset_bar_frames[asset]) > 0:
+            # Forward-fill missing prices across the chunk boundary
+            bid_ask_df = pd.concat(
+                [self.asset_bid_ask_frames[asset], bid_ask_df]
+            ).ffill()
+            bar_df = pd.concat([self.asset_bar_frames[asset], bar_df])
+        self.asset_bid_ask_frames[asset] = bid_ask_df
+        self.asset_bar_frames[asset] = bar_df
+        self.asset_liquidity_frames[asset] = compute_liquidity_frame(
+            bar_df, self.adjust_prices, self.adv_window
+        )
+
+    def _discard_history(self, cutoff_dt):
+        """
+        Discard the bars of each asset prior to the cutoff, retaining
+        the latest bar at or before it such that prices at the start of
+        the window remain available.
+
+        Parameters
+        ----------
+        cutoff_dt : `pd.Timestamp`
+            The earliest timestamp to retain.
+        """
+        if cutoff_dt <= self.window_start:
+            return
+        self.window_start = cutoff_dt
+        for frames in (
+            self.asset_bar_frames,
+            self.asset_bid_ask_frames,
+            self.asset_liquidity_frames
+        ):
+            for asset, df in frames.items():
+                pos = int(np.searchsorted(df.index, cutoff_dt, side="right")) - 1
+                if pos > 0:
+                    frames[asset] = df.iloc[pos:]
+
+    def _get_frame_value(self, frames, dt, asset, column):
+        """
+        Obtain the latest value of a column at or before the provided
+        timestamp from the retained window of an asset.
+
+        Parameters
+        ----------
+        frames : `dict{str: pd.DataFrame}`
+            The asset symbol keyed bar or bid/ask DataFrames.
+        dt : `pd.Timestamp`
+            The timestamp to obtain the value for.
+        asset : `str`
+            The asset symbol.
+        column : `str`
+            The DataFrame column, e.g. 'Bid'.
+
+        Returns
+        -------
+        `float`
+            The value, or NaN if prior to the asset's first row.
+        """
+        self._advance(dt)
+        df = frames[asset]
+        pos = int(np.searchsorted(df.index, dt, side="right")) - 1
+        if pos < 0:
+            return np.nan
+        return df[column].iat[pos]
+
+    def get_asset_coverage(self, asset):
+        """
+        Obtain the range of timestamps for which the data source
+        provides prices for an asset, determined from the first and
+        final lines of its CSV file.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `tuple(pd.Timestamp, pd.Timestamp)` or `None`
+            The first and last timestamps covered, or None if the
+            data source does not provide the asset.
+        """
+        if asset not in self.asset_csv_files:
+            return None
+        csv_path = os.path.join(self.csv_dir, self.asset_csv_files[asset])
+        with open(csv_path, "rb") as csv_fp:
+            csv_fp.readline()
+            first_line = csv_fp.readline().decode("utf-8").strip()
+            if first_line == "":
+                return None
+            csv_fp.seek(0, os.SEEK_END)
+            pos = csv_fp.tell()
+            block = b""
+            while pos > 0 and block.strip().count(b"\n") < 1:
+                step = min(4096, pos)
+                pos -= step
+                csv_fp.seek(pos)
+                block = csv_fp.read(step) + block
+        last_line = block.strip().split(b"\n")[-1].decode("utf-8").strip()
+        first_date, last_date = (
+            pd.Timestamp(line.split(",")[0]) for line in (first_line, last_line)
+        )
+        return (
+            first_date.tz_convert(pytz.UTC),
+            last_date.tz_convert(pytz.UTC) + BAR_TIME_OFFSETS[-1]
+        )
+
+    def get_bid(self, dt, asset):
+        return self._get_frame_value(self.asset_bid_ask_frames, dt, asset, "Bid")
+
+    def get_ask(self, dt, asset):
+        return self._get_frame_value(self.asset_bid_ask_frames, dt, asset, "Ask")
+
+    def get_open(self, dt, asset):
+        return self._get_frame_value(self.asset_bar_frames, dt, asset, "Open")
+
+    def get_high(self, dt, asset):
+        return self._get_frame_value(self.asset_bar_frames, dt, asset, "High")
+
+    def get_low(self, dt, asset):
+        return self._get_frame_value(self.asset_bar_frames, dt, asset, "Low")
+
+    def get_assets_bid_ask_history(self, dts, assets):
+        """
+        Obtain the bid and ask prices of many assets at many timestamps,
+        streaming the CSV files forward as the timestamps require.
+
+        The timestamps are looked up a chunk at a time, with each chunk
+        read (and older history discarded) prior to the lookups within
+        it, such that the retained window always covers them.
+
+        Parameters
+        ----------
+        dts : `pd.DatetimeIndex`
+            The sorted timestamps to obtain the prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the prices for.
+
+        Returns
+        -------
+        `tuple(np.ndarray, np.ndarray)`
+            The (num_timestamps, num_assets) bid and ask prices aligned
+            to the provided timestamp and asset order.
+        """
+        dts = pd.DatetimeIndex(dts)
+        bids = np.full((len(dts), len(assets)), np.nan)
+        asks = np.full((len(dts), len(assets)), np.nan)
+        start = 0
+        while start < len(dts):
+            self._advance(dts[start])
+            end = max(
+                int(np.searchsorted(dts, self.chunk_end, side="left")), start + 1
+            )
+            bids[start:end], asks[start:end] = super().get_assets_bid_ask_history(
+                dts[start:end], assets
+            )
+            start = end
+        return bids, asks
+
+    def _obtain_liquidity_panel(self):
+        """
+        The liquidity lookups are served from the retained window
+        of each asset, rather than from a panel.
+        """
+        return None
+
+    def get_volume(self, dt, asset):
+        return self._get_frame_value(self.asset_liquidity_frames, dt, asset, "Volume")
+
+    def get_adv(self, dt, asset):
+        return self._get_frame_value(self.asset_liquidity_frames, dt, asset, "ADV")
+
+    def get_dollar_adv(self, dt, asset):
+        return self._get_frame_value(
+            self.asset_liquidity_frames, dt, asset, "Dollar ADV"
+        )
+
+    def get_assets_historical_closes(self, start_dt, end_dt, assets):
+        """
+        Obtain a multi-asset historical range of closing prices as a DataFrame,
+        indexed by timestamp with asset symbols as columns. The range must
+        lie within the retained window.
+
+        Parameters
+        ----------
+        start_dt : `pd.Timestamp`
+            The starting datetime of the range to obtain.
+        end_dt : `pd.Timestamp`
+            The ending datetime of the range to obtain.
+        assets : `list[str]`
+            The list of asset symbols to obtain closing prices for.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The multi-asset closing prices DataFrame.
+        """
+        self._advance(end_dt)
+        if start_dt is None or start_dt < self.window_start:
+            raise ValueError(
+                "Unable to obtain closing prices from '%s' as data prior to "
+                "'%s' has been discarded. Increase the lookback of the "
+                "streaming data source." % (start_dt, self.window_start)
+            )
+        close_series = []
+        for asset in assets:
+            if asset in self.asset_bar_frames.keys():
+                asset_close_prices = self.asset_bar_frames[asset][["Close"]]
+                asset_close_prices.columns = [asset]
+                close_series.append(asset_close_prices)
+
+        prices_df = pd.concat(close_series, axis=1).dropna(how="all")
+        prices_df = prices_df.loc[start_dt:end_dt]
+        return prices_df
@@ -0,0 +1,209 @@
+import numpy as np
+import pandas as pd
+
+VALIDATION_CHECKS = [
+    "missing_price", "non_positive_price", "high_below_low", "duplicate_date"
+]
+
+VALIDATION_POLICIES = ["drop", "ffill", "reject"]
+
+OHLC_COLUMNS = ["Open", "High", "Low", "Close"]
+
+
+def validate_bar_frames(asset_bar_frames):
+    """
+    Check the daily bars of many assets for missing (NaN) or non-positive
+    prices, highs below lows and duplicated dates.
+
+    The bars of all assets are stacked into a single array so that each
+    check is carried out once, vectorised across every asset, rather
+    than asset by asset. Besides the OHLC prices, any further columns
+    of the bars besides the volume, e.g. adjusted closes or adjustment
+    factors, are also required to be present and positive.
+
+    Parameters
+    ----------
+    asset_bar_frames : `dict{str: pd.DataFrame}`
+        The asset-symbol keyed, date-sorted, daily bar DataFrames.
+
+    Returns
+    -------
+    `tuple(dict, dict)`
+        The asset-symbol keyed issue counts, i.e. the number of rows and
+        of rows failing each check, along with the asset-symbol keyed
+        boolean masks of invalid and of duplicated rows.
+    """
+    assets = list(asset_bar_frames.keys())
+    if len(assets) == 0:
+        return {}, {}
+
+    lengths = np.array([len(asset_bar_frames[asset]) for asset in assets])
+    codes = np.repeat(np.arange(len(assets)), lengths)
+    ohlc = np.concatenate(
+        [np.empty((0, len(OHLC_COLUMNS)))] + [
+            asset_bar_frames[asset][OHLC_COLUMNS].to_numpy(dtype=np.float64)
+            for asset in assets
+        ]
+    )
+    extra_frames = [
+        asset_bar_frames[asset].drop(columns=OHLC_COLUMNS + ["Volume"], errors="ignore")
+        for asset in assets
+    ]
+    extra = np.concatenate(
+        [np.empty((0, extra_frames[0].shape[1]))] +
+        [extra_df.to_numpy(dtype=np.float64) for extra_df in extra_frames]
+    )
+    prices = np.hstack([ohlc, extra])
+    timestamps = np.concatenate(
+        [np.empty(0, dtype=np.int64)] + [
+            asset_bar_frames[asset].index.as_unit("ns").asi8 for asset in assets
+        ]
+    )
+
+    checks = {}
+    checks["missing_price"] = np.isnan(prices).any(axis=1)
+    with np.errstate(invalid="ignore"):
+        checks["non_positive_price"] = (prices <= 0.0).any(axis=1)
+        checks["high_below_low"] = ohlc[:, 1] < ohlc[:, 2]
+    # Mark all but the final bar of each run of duplicated dates
+    duplicated = np.zeros(len(codes), dtype=bool)
+    duplicated[:-1] = (codes[1:] == codes[:-1]) & (timestamps[1:] == timestamps[:-1])
+    checks["duplicate_date"] = duplicated
+
+    counts = {
+        check: np.bincount(codes[mask], minlength=len(assets))
+        for check, mask in checks.items()
+    }
+    invalid = (
+        checks["missing_price"] | checks["non_positive_price"] |
+        checks["high_below_low"]
+    )
+
+    asset_issues = {}
+    asset_masks = {}
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    for i, asset in enumerate(assets):
+        asset_issues[asset] = {"rows": int(lengths[i])}
+        asset_issues[asset].update(
+            {check: int(counts[check][i]) for check in VALIDATION_CHECKS}
+        )
+        start, end = bounds[i], bounds[i + 1]
+        asset_masks[asset] = (invalid[start:end], duplicated[start:end])
+    return asset_issues, asset_masks
+
+
+def repair_bar_frame(bar_df, invalid, duplicated, policy):
+    """
+    Repair the daily bars of a single asset by removing duplicated dates,
+    retaining the final bar of each, and either dropping the invalid bars
+    ('drop') or replacing them with the preceding valid bar ('ffill').
+    Invalid bars without a preceding valid bar are dropped. Valid bars
+    are never altered, e.g. a missing volume is not forward filled.
+
+    Parameters
+    ----------
+    bar_df : `pd.DataFrame`
+        The daily bar DataFrame.
+    invalid : `np.ndarray`
+        The boolean mask of invalid bars.
+    duplicated : `np.ndarray`
+        The boolean mask of superseded duplicate bars.
+    policy : `str`
+        The repair policy, either 'drop' or 'ffill'.
+
+    Returns
+    -------
+    `pd.DataFrame`
+        The repaired daily bar DataFrame.
+    """
+    if policy == "drop":
+        return bar_df[~(invalid | duplicated)]
+    if policy == "ffill":
+        deduplicated_df = bar_df[~duplicated]
+        valid = ~invalid[~duplicated]
+        # The position of the latest valid bar at or before each bar,
+        # copied in full such that valid bars are never altered
+        source = np.maximum.accumulate(
+            np.where(valid, np.arange(len(deduplicated_df)), -1)
+        )
+        repaired_df = deduplicated_df.iloc[source[source >= 0]]
+        repaired_df.index = deduplicated_df.index[source >= 0]
+        return repaired_df
+    raise ValueError(
+        "Unable to repair bars with validation policy '%s'. "
+        "Must be one of %s." % (policy, VALIDATION_POLICIES[:2])
+    )
+
+
+class ValidationReport(object):
+    """
+    The structured result of a data-quality validation pass, holding
+    the number of rows and of rows failing each check per asset.
+
+    Parameters
+    ----------
+    asset_issues : `dict{str: dict{str: int}}`, optional
+        The asset-symbol keyed issue counts.
+    """
+
+    def __init__(self, asset_issues=None):
+        self.asset_issues = dict(asset_issues) if asset_issues is not None else {}
+
+    def update(self, other):
+        """
+        Merge the results of another report, e.g. for assets
+        loaded subsequently, into this report.
+
+        Parameters
+        ----------
+        other : `ValidationReport`
+            The report to merge.
+        """
+        self.asset_issues.update(other.asset_issues)
+
+    @property
+    def invalid_assets(self):
+        """
+        The assets with at least one row failing a check.
+        """
+        return [
+            asset for asset, issues in self.asset_issues.items()
+            if any(issues[check] > 0 for check in VALIDATION_CHECKS)
+        ]
+
+    @property
+    def is_valid(self):
+        return len(self.invalid_assets) == 0
+
+    def to_frame(self):
+        """
+        Obtain the issue counts as an asset-indexed DataFrame.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The issue counts, with a column per check.
+        """
+        return pd.DataFrame.from_dict(
+            self.asset_issues, orient="index",
+            columns=["rows"] + VALIDATION_CHECKS
+        ).astype(np.int64)
+
+    def __str__(self):
+        lines = []
+        for asset in self.invalid_assets:
+            issues = self.asset_issues[asset]
+            lines.append(
+                "  %s: %s (of %d rows)" % (
+                    asset,
+                    ", ".join(
+                        "%d %s" % (issues[check], check)
+                        for check in VALIDATION_CHECKS if issues[check] > 0
+                    ),
+                    issues["rows"]
+                )
+            )
+        return "%d of %d assets failed validation%s" % (
+            len(lines), len(self.asset_issues),
+            ":\n" + "\n".join(lines) if len(lines) > 0 else ""
+        )
@@ -16,10 +16,14 @@ class SimulatedExchange(Exchange):
     ----------
     start_dt : `pd.Timestamp`
         The starting time of the simulated exchange.
+    calendar : `TradingCalendar`, optional
+        The trading calendar of the exchange, used to account for
+        holidays and early closes. Defaults to weekdays only.
     """
 
-    def __init__(self, start_dt):
+    def __init__(self, start_dt, calendar=None):
         self.start_dt = start_dt
+        self.calendar = calendar
 
         # TODO: Eliminate hardcoding of NYSE
         # TODO: Make these timezone-aware
@@ -35,7 +39,7 @@ class SimulatedExchange(Exchange):
         the provided time is between market hours on a weekday.
 
         There is no historical calendar handling or concept of
-        exchange holidays.
+        exchange holidays unless a trading calendar is provided.
 
         Parameters
         ----------
@@ -47,6 +51,9 @@ class SimulatedExchange(Exchange):
         `Boolean`
             Whether the exchange is open at this timestamp.
         """
+        if self.calendar is not None:
+            return self.calendar.is_open(dt)
+
         if dt.weekday() > 4:
             return False
 
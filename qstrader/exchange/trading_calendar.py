@@ -0,0 +1,385 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar,
+    GoodFriday,
+    Holiday,
+    nearest_workday,
+    sunday_to_monday,
+    USLaborDay,
+    USMartinLutherKingJr,
+    USMemorialDay,
+    USPresidentsDay,
+    USThanksgivingDay,
+)
+from pandas.tseries.offsets import BDay
+import pytz
+
+from qstrader.data.cursor import ForwardCursor
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """
+    The recurring full-day holidays of the New York Stock Exchange.
+    """
+
+    rules = [
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        Holiday(
+            "Martin Luther King Jr. Day", month=1, day=1,
+            offset=USMartinLutherKingJr.offset, start_date=datetime.datetime(1998, 1, 1)
+        ),
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday(
+            "Juneteenth", month=6, day=19, observance=nearest_workday,
+            start_date=datetime.datetime(2022, 1, 1)
+        ),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+# Unscheduled full-day closures of the New York Stock Exchange
+NYSE_ADHOC_HOLIDAYS = pd.to_datetime([
+    "2001-09-11", "2001-09-12", "2001-09-13", "2001-09-14",
+    "2004-06-11",
+    "2007-01-02",
+    "2012-10-29", "2012-10-30",
+    "2018-12-05",
+    "2025-01-09",
+])
+
+
+def nyse_early_close_dates(start_date, end_date):
+    """
+    Determine the candidate early close (13:00 local) dates of the
+    New York Stock Exchange, namely the day before Independence Day,
+    the day after Thanksgiving and Christmas Eve. Candidates falling
+    upon weekends or holidays are discarded by the calendar.
+
+    Parameters
+    ----------
+    start_date : `pd.Timestamp`
+        The first date of the range.
+    end_date : `pd.Timestamp`
+        The final date of the range.
+
+    Returns
+    -------
+    `pd.DatetimeIndex`
+        The candidate early close dates.
+    """
+    years = range(start_date.year, end_date.year + 1)
+    thanksgivings = USThanksgivingDay.dates(
+        datetime.datetime(start_date.year, 1, 1),
+        datetime.datetime(end_date.year, 12, 31)
+    )
+    return pd.DatetimeIndex(
+        [pd.Timestamp(year, 7, 3) for year in years] +
+        [pd.Timestamp(year, 12, 24) for year in years] +
+        list(thanksgivings + pd.Timedelta(days=1))
+    ).sort_values()
+
+
+class TradingCalendar(object):
+    """
+    The trading sessions of an exchange between two dates, taking into
+    account weekends, holidays and early closes.
+
+    The sessions are precomputed once and stored as sorted int64
+    nanosecond UTC arrays of the session dates (at midnight) and of
+    their opening and closing times. Session queries are then binary
+    searches, while 'is_open' queries made with non-decreasing
+    timestamps, as during a simulation, are O(1) via a ForwardCursor.
+
+    As elsewhere in QSTrader the opening and closing times are fixed
+    UTC times, rather than being adjusted for daylight saving time.
+
+    Parameters
+    ----------
+    start_date : `pd.Timestamp`
+        The first date of the calendar.
+    end_date : `pd.Timestamp`
+        The final date of the calendar.
+    holiday_calendar : `AbstractHolidayCalendar`, optional
+        The recurring holiday rules. Defaults to the NYSE holidays.
+    adhoc_holidays : `list[pd.Timestamp]`, optional
+        Additional non-recurring closure dates. Defaults to the
+        unscheduled NYSE closures.
+    early_close_dates : `callable`, optional
+        A function of the start and end dates returning the candidate
+        early close dates. Defaults to the NYSE early closes.
+    open_time : `datetime.time`, optional
+        The UTC opening time of each session. Defaults to 14:30.
+    close_time : `datetime.time`, optional
+        The UTC closing time of each session. Defaults to 21:00.
+    early_close_time : `datetime.time`, optional
+        The UTC closing time of early close sessions. Defaults to 18:00.
+    """
+
+    def __init__(
+        self,
+        start_date,
+        end_date,
+        holiday_calendar=None,
+        adhoc_holidays=NYSE_ADHOC_HOLIDAYS,
+        early_close_dates=nyse_early_close_dates,
+        open_time=datetime.time(14, 30),
+        close_time=datetime.time(21, 0),
+        early_close_time=datetime.time(18, 0)
+    ):
+        self.start_date = self._to_naive_date(start_date)
+        self.end_date = self._to_naive_date(end_date)
+        if self.end_date < self.start_date:
+            raise ValueError(
+                "Ending date %s is earlier than starting date %s. Cannot "
+                "create TradingCalendar instance." % (end_date, start_date)
+            )
+        self.holiday_calendar = (
+            holiday_calendar if holiday_calendar is not None
+            else NYSEHolidayCalendar()
+        )
+        self.adhoc_holidays = pd.DatetimeIndex(adhoc_holidays)
+        self.early_close_dates = early_close_dates
+        self.open_time = open_time
+        self.close_time = close_time
+        self.early_close_time = early_close_time
+
+        self.sessions, self.opens, self.closes = self._generate_sessions()
+        self.open_cursor = ForwardCursor(self.opens)
+
+    @staticmethod
+    def _to_naive_date(dt):
+        """
+        Obtain the timezone-naive UTC calendar date of a timestamp.
+        """
+        dt = pd.Timestamp(dt)
+        if dt.tz is not None:
+            dt = dt.tz_convert(pytz.UTC).tz_localize(None)
+        return dt.normalize()
+
+    @staticmethod
+    def _time_offset(time):
+        return pd.Timedelta(hours=time.hour, minutes=time.minute, seconds=time.second)
+
+    def _generate_sessions(self):
+        """
+        Generate the session dates, along with their opening
+        and closing times, in a vectorised manner.
+
+        Returns
+        -------
+        `tuple(np.ndarray, np.ndarray, np.ndarray)`
+            The int64 nanosecond UTC session dates, opens and closes.
+        """
+        days = pd.date_range(self.start_date, self.end_date, freq=BDay())
+        holidays = self.holiday_calendar.holidays(self.start_date, self.end_date)
+        days = days[~days.isin(holidays.union(self.adhoc_holidays))]
+
+        early_closes = days.isin(
+            self.early_close_dates(self.start_date, self.end_date)
+        )
+        sessions = days.as_unit("ns").asi8
+        opens = sessions + self._time_offset(self.open_time).value
+        closes = sessions + np.where(
+            early_closes,
+            self._time_offset(self.early_close_time).value,
+            self._time_offset(self.close_time).value
+        )
+        return sessions, opens, closes
+
+    @staticmethod
+    def _timestamp_value(dt):
+        """
+        Convert a timestamp into int64 nanoseconds since the UTC epoch,
+        treating timezone-naive timestamps as UTC.
+        """
+        dt = pd.Timestamp(dt)
+        if dt.tz is not None:
+            dt = dt.tz_convert(pytz.UTC).tz_localize(None)
+        return dt.as_unit("ns").value
+
+    def _to_index(self, values):
+        return pd.DatetimeIndex(values.view("datetime64[ns]")).tz_localize(pytz.UTC)
+
+    def is_session(self, dt):
+        """
+        Check whether the UTC date of a timestamp is a trading session.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to check.
+
+        Returns
+        -------
+        `Boolean`
+            Whether the date is a trading session.
+        """
+        day = self._timestamp_value(self._to_naive_date(dt))
+        pos = int(np.searchsorted(self.sessions, day))
+        return pos < len(self.sessions) and self.sessions[pos] == day
+
+    def is_open(self, dt):
+        """
+        Check whether the exchange is open at a timestamp, i.e. it lies
+        between the opening (inclusive) and closing (exclusive) times
+        of a trading session.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to check.
+
+        Returns
+        -------
+        `Boolean`
+            Whether the exchange is open.
+        """
+        ts = self._timestamp_value(dt)
+        pos = self.open_cursor.locate(ts)
+        return pos >= 0 and ts < self.closes[pos]
+
+    def sessions_in_range(self, start_dt, end_dt):
+        """
+        Obtain the trading sessions between two dates inclusive.
+
+        Parameters
+        ----------
+        start_dt : `pd.Timestamp`
+            The first date of the range.
+        end_dt : `pd.Timestamp`
+            The final date of the range.
+
+        Returns
+        -------
+        `pd.DatetimeIndex`
+            The UTC midnight timestamps of the sessions.
+        """
+        return self._to_index(self.sessions[self._session_slice(start_dt, end_dt)])
+
+    def sessions_before(self, dt, count):
+        """
+        Obtain up to the provided number of trading sessions
+        preceding the UTC date of a timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp.
+        count : `int`
+            The maximum number of sessions to obtain.
+
+        Returns
+        -------
+        `pd.DatetimeIndex`
+            The UTC midnight timestamps of the sessions, fewer than
+            'count' if the calendar begins beforehand.
+        """
+        day = self._timestamp_value(self._to_naive_date(dt))
+        end = int(np.searchsorted(self.sessions, day, side="left"))
+        return self._to_index(self.sessions[max(end - count, 0):end])
+
+    def _session_slice(self, start_dt, end_dt):
+        """
+        Determine the slice of the session arrays between two dates.
+        """
+        start = self._timestamp_value(self._to_naive_date(start_dt))
+        end = self._timestamp_value(self._to_naive_date(end_dt))
+        return slice(
+            int(np.searchsorted(self.sessions, start, side="left")),
+            int(np.searchsorted(self.sessions, end, side="right"))
+        )
+
+    def session_opens(self, start_dt, end_dt):
+        """
+        Obtain the opening times of the trading sessions
+        between two dates inclusive.
+        """
+        return self._to_index(self.opens[self._session_slice(start_dt, end_dt)])
+
+    def session_closes(self, start_dt, end_dt):
+        """
+        Obtain the closing times, including early closes, of the
+        trading sessions between two dates inclusive.
+        """
+        return self._to_index(self.closes[self._session_slice(start_dt, end_dt)])
+
+    def align_to_sessions(self, dates, following=True):
+        """
+        Move each of the provided dates onto the first trading session
+        on or after it ('following') or the last trading session on or
+        before it, discarding any dates beyond the calendar and any
+        resulting duplicates.
+
+        Parameters
+        ----------
+        dates : `pd.DatetimeIndex`
+            The dates to align.
+        following : `Boolean`, optional
+            Whether to move dates forward, rather than backward,
+            onto sessions. Defaults to True.
+
+        Returns
+        -------
+        `np.ndarray`
+            The sorted, unique positions of the aligned sessions
+            within the session arrays.
+        """
+        days = np.array(
+            [self._timestamp_value(self._to_naive_date(dt)) for dt in dates],
+            dtype=np.int64
+        )
+        if following:
+            pos = np.searchsorted(self.sessions, days, side="left")
+        else:
+            pos = np.searchsorted(self.sessions, days, side="right") - 1
+        return np.unique(pos[(pos >= 0) & (pos < len(self.sessions))])
+
+    def session_times(self, positions, pre_market=False):
+        """
+        Obtain the opening or closing times of the trading sessions
+        at the provided positions of the session arrays.
+
+        Parameters
+        ----------
+        positions : `np.ndarray`
+            The positions of the sessions.
+        pre_market : `Boolean`, optional
+            Whether to use the opening, rather than closing, times.
+
+        Returns
+        -------
+        `list[pd.Timestamp]`
+            The UTC session opening or closing times.
+        """
+        values = self.opens if pre_market else self.closes
+        return list(self._to_index(values[positions]))
+
+    def next_session(self, dt):
+        """
+        Obtain the first trading session on or after the UTC date
+        of a timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp.
+
+        Returns
+        -------
+        `pd.Timestamp` or `None`
+            The UTC midnight timestamp of the session, or None
+            if beyond the end of the calendar.
+        """
+        day = self._timestamp_value(self._to_naive_date(dt))
+        pos = int(np.searchsorted(self.sessions, day, side="left"))
+        if pos >= len(self.sessions):
+            return None
+        return pd.Timestamp(int(self.sessions[pos]), tz=pytz.UTC)
@@ -1,5 +1,6 @@
 import numpy as np
 
+from qstrader.data.backtest_data_handler import get_assets_latest_prices
 from qstrader.portcon.order_sizer.order_sizer import OrderSizer
 
 
@@ -112,10 +113,11 @@ class DollarWeightedCashBufferedOrderSizer(OrderSizer):
             for asset, weight in weights.items()
         }
 
-    def __call__(self, dt, weights):
+    def size_target_quantities(self, dt, weights, total_equity):
         """
-        Creates a dollar-weighted cash-buffered target portfolio from the
-        provided target weights at a particular timestamp.
+        Size the dollar-weighted cash-buffered integral target quantities
+        of all assets at once from the provided target weights and total
+        portfolio equity.
 
         Parameters
         ----------
@@ -123,57 +125,88 @@ class DollarWeightedCashBufferedOrderSizer(OrderSizer):
             The current date-time timestamp.
         weights : `dict{Asset: float}`
             The (potentially unnormalised) target weights.
+        total_equity : `float`
+            The total equity of the portfolio.
 
         Returns
         -------
-        `dict{Asset: dict}`
-            The cash-buffered target portfolio dictionary with quantities.
+        `dict{Asset: int}`
+            The target quantities, keyed by asset in sorted order.
         """
-        total_equity = self._obtain_broker_portfolio_total_equity()
-        cash_buffered_total_equity = total_equity * (
-            1.0 - self.cash_buffer_percentage
-        )
-
-        # Pre-cost dollar weight
-        N = len(weights)
-        if N == 0:
+        if len(weights) == 0:
             # No forecasts so portfolio remains in cash
             # or is fully liquidated
             return {}
+        cash_buffered_total_equity = total_equity * (
+            1.0 - self.cash_buffer_percentage
+        )
 
         # Ensure weight vector sums to unity
-        normalised_weights = self._normalise_weights(weights)
+        sorted_weights = sorted(self._normalise_weights(weights).items())
+        assets = [asset for asset, weight in sorted_weights]
 
-        target_portfolio = {}
-        for asset, weight in sorted(normalised_weights.items()):
-            pre_cost_dollar_weight = cash_buffered_total_equity * weight
+        # Obtain the latest prices for all assets at once
+        asset_prices = get_assets_latest_prices(self.data_handler, dt, assets, "ask")
 
-            # Estimate broker fees for this asset
-            est_quantity = 0  # TODO: Needs to be added for IB
-            est_costs = self.broker.fee_model.calc_total_cost(
+        # Estimate broker fees for each asset
+        pre_cost_dollar_weights = cash_buffered_total_equity * np.array(
+            [weight for asset, weight in sorted_weights]
+        )
+        est_quantity = 0  # TODO: Needs to be added for IB
+        est_costs = np.array([
+            self.broker.fee_model.calc_total_cost(
                 asset, est_quantity, pre_cost_dollar_weight, broker=self.broker
             )
+            for asset, pre_cost_dollar_weight in zip(assets, pre_cost_dollar_weights)
+        ])
 
-            # Calculate integral target asset quantity assuming broker costs
-            after_cost_dollar_weight = pre_cost_dollar_weight - est_costs
-            asset_price = self.data_handler.get_asset_latest_ask_price(
-                dt, asset
-            )
+        # Calculate integral target asset quantities assuming broker costs
+        after_cost_dollar_weights = pre_cost_dollar_weights - est_costs
 
-            if np.isnan(asset_price):
-                raise ValueError(
-                    'Asset price for "%s" at timestamp "%s" is Not-a-Number (NaN). '
-                    'This can occur if the chosen backtest start date is earlier '
-                    'than the first available price for a particular asset. Try '
-                    'modifying the backtest start date and re-running.' % (asset, dt)
+        missing = np.flatnonzero(np.isnan(asset_prices))
+        if len(missing) > 0:
+            raise ValueError(
+                'Asset price for "%s" at timestamp "%s" is Not-a-Number (NaN). '
+                'This can occur if the chosen backtest start date is earlier '
+                'than the first available price for a particular asset. Try '
+                'modifying the backtest start date and re-running.' % (
+                    assets[missing[0]], dt
+                )
+            )
+        invalid = np.flatnonzero(~np.isfinite(asset_prices) | (asset_prices <= 0.0))
+        if len(invalid) > 0:
+            raise ValueError(
+                'Asset price "%s" for "%s" at timestamp "%s" is not a positive '
+                'finite value, so a target quantity cannot be sized from it.' % (
+                    asset_prices[invalid[0]], assets[invalid[0]], dt
                 )
-
-            # TODO: Long only for the time being.
-            asset_quantity = int(
-                np.floor(after_cost_dollar_weight / asset_price)
             )
 
-            # Add to the target portfolio
-            target_portfolio[asset] = {"quantity": asset_quantity}
+        # TODO: Long only for the time being.
+        asset_quantities = np.floor(after_cost_dollar_weights / asset_prices)
+        return dict(zip(assets, asset_quantities.astype(np.int64).tolist()))
 
-        return target_portfolio
+    def __call__(self, dt, weights):
+        """
+        Creates a dollar-weighted cash-buffered target portfolio from the
+        provided target weights at a particular timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The current date-time timestamp.
+        weights : `dict{Asset: float}`
+            The (potentially unnormalised) target weights.
+
+        Returns
+        -------
+        `dict{Asset: dict}`
+            The cash-buffered target portfolio dictionary with quantities.
+        """
+        total_equity = self._obtain_broker_portfolio_total_equity()
+        return {
+            asset: {"quantity": asset_quantity}
+            for asset, asset_quantity in self.size_target_quantities(
+                dt, weights, total_equity
+            ).items()
+        }
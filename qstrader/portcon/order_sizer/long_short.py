@@ -1,5 +1,6 @@
 import numpy as np
 
+from qstrader.data.backtest_data_handler import get_assets_latest_prices
 from qstrader.portcon.order_sizer.order_sizer import OrderSizer
 
 
@@ -102,10 +103,11 @@ class LongShortLeveragedOrderSizer(OrderSizer):
             for asset, weight in weights.items()
         }
 
-    def __call__(self, dt, weights):
+    def size_target_quantities(self, dt, weights, total_equity):
         """
-        Creates a long short leveraged target portfolio from the
-        provided target weights at a particular timestamp.
+        Size the long short leveraged integral target quantities of all
+        assets at once from the provided target weights and total
+        portfolio equity.
 
         Parameters
         ----------
@@ -113,60 +115,91 @@ class LongShortLeveragedOrderSizer(OrderSizer):
             The current date-time timestamp.
         weights : `dict{Asset: float}`
             The (potentially unnormalised) target weights.
+        total_equity : `float`
+            The total equity of the portfolio.
 
         Returns
         -------
-        `dict{Asset: dict}`
-            The long short target portfolio dictionary with quantities.
+        `dict{Asset: int}`
+            The target quantities, keyed by asset in sorted order.
         """
-        total_equity = self._obtain_broker_portfolio_total_equity()
-
-        # Pre-cost dollar weight
-        N = len(weights)
-        if N == 0:
+        if len(weights) == 0:
             # No forecasts so portfolio remains in cash
             # or is fully liquidated
             return {}
 
         # Scale weights to take into account gross exposure and leverage
-        normalised_weights = self._normalise_weights(weights)
+        sorted_weights = sorted(self._normalise_weights(weights).items())
+        assets = [asset for asset, weight in sorted_weights]
 
-        target_portfolio = {}
-        for asset, weight in sorted(normalised_weights.items()):
-            pre_cost_dollar_weight = total_equity * weight
+        # Obtain the latest prices for all assets at once
+        asset_prices = get_assets_latest_prices(self.data_handler, dt, assets, "ask")
 
-            # Estimate broker fees for this asset
-            est_quantity = 0  # TODO: Needs to be added for IB
-            est_costs = self.broker.fee_model.calc_total_cost(
+        # Estimate broker fees for each asset
+        pre_cost_dollar_weights = total_equity * np.array(
+            [weight for asset, weight in sorted_weights]
+        )
+        est_quantity = 0  # TODO: Needs to be added for IB
+        est_costs = np.array([
+            self.broker.fee_model.calc_total_cost(
                 asset, est_quantity, pre_cost_dollar_weight, broker=self.broker
             )
+            for asset, pre_cost_dollar_weight in zip(assets, pre_cost_dollar_weights)
+        ])
 
-            # Calculate integral target asset quantity assuming broker costs
-            after_cost_dollar_weight = pre_cost_dollar_weight - est_costs
-            asset_price = self.data_handler.get_asset_latest_ask_price(
-                dt, asset
-            )
+        # Calculate integral target asset quantities assuming broker costs
+        after_cost_dollar_weights = pre_cost_dollar_weights - est_costs
 
-            if np.isnan(asset_price):
-                raise ValueError(
-                    'Asset price for "%s" at timestamp "%s" is Not-a-Number (NaN). '
-                    'This can occur if the chosen backtest start date is earlier '
-                    'than the first available price for a particular asset. Try '
-                    'modifying the backtest start date and re-running.' % (asset, dt)
+        missing = np.flatnonzero(np.isnan(asset_prices))
+        if len(missing) > 0:
+            raise ValueError(
+                'Asset price for "%s" at timestamp "%s" is Not-a-Number (NaN). '
+                'This can occur if the chosen backtest start date is earlier '
+                'than the first available price for a particular asset. Try '
+                'modifying the backtest start date and re-running.' % (
+                    assets[missing[0]], dt
                 )
-
-            # Truncate the after cost dollar weight
-            # to nearest integer
-            truncated_after_cost_dollar_weight = (
-                np.floor(after_cost_dollar_weight)
-                if after_cost_dollar_weight >= 0.0
-                else np.ceil(after_cost_dollar_weight)
             )
-            asset_quantity = int(
-                truncated_after_cost_dollar_weight / asset_price
+        invalid = np.flatnonzero(~np.isfinite(asset_prices) | (asset_prices <= 0.0))
+        if len(invalid) > 0:
+            raise ValueError(
+                'Asset price "%s" for "%s" at timestamp "%s" is not a positive '
+                'finite value, so a target quantity cannot be sized from it.' % (
+                    asset_prices[invalid[0]], assets[invalid[0]], dt
+                )
             )
 
-            # Add to the target portfolio
-            target_portfolio[asset] = {"quantity": asset_quantity}
+        # Truncate the after cost dollar weights
+        # to nearest integer
+        truncated_after_cost_dollar_weights = np.where(
+            after_cost_dollar_weights >= 0.0,
+            np.floor(after_cost_dollar_weights),
+            np.ceil(after_cost_dollar_weights)
+        )
+        asset_quantities = np.trunc(truncated_after_cost_dollar_weights / asset_prices)
+        return dict(zip(assets, asset_quantities.astype(np.int64).tolist()))
+
+    def __call__(self, dt, weights):
+        """
+        Creates a long short leveraged target portfolio from the
+        provided target weights at a particular timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The current date-time timestamp.
+        weights : `dict{Asset: float}`
+            The (potentially unnormalised) target weights.
 
-        return target_portfolio
+        Returns
+        -------
+        `dict{Asset: dict}`
+            The long short target portfolio dictionary with quantities.
+        """
+        total_equity = self._obtain_broker_portfolio_total_equity()
+        return {
+            asset: {"quantity": asset_quantity}
+            for asset, asset_quantity in self.size_target_quantities(
+                dt, weights, total_equity
+            ).items()
+        }
@@ -14,3 +14,28 @@ class OrderSizer(object):
         raise NotImplementedError(
             "Should implement call()"
         )
+
+    def size_target_quantities(self, dt, weights, total_equity):
+        """
+        Size integral target quantities for all assets at once from
+        the provided target weights and total portfolio equity, rather
+        than that of the Broker portfolio. Optional, but required by
+        the VectorisedBacktest.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The current date-time timestamp.
+        weights : `dict{Asset: float}`
+            The (potentially unnormalised) target weights.
+        total_equity : `float`
+            The total equity of the portfolio.
+
+        Returns
+        -------
+        `dict{Asset: int}`
+            The target quantities, keyed by asset in sorted order.
+        """
+        raise NotImplementedError(
+            "Should implement size_target_quantities()"
+        )
@@ -231,28 +231,22 @@ class PortfolioConstructionModel(object):
         assets = self.universe.get_assets(dt)
         return {asset: 0.0 for asset in assets}
 
-    def __call__(self, dt, stats=None):
+    def optimise_target_weights(self, dt):
         """
-        Execute the portfolio construction process at a particular
-        provided date-time.
-
-        Use the optional alpha model, risk model and cost model instances
-        to create a list of desired weights that are then sent to the
-        target weight generator instance to be optimised.
+        Obtain the optimised target weights at a particular date-time
+        from the optional alpha and risk models and the optimiser,
+        prior to extending them with the Broker portfolio assets.
 
         Parameters
         ----------
         dt : `pd.Timestamp`
             The date-time used to for Asset list determination and
             weight generation.
-        stats : `dict`, optional
-            An optional statistics dictionary to append values to
-            throughout the simulation lifetime.
 
         Returns
         -------
-        `list[Order]`
-            The list of rebalancing orders to be sent to Execution.
+        `dict{str: float}`
+            The optimised weights keyed by Asset symbol.
         """
         # If an AlphaModel is provided use its suggestions, otherwise
         # create a null weight vector (zero for all Assets).
@@ -267,7 +261,32 @@ class PortfolioConstructionModel(object):
             weights = self.risk_model(dt, weights)
 
         # Run the portfolio optimisation
-        optimised_weights = self.optimiser(dt, initial_weights=weights)
+        return self.optimiser(dt, initial_weights=weights)
+
+    def __call__(self, dt, stats=None):
+        """
+        Execute the portfolio construction process at a particular
+        provided date-time.
+
+        Use the optional alpha model, risk model and cost model instances
+        to create a list of desired weights that are then sent to the
+        target weight generator instance to be optimised.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The date-time used to for Asset list determination and
+            weight generation.
+        stats : `dict`, optional
+            An optional statistics dictionary to append values to
+            throughout the simulation lifetime.
+
+        Returns
+        -------
+        `list[Order]`
+            The list of rebalancing orders to be sent to Execution.
+        """
+        optimised_weights = self.optimise_target_weights(dt)
 
         # Ensure any Assets in the Broker Portfolio are sold out if
         # they are not specifically referenced on the optimised weights
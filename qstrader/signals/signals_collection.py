@@ -1,3 +1,6 @@
+from qstrader.data.backtest_data_handler import get_assets_latest_prices
+
+
 class SignalsCollection(object):
     """
     Provides a mechanism for aggregating all signals
@@ -53,10 +56,46 @@ class SignalsCollection(object):
         for name, signal in self.signals.items():
             self.signals[name].update_assets(dt)
 
-        # Update all of the signals with new prices
+        # Update all of the signals with new prices, obtaining
+        # the prices for all of a signal's assets at once
         for name, signal in self.signals.items():
             assets = signal.assets
-            for asset in assets:
-                price = self.data_handler.get_asset_latest_mid_price(dt, asset)
+            prices = get_assets_latest_prices(self.data_handler, dt, assets, "mid")
+            for asset, price in zip(assets, prices):
                 self.signals[name].append(asset, price)
         self.warmup += 1
+
+    def warm_up(self, dts):
+        """
+        Prime the signals with the pricing information of many prior
+        timestamps at once, as if updated at each of them in turn.
+
+        The prices of all of a signal's assets are obtained with a
+        single history lookup, rather than one lookup per timestamp,
+        such that a session beginning part way through the price
+        history (e.g. the window of a walk-forward optimisation)
+        need not simulate the preceding history to warm its signals.
+
+        Parameters
+        ----------
+        dts : `pd.DatetimeIndex`
+            The sorted update timestamps, e.g. the prior market closes.
+        """
+        if len(dts) == 0:
+            return
+
+        for name, signal in self.signals.items():
+            # Assets entering a DynamicUniverse only receive
+            # prices from the point at which they enter
+            first_updates = {}
+            for i, dt in enumerate(dts):
+                signal.update_assets(dt)
+                for asset in signal.assets:
+                    first_updates.setdefault(asset, i)
+
+            assets = list(signal.assets)
+            prices = self.data_handler.get_assets_mid_price_history(dts, assets)
+            for j, asset in enumerate(assets):
+                for price in prices[first_updates[asset]:, j]:
+                    signal.append(asset, price)
+        self.warmup += len(dts)
@@ -1,11 +1,70 @@
-import datetime
+import functools
 
 import pandas as pd
 from pandas.tseries.offsets import BDay
-import pytz
 
 from qstrader.simulation.sim_engine import SimulationEngine
-from qstrader.simulation.event import SimulationEvent
+from qstrader.simulation.timeline import EventTimeline
+
+
+@functools.lru_cache(maxsize=32)
+def _obtain_business_days(starting_day, ending_day):
+    """
+    Generate the business days of a date range, retaining
+    them for engines over the same date range.
+    """
+    return pd.date_range(starting_day, ending_day, freq=BDay())
+
+
+@functools.lru_cache(maxsize=32)
+def _obtain_event_timeline(
+    starting_day, ending_day, pre_market, post_market, calendar=None
+):
+    """
+    Create the event timeline of a date range, retaining it so that
+    simulation engines over the same date range, e.g. those of many
+    sessions of a parameter sweep, share a single timeline.
+
+    Parameters
+    ----------
+    starting_day : `pd.Timestamp`
+        The starting day of the simulation.
+    ending_day : `pd.Timestamp`
+        The ending day of the simulation.
+    pre_market : `Boolean`
+        Whether to include a pre-market event.
+    post_market : `Boolean`
+        Whether to include a post-market event.
+    calendar : `TradingCalendar`, optional
+        The trading calendar providing the sessions, along with their
+        opening and closing times. Defaults to all business days.
+
+    Returns
+    -------
+    `EventTimeline`
+        The event timeline.
+    """
+    event_types = ["market_open", "market_close"]
+    if pre_market:
+        event_types.append("pre_market")
+    if post_market:
+        event_types.append("post_market")
+    if calendar is not None:
+        return EventTimeline.from_days(
+            calendar.sessions_in_range(starting_day, ending_day).as_unit("ns").asi8,
+            event_types,
+            opens=calendar.session_opens(starting_day, ending_day).as_unit("ns").asi8,
+            closes=calendar.session_closes(starting_day, ending_day).as_unit("ns").asi8
+        )
+
+    days = _obtain_business_days(starting_day, ending_day)
+    # Events are timestamped relative to midnight UTC of each
+    # calendar date, regardless of the timezone of the dates
+    if days.tz is not None:
+        days = days.tz_localize(None)
+    return EventTimeline.from_days(
+        days.normalize().as_unit("ns").asi8, event_types
+    )
 
 
 class DailyBusinessDaySimulationEngine(SimulationEngine):
@@ -22,6 +81,14 @@ class DailyBusinessDaySimulationEngine(SimulationEngine):
     a market closing event and a post-market event for every day
     between the starting and ending dates.
 
+    Alternatively, given a trading calendar, events are only produced
+    for its trading sessions, thus skipping exchange holidays, with the
+    market closing events occurring at any early closing times.
+
+    The full event timeline is precomputed once, as arrays of int64
+    nanosecond timestamps and event type codes, and is shared by all
+    engines with the same date range and event settings.
+
     Parameters
     ----------
     starting_day : `pd.Timestamp`
@@ -32,9 +99,24 @@ class DailyBusinessDaySimulationEngine(SimulationEngine):
         Whether to include a pre-market event
     post_market : `Boolean`, optional
         Whether to include a post-market event
+    cache_events : `Boolean`, optional
+        Whether to yield the SimulationEvents retained by the shared
+        timeline, rather than creating them anew upon each iteration.
+        Defaults to True.
+    calendar : `TradingCalendar`, optional
+        The trading calendar providing the sessions. Defaults to
+        all business days, i.e. Monday-Friday.
     """
 
-    def __init__(self, starting_day, ending_day, pre_market=True, post_market=True):
+    def __init__(
+        self,
+        starting_day,
+        ending_day,
+        pre_market=True,
+        post_market=True,
+        cache_events=True,
+        calendar=None
+    ):
         if ending_day < starting_day:
             raise ValueError(
                 "Ending date time %s is earlier than starting date time %s. "
@@ -46,62 +128,38 @@ class DailyBusinessDaySimulationEngine(SimulationEngine):
         self.ending_day = ending_day
         self.pre_market = pre_market
         self.post_market = post_market
+        self.cache_events = cache_events
+        self.calendar = calendar
         self.business_days = self._generate_business_days()
+        self.timeline = _obtain_event_timeline(
+            starting_day, ending_day, pre_market, post_market, calendar
+        )
 
     def _generate_business_days(self):
         """
-        Generate the list of business days using midnight UTC as
-        the timestamp.
+        Generate the list of business days (or trading sessions, given
+        a trading calendar) using midnight UTC as the timestamp.
 
         Returns
         -------
         `list[pd.Timestamp]`
             The business day range list.
         """
-        days = pd.date_range(
-            self.starting_day, self.ending_day, freq=BDay()
-        )
-        return days
+        if self.calendar is not None:
+            return self.calendar.sessions_in_range(self.starting_day, self.ending_day)
+        return _obtain_business_days(self.starting_day, self.ending_day)
 
     def __iter__(self):
         """
         Generate the daily timestamps and event information
-        for pre-market, market open, market close and post-market.
+        for pre-market, market open, market close and post-market
+        from the precomputed event timeline.
 
         Yields
         ------
         `SimulationEvent`
             Market time simulation event to yield
         """
-        for index, bday in enumerate(self.business_days):
-            year = bday.year
-            month = bday.month
-            day = bday.day
-
-            if self.pre_market:
-                yield SimulationEvent(
-                    pd.Timestamp(
-                        datetime.datetime(year, month, day), tz='UTC'
-                    ), event_type="pre_market"
-                )
-
-            yield SimulationEvent(
-                pd.Timestamp(
-                    datetime.datetime(year, month, day, 14, 30),
-                    tz=pytz.utc
-                ), event_type="market_open"
-            )
-
-            yield SimulationEvent(
-                pd.Timestamp(
-                    datetime.datetime(year, month, day, 21, 00),
-                    tz=pytz.utc
-                ), event_type="market_close"
-            )
-
-            if self.post_market:
-                yield SimulationEvent(
-                    pd.Timestamp(
-                        datetime.datetime(year, month, day, 23, 59), tz='UTC'
-                    ), event_type="post_market"
-                )
+        if self.cache_events:
+            return iter(self.timeline.events)
+        return self.timeline.iter_events()
@@ -11,6 +11,8 @@ class SimulationEvent(object):
         The event type string.
     """
 
+    __slots__ = ["ts", "event_type"]
+
     def __init__(self, ts, event_type):
         self.ts = ts
         self.event_type = event_type
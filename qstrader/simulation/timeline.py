@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytz
+
+from qstrader.simulation.event import SimulationEvent
+
+# The intraday event types, in order, and their offsets from midnight UTC
+EVENT_TYPES = ["pre_market", "market_open", "market_close", "post_market"]
+EVENT_OFFSETS = pd.to_timedelta(["0h", "14h30min", "21h", "23h59min"])
+
+
+class EventTimeline(object):
+    """
+    An immutable, precomputed timeline of simulation events, stored
+    as an int64 nanosecond UTC timestamp array along with an array of
+    event type codes, indexing into EVENT_TYPES.
+
+    The SimulationEvent entities of the timeline are created once, in
+    a single vectorised pass, upon first use and are then retained,
+    such that any number of iterations (e.g. by the sessions of a
+    parameter sweep sharing the timeline) create no further objects.
+
+    Parameters
+    ----------
+    timestamps : `np.ndarray`
+        The sorted int64 nanosecond UTC event timestamps.
+    event_codes : `np.ndarray`
+        The int8 event type code of each event.
+    """
+
+    def __init__(self, timestamps, event_codes):
+        self.timestamps = timestamps
+        self.event_codes = event_codes
+        self.timestamps.flags.writeable = False
+        self.event_codes.flags.writeable = False
+        self._events = None
+
+    @classmethod
+    def from_days(cls, days, event_types, opens=None, closes=None):
+        """
+        Create the timeline of the provided event types on each day.
+
+        Parameters
+        ----------
+        days : `np.ndarray`
+            The int64 nanosecond UTC timestamps of midnight on each day.
+        event_types : `list[str]`
+            The event types occurring every day, a subset of EVENT_TYPES.
+        opens : `np.ndarray`, optional
+            The int64 nanosecond UTC market open timestamps of each day,
+            e.g. from a trading calendar. Defaults to 14:30 UTC.
+        closes : `np.ndarray`, optional
+            The int64 nanosecond UTC market close timestamps of each day,
+            including any early closes. Defaults to 21:00 UTC.
+
+        Returns
+        -------
+        `EventTimeline`
+            The event timeline.
+        """
+        codes = np.array(
+            sorted(EVENT_TYPES.index(event_type) for event_type in event_types),
+            dtype=np.int8
+        )
+        days = np.asarray(days, dtype=np.int64)
+        timestamps = days[:, np.newaxis] + EVENT_OFFSETS.as_unit("ns").asi8
+        if opens is not None:
+            timestamps[:, EVENT_TYPES.index("market_open")] = opens
+        if closes is not None:
+            timestamps[:, EVENT_TYPES.index("market_close")] = closes
+        return cls(timestamps[:, codes].ravel(), np.tile(codes, len(days)))
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def index(self):
+        """
+        The event timestamps as a UTC DatetimeIndex.
+        """
+        return pd.DatetimeIndex(
+            self.timestamps.view("datetime64[ns]")
+        ).tz_localize(pytz.UTC)
+
+    @property
+    def events(self):
+        """
+        The list of SimulationEvents, created upon first use.
+        """
+        if self._events is None:
+            self._events = list(self.iter_events())
+        return self._events
+
+    def iter_events(self):
+        """
+        Generate the SimulationEvents of the timeline without
+        retaining them.
+
+        Yields
+        ------
+        `SimulationEvent`
+            The simulation events in timestamp order.
+        """
+        for ts, code in zip(self.index, self.event_codes.tolist()):
+            yield SimulationEvent(ts, EVENT_TYPES[code])
@@ -13,10 +13,14 @@ class BuyAndHoldRebalance(Rebalance):
     ----------
     start_dt : `pd.Timestamp`
         The starting datetime of the buy and hold rebalance.
+    calendar : `TradingCalendar`, optional
+        The trading calendar used to find the first session,
+        accounting for exchange holidays.
     """
 
-    def __init__(self, start_dt):
+    def __init__(self, start_dt, calendar=None):
         self.start_dt = start_dt
+        self.calendar = calendar
         self.rebalances = self._generate_rebalances()
 
     def _is_business_day(self):
@@ -27,6 +31,8 @@ class BuyAndHoldRebalance(Rebalance):
         -------
         `boolean`
         """
+        if self.calendar is not None:
+            return self.calendar.is_session(self.start_dt)
         return bool(len(pd.bdate_range(self.start_dt, self.start_dt)))
 
     def _generate_rebalances(self):
@@ -34,7 +40,7 @@ class BuyAndHoldRebalance(Rebalance):
         Outputs the rebalance timestamp offset to the next
         business day.
 
-        Does not include holidays.
+        Does not include holidays unless a trading calendar is provided.
 
         Returns
         -------
@@ -42,7 +48,22 @@ class BuyAndHoldRebalance(Rebalance):
             The rebalance timestamp list.
         """
         if not self._is_business_day():
-            rebalance_date = self.start_dt + BusinessDay()
+            if self.calendar is not None:
+                # Retain the time of day of the starting datetime, as
+                # the session is timestamped at midnight UTC
+                start_dt = pd.Timestamp(self.start_dt)
+                utc_start_dt = (
+                    start_dt.tz_convert("UTC") if start_dt.tz is not None
+                    else start_dt
+                )
+                session = self.calendar.next_session(self.start_dt)
+                if session is None:
+                    return []
+                rebalance_date = session + (utc_start_dt - utc_start_dt.normalize())
+                if start_dt.tz is None:
+                    rebalance_date = rebalance_date.tz_localize(None)
+            else:
+                rebalance_date = self.start_dt + BusinessDay()
         else:
             rebalance_date = self.start_dt
         return [rebalance_date]
@@ -9,7 +9,9 @@ class DailyRebalance(Rebalance):
     Generates a list of rebalance timestamps for pre- or post-market,
     for all business days (Monday-Friday) between two dates.
 
-    Does not take into account holiday calendars.
+    Does not take into account holiday calendars unless a trading
+    calendar is provided, in which case only its sessions are used,
+    rebalancing at their opening or (possibly early) closing times.
 
     All timestamps produced are set to UTC.
 
@@ -21,16 +23,21 @@ class DailyRebalance(Rebalance):
         The ending timestamp of the rebalance range.
     pre_market : `Boolean`, optional
         Whether to carry out the rebalance at market open/close.
+    calendar : `TradingCalendar`, optional
+        The trading calendar providing the sessions.
     """
 
     def __init__(
         self,
         start_date,
         end_date,
-        pre_market=False
+        pre_market=False,
+        calendar=None
     ):
         self.start_date = start_date
         self.end_date = end_date
+        self.pre_market = pre_market
+        self.calendar = calendar
         self.market_time = self._set_market_time(pre_market)
         self.rebalances = self._generate_rebalances()
 
@@ -61,6 +68,11 @@ class DailyRebalance(Rebalance):
         `list[pd.Timestamp]`
             The list of rebalance timestamps.
         """
+        if self.calendar is not None:
+            if self.pre_market:
+                return list(self.calendar.session_opens(self.start_date, self.end_date))
+            return list(self.calendar.session_closes(self.start_date, self.end_date))
+
         rebalance_dates = pd.bdate_range(
             start=self.start_date, end=self.end_date,
         )
@@ -10,6 +10,9 @@ class EndOfMonthRebalance(Rebalance):
     for the final calendar day of the month between the starting and
     ending dates provided.
 
+    If a trading calendar is provided then the final trading session
+    of each month is used instead, accounting for exchange holidays.
+
     All timestamps produced are set to UTC.
 
     Parameters
@@ -22,16 +25,21 @@ class EndOfMonthRebalance(Rebalance):
         Whether to carry out the rebalance at market open/close on
         the final day of the month. Defaults to False, i.e at
         market close.
+    calendar : `TradingCalendar`, optional
+        The trading calendar providing the sessions.
     """
 
     def __init__(
         self,
         start_dt,
         end_dt,
-        pre_market=False
+        pre_market=False,
+        calendar=None
     ):
         self.start_dt = start_dt
         self.end_dt = end_dt
+        self.pre_market = pre_market
+        self.calendar = calendar
         self.market_time = self._set_market_time(pre_market)
         self.rebalances = self._generate_rebalances()
 
@@ -68,6 +76,12 @@ class EndOfMonthRebalance(Rebalance):
             freq='BME'
         )
 
+        if self.calendar is not None:
+            positions = self.calendar.align_to_sessions(
+                rebalance_dates, following=False
+            )
+            return self.calendar.session_times(positions, self.pre_market)
+
         rebalance_times = [
             pd.Timestamp(
                 "%s %s" % (date, self.market_time), tz=pytz.utc
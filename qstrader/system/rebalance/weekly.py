@@ -10,6 +10,9 @@ class WeeklyRebalance(Rebalance):
     for a particular trading day of the week between the starting and
     ending dates provided.
 
+    If a trading calendar is provided then weekdays falling upon
+    exchange holidays are rebalanced upon the following session.
+
     All timestamps produced are set to UTC.
 
     Parameters
@@ -23,6 +26,8 @@ class WeeklyRebalance(Rebalance):
         to rebalance on once per week.
     pre_market : `Boolean`, optional
         Whether to carry out the rebalance at market open/close.
+    calendar : `TradingCalendar`, optional
+        The trading calendar providing the sessions.
     """
 
     def __init__(
@@ -30,11 +35,14 @@ class WeeklyRebalance(Rebalance):
         start_date,
         end_date,
         weekday,
-        pre_market=False
+        pre_market=False,
+        calendar=None
     ):
         self.weekday = self._set_weekday(weekday)
         self.start_date = start_date
         self.end_date = end_date
+        self.pre_market = pre_market
+        self.calendar = calendar
         self.pre_market_time = self._set_market_time(pre_market)
         self.rebalances = self._generate_rebalances()
 
@@ -97,6 +105,10 @@ class WeeklyRebalance(Rebalance):
             freq='W-%s' % self.weekday
         )
 
+        if self.calendar is not None:
+            positions = self.calendar.align_to_sessions(rebalance_dates)
+            return self.calendar.session_times(positions, self.pre_market)
+
         rebalance_times = [
             pd.Timestamp(
                 "%s %s" % (date, self.pre_market_time), tz=pytz.utc
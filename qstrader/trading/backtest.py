@@ -1,5 +1,6 @@
 import os
 
+import numpy as np
 import pandas as pd
 
 from qstrader.asset.equity import Equity
@@ -14,6 +15,7 @@ from qstrader.system.rebalance.buy_and_hold import BuyAndHoldRebalance
 from qstrader.system.rebalance.daily import DailyRebalance
 from qstrader.system.rebalance.end_of_month import EndOfMonthRebalance
 from qstrader.system.rebalance.weekly import WeeklyRebalance
+from qstrader.trading.checkpoint import create_checkpoint, restore_checkpoint
 from qstrader.trading.trading_session import TradingSession
 from qstrader import settings
 
@@ -62,6 +64,23 @@ class BacktestTradingSession(TradingSession):
     burn_in_dt : `pd.Timestamp`, optional
         The optional date provided to begin tracking strategy statistics,
         which is used for strategies requiring a period of data 'burn in'
+    calendar : `TradingCalendar`, optional
+        The optional exchange trading calendar. If provided, it determines
+        the simulated trading sessions, market hours and rebalance dates,
+        such that exchange holidays are skipped and early closes observed.
+    fast_forward : `Boolean`, optional
+        Whether to skip over the simulation events at which there is
+        nothing to do besides marking positions to market, i.e. those
+        without a rebalance, signal update or open orders. The broker
+        is instead advanced across each run of such events in a single
+        vectorised step. The equity curve is identical either way.
+        Defaults to False.
+    checkpoint_dir : `str`, optional
+        The optional directory into which periodic checkpoints of the
+        simulation state are written, from which a session may resume.
+    checkpoint_frequency : `int`, optional
+        The number of market closes between periodic checkpoints.
+        Defaults to 21, i.e. approximately monthly.
     """
 
     def __init__(
@@ -81,6 +100,10 @@ class BacktestTradingSession(TradingSession):
         fee_model=ZeroFeeModel(),
         burn_in_dt=None,
         data_handler=None,
+        calendar=None,
+        fast_forward=False,
+        checkpoint_dir=None,
+        checkpoint_frequency=21,
         **kwargs
     ):
         self.start_dt = start_dt
@@ -97,6 +120,10 @@ class BacktestTradingSession(TradingSession):
         self.long_only = long_only
         self.fee_model = fee_model
         self.burn_in_dt = burn_in_dt
+        self.calendar = calendar
+        self.fast_forward = fast_forward
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_frequency = checkpoint_frequency
 
         self.exchange = self._create_exchange()
         self.data_handler = self._create_data_handler(data_handler)
@@ -119,6 +146,11 @@ class BacktestTradingSession(TradingSession):
         self.equity_curve = []
         self.target_allocations = []
 
+        self.last_event_dt = None
+        self.resume_dt = None
+        self.checkpoints = []
+        self.closes_since_checkpoint = 0
+
     def _is_rebalance_event(self, dt):
         """
         Checks if the provided timestamp is part of the rebalance
@@ -146,7 +178,7 @@ class BacktestTradingSession(TradingSession):
         `SimulatedExchanage`
             The simulated exchange instance.
         """
-        return SimulatedExchange(self.start_dt)
+        return SimulatedExchange(self.start_dt, calendar=self.calendar)
 
     def _create_data_handler(self, data_handler):
         """
@@ -227,7 +259,8 @@ class BacktestTradingSession(TradingSession):
             The simulation engine generating simulation timestamps.
         """
         return DailyBusinessDaySimulationEngine(
-            self.start_dt, self.end_dt, pre_market=False, post_market=False
+            self.start_dt, self.end_dt, pre_market=False, post_market=False,
+            calendar=self.calendar
         )
 
     def _create_rebalance_event_times(self):
@@ -241,17 +274,20 @@ class BacktestTradingSession(TradingSession):
             The list of rebalance timestamps.
         """
         if self.rebalance == 'buy_and_hold':
-            rebalancer = BuyAndHoldRebalance(self.start_dt)
+            rebalancer = BuyAndHoldRebalance(self.start_dt, calendar=self.calendar)
         elif self.rebalance == 'daily':
             rebalancer = DailyRebalance(
-                self.start_dt, self.end_dt
+                self.start_dt, self.end_dt, calendar=self.calendar
             )
         elif self.rebalance == 'weekly':
             rebalancer = WeeklyRebalance(
-                self.start_dt, self.end_dt, self.rebalance_weekday
+                self.start_dt, self.end_dt, self.rebalance_weekday,
+                calendar=self.calendar
             )
         elif self.rebalance == 'end_of_month':
-            rebalancer = EndOfMonthRebalance(self.start_dt, self.end_dt)
+            rebalancer = EndOfMonthRebalance(
+                self.start_dt, self.end_dt, calendar=self.calendar
+            )
         else:
             raise ValueError(
                 'Unknown rebalance frequency "%s" provided.' % self.rebalance
@@ -365,47 +401,35 @@ class BacktestTradingSession(TradingSession):
             alloc_df = alloc_df[self.burn_in_dt.date():]
         return alloc_df
 
-    def run(self, results=False):
+    def _process_event(self, event, stats):
         """
-        Execute the simulation engine by iterating over all
-        simulation events, rebalancing the quant trading
-        system at the appropriate schedule.
+        Carry out the broker update, signal update, rebalance and
+        equity curve update for a single simulation event.
 
         Parameters
         ----------
-        results : `Boolean`, optional
-            Whether to output the current portfolio holdings
+        event : `SimulationEvent`
+            The simulation event.
+        stats : `dict`
+            The statistics collected by the quant trading system.
         """
+        # Output the system event and timestamp
+        dt = event.ts
+        self.last_event_dt = dt
         if settings.PRINT_EVENTS:
-            print("Beginning backtest simulation...")
-
-        stats = {'target_allocations': []}
-
-        for event in self.sim_engine:
-            # Output the system event and timestamp
-            dt = event.ts
-            if settings.PRINT_EVENTS:
-                print("(%s) - %s" % (event.ts, event.event_type))
+            print("(%s) - %s" % (event.ts, event.event_type))
 
-            # Update the simulated broker
-            self.broker.update(dt)
+        # Update the simulated broker
+        self.broker.update(dt)
 
-            # Update any signals on a daily basis
-            if self.signals is not None and event.event_type == "market_close":
-                self.signals.update(dt)
+        # Update any signals on a daily basis
+        if self.signals is not None and event.event_type == "market_close":
+            self.signals.update(dt)
 
-            # If we have hit a rebalance time then carry
-            # out a full run of the quant trading system
-            if self.burn_in_dt is not None:
-                if dt >= self.burn_in_dt:
-                    if self._is_rebalance_event(dt):
-                        if settings.PRINT_EVENTS:
-                            print(
-                                "(%s) - trading logic "
-                                "and rebalance" % event.ts
-                            )
-                        self.qts(dt, stats=stats)
-            else:
+        # If we have hit a rebalance time then carry
+        # out a full run of the quant trading system
+        if self.burn_in_dt is not None:
+            if dt >= self.burn_in_dt:
                 if self._is_rebalance_event(dt):
                     if settings.PRINT_EVENTS:
                         print(
@@ -413,16 +437,230 @@ class BacktestTradingSession(TradingSession):
                             "and rebalance" % event.ts
                         )
                     self.qts(dt, stats=stats)
-
-            # Out of market hours we want a daily
-            # performance update, but only if we
-            # are past the 'burn in' period
-            if event.event_type == "market_close":
-                if self.burn_in_dt is not None:
-                    if dt >= self.burn_in_dt:
-                        self._update_equity_curve(dt)
-                else:
+        else:
+            if self._is_rebalance_event(dt):
+                if settings.PRINT_EVENTS:
+                    print(
+                        "(%s) - trading logic "
+                        "and rebalance" % event.ts
+                    )
+                self.qts(dt, stats=stats)
+
+        # Out of market hours we want a daily
+        # performance update, but only if we
+        # are past the 'burn in' period
+        if event.event_type == "market_close":
+            if self.burn_in_dt is not None:
+                if dt >= self.burn_in_dt:
                     self._update_equity_curve(dt)
+            else:
+                self._update_equity_curve(dt)
+            self._checkpoint_if_due(1)
+
+    def _find_key_events(self, events):
+        """
+        Determine the simulation events which must be processed
+        individually, namely rebalances (past the 'burn in' period)
+        and, if there are signals, their daily updates.
+
+        Parameters
+        ----------
+        events : `list[SimulationEvent]`
+            The simulation events.
+
+        Returns
+        -------
+        `np.ndarray`
+            The sorted positions of the key events.
+        """
+        rebalances = set(self.rebalance_schedule)
+        return np.array([
+            i for i, event in enumerate(events)
+            if (
+                self.signals is not None and event.event_type == "market_close"
+            ) or (
+                event.ts in rebalances and (
+                    self.burn_in_dt is None or event.ts >= self.burn_in_dt
+                )
+            )
+        ], dtype=np.int64)
+
+    def _run_fast_forward(self, stats):
+        """
+        Iterate over the simulation events, processing key events and
+        any events at which orders are open individually, while
+        advancing the broker across each run of the remaining events
+        in a single step, updating the equity curve at their market
+        closes.
+
+        Parameters
+        ----------
+        stats : `dict`
+            The statistics collected by the quant trading system.
+        """
+        events = list(self._iter_events())
+        key_events = self._find_key_events(events)
+
+        i = 0
+        while i < len(events):
+            if self.broker.has_open_orders():
+                self._process_event(events[i], stats)
+                i += 1
+                continue
+
+            # Skip to (but excluding) the next key event
+            pos = int(np.searchsorted(key_events, i, side="left"))
+            end = int(key_events[pos]) if pos < len(key_events) else len(events)
+            if end == i:
+                self._process_event(events[i], stats)
+                i += 1
+                continue
+
+            skipped = events[i:end]
+            dts = pd.DatetimeIndex([event.ts for event in skipped])
+            if settings.PRINT_EVENTS:
+                print(
+                    "(%s) - fast forwarding %d events to %s" % (
+                        dts[0], len(skipped), dts[-1]
+                    )
+                )
+            equity = self.broker.fast_forward(dts)
+            for event, event_equity in zip(skipped, equity):
+                if event.event_type == "market_close" and (
+                    self.burn_in_dt is None or event.ts >= self.burn_in_dt
+                ):
+                    self.equity_curve.append((event.ts, float(event_equity)))
+            self.last_event_dt = dts[-1]
+            self._checkpoint_if_due(
+                sum(event.event_type == "market_close" for event in skipped)
+            )
+            i = end
+
+    def _iter_events(self):
+        """
+        Generate the simulation events remaining to be processed,
+        i.e. those after any restored checkpoint.
+
+        Yields
+        ------
+        `SimulationEvent`
+            The remaining simulation events.
+        """
+        for event in self.sim_engine:
+            if self.resume_dt is None or event.ts > self.resume_dt:
+                yield event
+
+    def _checkpoint_if_due(self, num_closes):
+        """
+        Write a periodic checkpoint into the checkpoint directory once
+        the checkpoint frequency of market closes has been processed.
+
+        Parameters
+        ----------
+        num_closes : `int`
+            The number of market closes just processed.
+        """
+        if self.checkpoint_dir is None or num_closes == 0:
+            return
+        self.closes_since_checkpoint += num_closes
+        if self.closes_since_checkpoint >= self.checkpoint_frequency:
+            checkpoint_path = os.path.join(
+                self.checkpoint_dir,
+                "checkpoint_%s.pkl" % self.last_event_dt.strftime("%Y%m%d%H%M%S")
+            )
+            self.save_checkpoint(checkpoint_path)
+            self.checkpoints.append(checkpoint_path)
+            self.closes_since_checkpoint = 0
+
+    def save_checkpoint(self, checkpoint_path):
+        """
+        Write a compact snapshot of the current simulation state, that
+        is the broker cash, positions and open orders, signal buffers,
+        alpha model state, equity curve and target allocations, to file.
+        The portfolio event histories are omitted.
+
+        Parameters
+        ----------
+        checkpoint_path : `str`
+            The path of the checkpoint file.
+        """
+        with open(checkpoint_path, "wb") as checkpoint_file:
+            checkpoint_file.write(create_checkpoint(self, self.last_event_dt))
+        if settings.PRINT_EVENTS:
+            print(
+                "(%s) - saved checkpoint to %s" % (
+                    self.last_event_dt, checkpoint_path
+                )
+            )
+
+    def restore_checkpoint(self, checkpoint_path, restore_alpha_model=True):
+        """
+        Restore the simulation state from a checkpoint file, such that
+        a subsequent run resumes from the point at which it was taken.
+
+        Checkpoint files are pickles, and loading one can execute arbitrary
+        code, so only restore checkpoints from trusted sources.
+
+        The session must be constructed with the same universe, data and
+        signals as that which wrote the checkpoint. Other configuration,
+        e.g. the fee model, order sizing or ending date, may differ, which
+        allows many scenarios to branch off a shared warmed-up state, such
+        as that of a session ending at the 'burn in' date.
+
+        Parameters
+        ----------
+        checkpoint_path : `str`
+            The path of the checkpoint file.
+        restore_alpha_model : `Boolean`, optional
+            Whether to restore the alpha (and risk) model state, rather
+            than retaining that of this session. Defaults to True.
+        """
+        with open(checkpoint_path, "rb") as checkpoint_file:
+            self.resume_dt = restore_checkpoint(
+                self, checkpoint_file.read(),
+                restore_alpha_model=restore_alpha_model
+            )
+        self.last_event_dt = self.resume_dt
+        if settings.PRINT_EVENTS:
+            print(
+                "Restored checkpoint from %s, resuming after %s" % (
+                    checkpoint_path, self.resume_dt
+                )
+            )
+
+    def run(self, results=False):
+        """
+        Execute the simulation engine by iterating over all
+        simulation events, rebalancing the quant trading
+        system at the appropriate schedule.
+
+        Parameters
+        ----------
+        results : `Boolean`, optional
+            Whether to output the current portfolio holdings
+        """
+        if settings.PRINT_EVENTS:
+            print("Beginning backtest simulation...")
+
+        # Target allocations are collected in place, such that
+        # checkpoints include those made prior to them
+        stats = {'target_allocations': self.target_allocations}
+        if self.checkpoint_dir is not None:
+            os.makedirs(self.checkpoint_dir, exist_ok=True)
+
+        # Load the initial universe of any lazily loaded data sources
+        # in the background while the first events are simulated
+        if hasattr(self.data_handler, "prefetch"):
+            self.data_handler.prefetch(self.start_dt)
+        try:
+            if self.fast_forward:
+                self._run_fast_forward(stats)
+            else:
+                for event in self._iter_events():
+                    self._process_event(event, stats)
+        finally:
+            if hasattr(self.data_handler, "shutdown_prefetch"):
+                self.data_handler.shutdown_prefetch()
 
         self.target_allocations = stats['target_allocations']
 
@@ -0,0 +1,218 @@
+import copy
+import io
+import pickle
+import queue
+import zlib
+
+
+def _shared_objects(session):
+    """
+    Determine the objects of a session which are either configuration
+    or (read only) pricing data, rather than simulation state, keyed
+    by a name that identifies their counterpart in another session.
+
+    Parameters
+    ----------
+    session : `BacktestTradingSession`
+        The trading session.
+
+    Returns
+    -------
+    `dict{str: object}`
+        The shared objects keyed by name.
+    """
+    shared = {
+        "universe": session.universe,
+        "data_handler": session.data_handler,
+        "exchange": session.exchange,
+        "broker": session.broker,
+        "fee_model": session.fee_model,
+        "calendar": session.calendar,
+        "signals": session.signals,
+    }
+    for i, data_source in enumerate(session.data_handler.data_sources):
+        shared["data_source_%d" % i] = data_source
+    if session.signals is not None:
+        for name, signal in session.signals.signals.items():
+            shared["signal_%s" % name] = signal
+    return {key: obj for key, obj in shared.items() if obj is not None}
+
+
+class _CheckpointPickler(pickle.Pickler):
+    """
+    Pickles the state of a session, replacing any references to its
+    shared objects (e.g. the data handler held by an alpha model) with
+    their names, such that no pricing data is serialised.
+    """
+
+    def __init__(self, file, shared):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.shared_ids = {id(obj): key for key, obj in shared.items()}
+
+    def persistent_id(self, obj):
+        return self.shared_ids.get(id(obj))
+
+
+class _CheckpointUnpickler(pickle.Unpickler):
+    """
+    Unpickles the state of a session, resolving the names of shared
+    objects into the corresponding objects of the restoring session.
+    """
+
+    def __init__(self, file, shared):
+        super().__init__(file)
+        self.shared = shared
+
+    def persistent_load(self, pid):
+        try:
+            return self.shared[pid]
+        except KeyError:
+            raise pickle.UnpicklingError(
+                'Checkpoint refers to "%s", which the restoring '
+                'trading session does not have.' % pid
+            )
+
+
+def _trim_portfolio(portfolio):
+    """
+    Obtain a copy of a portfolio without its event history, which is
+    used for reporting alone and grows with the length of the run.
+
+    Parameters
+    ----------
+    portfolio : `Portfolio`
+        The portfolio.
+
+    Returns
+    -------
+    `Portfolio`
+        The shallow copy of the portfolio with an empty history.
+    """
+    trimmed = copy.copy(portfolio)
+    trimmed.history = []
+    return trimmed
+
+
+def create_checkpoint(session, dt):
+    """
+    Serialise the simulation state of a trading session into a
+    compact snapshot, namely the broker cash, portfolios and open
+    orders, the signal buffers, the alpha (and risk) model state
+    and the equity curve and target allocations so far.
+
+    The event history of each portfolio, used only for reporting, is
+    not stored, such that the size of the snapshot does not grow with
+    the number of transactions carried out.
+
+    Parameters
+    ----------
+    session : `BacktestTradingSession`
+        The trading session.
+    dt : `pd.Timestamp`
+        The timestamp of the last simulation event processed.
+
+    Returns
+    -------
+    `bytes`
+        The compressed snapshot.
+    """
+    broker = session.broker
+    state = {
+        "dt": dt,
+        "broker": {
+            "current_dt": broker.current_dt,
+            "cash_balances": broker.cash_balances,
+            "portfolios": {
+                portfolio_id: _trim_portfolio(portfolio)
+                for portfolio_id, portfolio in broker.portfolios.items()
+            },
+            # The order queues are not serialisable, so are
+            # stored as lists of their orders
+            "open_orders": {
+                portfolio_id: list(orders.queue)
+                for portfolio_id, orders in broker.open_orders.items()
+            },
+        },
+        "alpha_model": vars(session.alpha_model),
+        "risk_model": (
+            vars(session.risk_model) if session.risk_model is not None else None
+        ),
+        "equity_curve": session.equity_curve,
+        "target_allocations": session.target_allocations,
+    }
+    if session.signals is not None:
+        state["signals"] = {
+            "warmup": session.signals.warmup,
+            "signals": {
+                name: vars(signal)
+                for name, signal in session.signals.signals.items()
+            },
+        }
+
+    buffer = io.BytesIO()
+    _CheckpointPickler(buffer, _shared_objects(session)).dump(state)
+    return zlib.compress(buffer.getvalue())
+
+
+def restore_checkpoint(session, checkpoint, restore_alpha_model=True):
+    """
+    Restore the simulation state of a snapshot into a trading session,
+    constructed with the same universe, data and signals, such that its
+    simulation continues from the point at which the snapshot was taken.
+
+    The state is restored into the existing broker, signal and model
+    instances, leaving any references between them intact. The event
+    history of each restored portfolio begins at the snapshot.
+
+    The snapshot is unpickled, which can execute arbitrary code, so
+    only snapshots from trusted sources (e.g. written by this library
+    on the same machine) may be restored.
+
+    Parameters
+    ----------
+    session : `BacktestTradingSession`
+        The trading session to restore the state into.
+    checkpoint : `bytes`
+        The compressed snapshot.
+    restore_alpha_model : `Boolean`, optional
+        Whether to restore the alpha (and risk) model state. This is
+        disabled when branching scenarios with differing alpha model
+        parameters off a shared warmed-up state. Defaults to True.
+
+    Returns
+    -------
+    `pd.Timestamp`
+        The timestamp of the last simulation event processed.
+    """
+    state = _CheckpointUnpickler(
+        io.BytesIO(zlib.decompress(checkpoint)), _shared_objects(session)
+    ).load()
+
+    open_orders = {}
+    for portfolio_id, orders in state["broker"].pop("open_orders").items():
+        open_orders[portfolio_id] = queue.Queue()
+        for order in orders:
+            open_orders[portfolio_id].put(order)
+    vars(session.broker).update(state["broker"])
+    session.broker.open_orders = open_orders
+
+    if "signals" in state:
+        if session.signals is None or (
+            set(session.signals.signals) != set(state["signals"]["signals"])
+        ):
+            raise ValueError(
+                "Checkpoint signals %s do not match those of the trading "
+                "session." % sorted(state["signals"]["signals"])
+            )
+        session.signals.warmup = state["signals"]["warmup"]
+        for name, signal_state in state["signals"]["signals"].items():
+            vars(session.signals.signals[name]).update(signal_state)
+
+    if restore_alpha_model:
+        vars(session.alpha_model).update(state["alpha_model"])
+        if session.risk_model is not None and state["risk_model"] is not None:
+            vars(session.risk_model).update(state["risk_model"])
+
+    session.equity_curve = state["equity_curve"]
+    session.target_allocations = state["target_allocations"]
+    return state["dt"]
@@ -0,0 +1,248 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import itertools
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+
+from qstrader.statistics import performance as perf
+from qstrader import settings
+
+SWEEP_STATISTICS = [
+    "final_equity", "total_return", "cagr", "annualised_vol",
+    "sharpe", "sortino", "max_drawdown", "max_drawdown_duration"
+]
+
+# The strategy factory and shared data of a sweep worker process
+_worker_state = {}
+
+
+def parameter_grid(param_grid):
+    """
+    Expand a grid of parameter values into the list of all
+    parameter combinations.
+
+    Parameters
+    ----------
+    param_grid : `dict{str: list}`
+        The candidate values of each parameter.
+
+    Returns
+    -------
+    `list[dict]`
+        The parameter combinations, varying the final
+        parameter fastest.
+    """
+    names = list(param_grid.keys())
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*[param_grid[name] for name in names])
+    ]
+
+
+def calculate_run_statistics(equity_df, periods=252):
+    """
+    Calculate the summary statistics of a single backtest from
+    its equity curve, as per the JSON statistics.
+
+    Parameters
+    ----------
+    equity_df : `pd.DataFrame`
+        The date-indexed equity curve, with an 'Equity' column.
+    periods : `int`, optional
+        The number of periods per year. Defaults to 252.
+
+    Returns
+    -------
+    `dict{str: float}`
+        The statistics, keyed as per SWEEP_STATISTICS.
+    """
+    if len(equity_df) == 0:
+        return {stat: np.nan for stat in SWEEP_STATISTICS}
+
+    returns = equity_df["Equity"].pct_change().fillna(0.0)
+    cum_returns = np.exp(np.log(1 + returns).cumsum())
+    _, max_dd, dd_dur = perf.create_drawdowns(cum_returns)
+    return {
+        "final_equity": equity_df["Equity"].iloc[-1],
+        "total_return": cum_returns.iloc[-1] - 1.0,
+        "cagr": perf.create_cagr(cum_returns, periods),
+        "annualised_vol": np.std(returns) * np.sqrt(periods),
+        "sharpe": perf.create_sharpe_ratio(returns, periods),
+        "sortino": perf.create_sortino_ratio(returns, periods),
+        "max_drawdown": max_dd,
+        "max_drawdown_duration": dd_dur,
+    }
+
+
+def _initialise_worker(strategy_factory, data, print_events):
+    """
+    Retain the strategy factory and shared data within a worker
+    process. Under the 'fork' start method these are inherited
+    from the parent process rather than pickled, such that the
+    price data is shared copy-on-write.
+    """
+    _worker_state["strategy_factory"] = strategy_factory
+    _worker_state["data"] = data
+    settings.PRINT_EVENTS = print_events
+
+
+def _run_backtest(run_id, params):
+    """
+    Create and run the backtest of a single parameter combination
+    within a worker process.
+
+    Parameters
+    ----------
+    run_id : `int`
+        The position of the combination within the sweep.
+    params : `dict`
+        The parameter combination.
+
+    Returns
+    -------
+    `dict`
+        The results row of the run.
+    """
+    backtest = _worker_state["strategy_factory"](_worker_state["data"], **params)
+    backtest.run()
+    row = {"run": run_id}
+    row.update(params)
+    row.update(calculate_run_statistics(backtest.get_equity_curve()))
+    return row
+
+
+class ParameterSweep(object):
+    """
+    Runs the backtests of a strategy over a grid of parameters
+    across a pool of worker processes.
+
+    The price data is created once, in the parent process, and is
+    shared with the workers. Where the 'fork' start method is available
+    the workers inherit it copy-on-write, such that the (read only)
+    pricing arrays are never copied. Otherwise it is pickled once
+    per worker, rather than once per run.
+
+    The results of each run are streamed, in order of completion, into
+    a single columnar results table with a row per run containing the
+    run number, its parameters and its summary statistics.
+
+    Parameters
+    ----------
+    strategy_factory : `callable`
+        A function of the shared data and the parameters, as keyword
+        arguments, returning an unrun BacktestTradingSession (or
+        VectorisedBacktest) instance.
+    param_grid : `dict{str: list}`
+        The candidate values of each parameter.
+    data : `object`, optional
+        The shared data, e.g. a list of data sources, passed to the
+        strategy factory. Data sources should be loaded eagerly so
+        that the workers do not each load the data.
+    max_workers : `int`, optional
+        The number of worker processes. Defaults to the number of CPUs.
+        With a single worker the backtests are run in-process.
+    print_events : `Boolean`, optional
+        Whether the workers output simulation events. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        strategy_factory,
+        param_grid,
+        data=None,
+        max_workers=None,
+        print_events=False
+    ):
+        self.strategy_factory = strategy_factory
+        self.param_grid = param_grid
+        self.data = data
+        self.max_workers = (
+            max_workers if max_workers is not None else os.cpu_count() or 1
+        )
+        self.print_events = print_events
+        self.runs = parameter_grid(param_grid)
+
+    @staticmethod
+    def _obtain_mp_context():
+        """
+        Obtain the 'fork' multiprocessing context if available, to share
+        the data copy-on-write, or the default context otherwise.
+        """
+        if "fork" in multiprocessing.get_all_start_methods():
+            return multiprocessing.get_context("fork")
+        return multiprocessing.get_context()
+
+    def iter_results(self):
+        """
+        Run the backtests, yielding the results row of each
+        run as it completes.
+
+        Yields
+        ------
+        `dict`
+            The run number, parameters and statistics of a run.
+        """
+        if self.max_workers <= 1:
+            print_events = settings.PRINT_EVENTS
+            _initialise_worker(self.strategy_factory, self.data, self.print_events)
+            try:
+                for run_id, params in enumerate(self.runs):
+                    yield _run_backtest(run_id, params)
+            finally:
+                settings.PRINT_EVENTS = print_events
+                _worker_state.clear()
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=min(self.max_workers, max(len(self.runs), 1)),
+            mp_context=self._obtain_mp_context(),
+            initializer=_initialise_worker,
+            initargs=(self.strategy_factory, self.data, self.print_events)
+        ) as executor:
+            futures = [
+                executor.submit(_run_backtest, run_id, params)
+                for run_id, params in enumerate(self.runs)
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(self, output_path=None):
+        """
+        Run the backtests, collecting the results into a single table.
+
+        Parameters
+        ----------
+        output_path : `str`, optional
+            The optional CSV file to which each results
+            row is appended as its run completes.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The results table, indexed by run number.
+        """
+        columns = ["run"] + list(self.param_grid.keys()) + SWEEP_STATISTICS
+        results = {column: [] for column in columns}
+        if output_path is not None:
+            pd.DataFrame(columns=columns).to_csv(output_path, index=False)
+
+        for num_completed, row in enumerate(self.iter_results(), start=1):
+            for column in columns:
+                results[column].append(row[column])
+            if output_path is not None:
+                pd.DataFrame([row], columns=columns).to_csv(
+                    output_path, mode="a", header=False, index=False
+                )
+            if settings.PRINT_EVENTS:
+                print(
+                    "Completed sweep run %d of %d: %s" % (
+                        num_completed, len(self.runs),
+                        ", ".join(
+                            "%s=%s" % (name, row[name]) for name in self.param_grid
+                        )
+                    )
+                )
+
+        return pd.DataFrame(results, columns=columns).set_index("run").sort_index()
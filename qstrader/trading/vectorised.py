@@ -0,0 +1,294 @@
+import numpy as np
+import pandas as pd
+
+from qstrader.portcon.order_sizer.order_sizer import OrderSizer
+from qstrader.trading.backtest import BacktestTradingSession
+from qstrader import settings
+
+
+class VectorisedBacktest(BacktestTradingSession):
+    """
+    A backtest of target-weight strategies that avoids the event
+    loop of BacktestTradingSession, while producing the same
+    equity curve and target allocations.
+
+    The trading system is only evaluated at the rebalance events, with
+    the orders executed immediately if the exchange is open and at the
+    subsequent market open otherwise. The holdings, cash and equity
+    between these events are computed with vectorised array operations
+    over all of the intervening market closes at once. The target
+    quantities of each rebalance are sized across all assets at once
+    by the order sizer of the trading system, from the simulated total
+    equity, which must therefore implement 'size_target_quantities'.
+
+    It is suitable for strategies whose weights are a function of time
+    (and market data) alone, such as fixed signal or momentum models,
+    rather than of the state of the broker. Any signals are still
+    updated at every market close, in turn.
+
+    The parameters are identical to those of BacktestTradingSession.
+    The broker is used for its configuration only and is not updated
+    by the simulation. Instead the holdings at each market close are
+    provided as a DataFrame.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._check_order_sizer()
+        self.holdings = None
+
+    def _check_order_sizer(self):
+        """
+        Check that the order sizer of the trading system is able to
+        size target quantities from a provided total equity, as the
+        broker is not updated by the simulation.
+        """
+        order_sizer = self.qts.portfolio_construction_model.order_sizer
+        size_target_quantities = getattr(
+            type(order_sizer), "size_target_quantities", None
+        )
+        if size_target_quantities in (None, OrderSizer.size_target_quantities):
+            raise ValueError(
+                'Order sizer "%s" does not implement size_target_quantities() '
+                'and so is unsupported by the vectorised backtest.' % (
+                    type(order_sizer).__name__
+                )
+            )
+
+    def _evaluate_target_weights(self, dt, held_assets):
+        """
+        Evaluate the alpha model, risk model and optimiser of the
+        trading system, extending the weights with zero weights for
+        all universe and held assets, as the portfolio construction
+        model would.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The rebalance timestamp.
+        held_assets : `list[str]`
+            The assets currently held.
+
+        Returns
+        -------
+        `dict{str: float}`
+            The full target weight vector.
+        """
+        pcm = self.qts.portfolio_construction_model
+        optimised_weights = pcm.optimise_target_weights(dt)
+        full_assets = sorted(
+            set(held_assets).union(set(self.universe.get_assets(dt)))
+        )
+        return {**{asset: 0.0 for asset in full_assets}, **optimised_weights}
+
+    def _execute_orders(self, dt, orders, positions, prices, cash):
+        """
+        Execute the open orders, sales first, updating the positions,
+        their current prices and the cash balance as the broker would.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The execution timestamp.
+        orders : `list[tuple]`
+            The (asset, quantity) open orders, in submission order.
+        positions : `dict{str: int}`
+            The position quantities, in the order they were opened.
+        prices : `dict{str: float}`
+            The current prices of the positions.
+        cash : `float`
+            The cash balance.
+
+        Returns
+        -------
+        `float`
+            The cash balance after execution.
+        """
+        orders = sorted(orders, key=lambda order: np.copysign(1, order[1]))
+        bids, asks = self.data_handler.get_assets_latest_bid_ask_prices(
+            dt, [asset for asset, quantity in orders]
+        )
+        for (asset, quantity), bid, ask in zip(orders, bids, asks):
+            price = ask if quantity > 0 else bid
+            consideration = round(price * quantity)
+            commission = self.fee_model.calc_total_cost(
+                asset, quantity, consideration, self.broker
+            )
+            positions[asset] = positions.get(asset, 0) + quantity
+            prices[asset] = price
+            if positions[asset] == 0:
+                del positions[asset]
+            cash -= price * quantity + commission
+            if settings.PRINT_EVENTS:
+                print(
+                    "(%s) - executed order: %s, qty: %s, price: %0.2f, "
+                    "commission: %0.2f" % (dt, asset, quantity, price, commission)
+                )
+        return cash
+
+    def _mark_closes(self, dts, positions, cash):
+        """
+        Mark the positions to market at many market closes at once,
+        obtaining the total equity at each.
+
+        The market values are accumulated asset by asset in the order
+        the positions were opened, such that the equity is identical
+        to that of the event-driven backtest.
+
+        Parameters
+        ----------
+        dts : `pd.DatetimeIndex`
+            The market close timestamps.
+        positions : `dict{str: int}`
+            The position quantities, in the order they were opened.
+        cash : `float`
+            The cash balance.
+
+        Returns
+        -------
+        `np.ndarray`
+            The total equity at each timestamp.
+        """
+        market_value = np.zeros(len(dts))
+        if len(positions) > 0:
+            mid_prices = self.data_handler.get_assets_mid_price_history(
+                dts, list(positions)
+            )
+            for i, quantity in enumerate(positions.values()):
+                market_value = market_value + mid_prices[:, i] * quantity
+        return market_value + cash
+
+    def _is_past_burn_in(self, dt):
+        return self.burn_in_dt is None or dt >= self.burn_in_dt
+
+    def run(self, results=False):
+        """
+        Carry out the vectorised backtest, populating the equity
+        curve, target allocations and holdings.
+
+        Parameters
+        ----------
+        results : `Boolean`, optional
+            Whether to output the final portfolio holdings.
+        """
+        if settings.PRINT_EVENTS:
+            print("Beginning vectorised backtest simulation...")
+
+        events = list(self.sim_engine)
+        rebalances = set(self.rebalance_schedule)
+        rebalance_events = np.array([
+            i for i, event in enumerate(events)
+            if event.ts in rebalances and self._is_past_burn_in(event.ts)
+        ], dtype=np.int64)
+
+        stats = {'target_allocations': []}
+        cash = self.broker.portfolios[self.portfolio_id].cash
+        positions = {}
+        open_orders = []
+        holdings = []
+
+        i = 0
+        while i < len(events):
+            # Find the next event at which a rebalance
+            # occurs or open orders may be executed
+            pos = int(np.searchsorted(rebalance_events, i, side="left"))
+            end = (
+                int(rebalance_events[pos]) if pos < len(rebalance_events)
+                else len(events)
+            )
+            if len(open_orders) > 0:
+                for j in range(i, end):
+                    if self.exchange.is_open_at_datetime(events[j].ts):
+                        end = j
+                        break
+
+            # The positions and cash are unchanged up until that event
+            close_dts = pd.DatetimeIndex([
+                event.ts for event in events[i:end]
+                if event.event_type == "market_close"
+            ])
+            if self.signals is not None:
+                for dt in close_dts:
+                    self.signals.update(dt)
+            close_dts = close_dts[
+                [self._is_past_burn_in(dt) for dt in close_dts]
+            ] if len(close_dts) > 0 else close_dts
+            if len(close_dts) > 0:
+                equity = self._mark_closes(close_dts, positions, cash)
+                self.equity_curve.extend(zip(close_dts, equity.tolist()))
+                holdings.append(pd.DataFrame(
+                    np.tile(list(positions.values()), (len(close_dts), 1)),
+                    index=close_dts, columns=list(positions)
+                ))
+            if end >= len(events):
+                break
+
+            # Carry out the event as the broker, signals
+            # and trading system would
+            event = events[end]
+            dt = event.ts
+            assets = list(positions)
+            prices = dict(zip(
+                assets, self.data_handler.get_assets_latest_mid_prices(dt, assets)
+            )) if len(assets) > 0 else {}
+            if len(open_orders) > 0 and self.exchange.is_open_at_datetime(dt):
+                cash = self._execute_orders(dt, open_orders, positions, prices, cash)
+                open_orders = []
+
+            if self.signals is not None and event.event_type == "market_close":
+                self.signals.update(dt)
+
+            if dt in rebalances and self._is_past_burn_in(dt):
+                if settings.PRINT_EVENTS:
+                    print("(%s) - trading logic and rebalance" % dt)
+                total_equity = sum(
+                    prices[asset] * quantity for asset, quantity in positions.items()
+                ) + cash
+                full_weights = self._evaluate_target_weights(dt, list(positions))
+                alloc_dict = {'Date': dt}
+                alloc_dict.update(full_weights)
+                stats['target_allocations'].append(alloc_dict)
+
+                order_sizer = self.qts.portfolio_construction_model.order_sizer
+                target_portfolio = order_sizer.size_target_quantities(
+                    dt, full_weights, total_equity
+                )
+                rebalance_orders = [
+                    (asset, quantity - positions.get(asset, 0))
+                    for asset, quantity in target_portfolio.items()
+                    if quantity - positions.get(asset, 0) != 0
+                ]
+                if self.exchange.is_open_at_datetime(dt):
+                    # Each order is executed as soon as it is submitted
+                    for order in rebalance_orders:
+                        cash = self._execute_orders(dt, [order], positions, prices, cash)
+                else:
+                    open_orders.extend(rebalance_orders)
+
+            if event.event_type == "market_close" and self._is_past_burn_in(dt):
+                self.equity_curve.append((dt, sum(
+                    prices[asset] * quantity for asset, quantity in positions.items()
+                ) + cash))
+                holdings.append(pd.DataFrame(
+                    [list(positions.values())], index=[dt], columns=list(positions)
+                ))
+            i = end + 1
+
+        self.target_allocations = stats['target_allocations']
+        self.holdings = (
+            pd.concat(holdings).fillna(0).astype(np.int64) if len(holdings) > 0
+            else pd.DataFrame()
+        )
+
+        if results:
+            self.output_holdings()
+
+        if settings.PRINT_EVENTS:
+            print("Ending vectorised backtest simulation.")
+
+    def output_holdings(self):
+        """
+        Output the final portfolio holdings to the console.
+        """
+        final_holdings = self.holdings.iloc[-1]
+        print(final_holdings[final_holdings != 0].to_string())
@@ -0,0 +1,325 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.offsets import BDay
+import pytz
+
+from qstrader.trading.sweep import calculate_run_statistics, ParameterSweep
+from qstrader import settings
+
+
+class _WindowFactory(object):
+    """
+    Creates the session of a strategy over a single window, warming
+    its signals with the market closes preceding the window.
+
+    Parameters
+    ----------
+    strategy_factory : `callable`
+        A function of the shared data, the window start and end
+        timestamps and the parameters, returning an unrun session.
+    start_dt : `pd.Timestamp`
+        The starting timestamp of the window.
+    end_dt : `pd.Timestamp`
+        The ending timestamp of the window.
+    warmup_dts : `pd.DatetimeIndex`
+        The market closes preceding the window.
+    """
+
+    def __init__(self, strategy_factory, start_dt, end_dt, warmup_dts):
+        self.strategy_factory = strategy_factory
+        self.start_dt = start_dt
+        self.end_dt = end_dt
+        self.warmup_dts = warmup_dts
+
+    def __call__(self, data, **params):
+        session = self.strategy_factory(data, self.start_dt, self.end_dt, **params)
+        if session.signals is not None and len(self.warmup_dts) > 0:
+            session.signals.warm_up(self.warmup_dts)
+        return session
+
+
+class WalkForwardOptimiser(object):
+    """
+    Carries out a rolling (or anchored) walk-forward optimisation of
+    a strategy, choosing its parameters by a parameter sweep over each
+    in-sample training window and evaluating the chosen parameters over
+    the immediately following out-of-sample test window.
+
+    The test windows are contiguous and non-overlapping, such that their
+    equity curves are stitched together, compounding the returns of each
+    window, into a single out-of-sample equity curve.
+
+    The price data is loaded once and shared by the sessions of every
+    window, with the training sweeps carried out across a process pool.
+    Rather than simulating the history preceding each window, the signals
+    of each window's sessions are warmed with the prior 'warmup_periods'
+    market closes in a single vectorised pass over the shared data. As
+    these are the closes a continuous simulation would have updated the
+    signals at, the signal buffers are identical to those of a session
+    begun earlier, so each window is only simulated over its own dates.
+
+    Parameters
+    ----------
+    strategy_factory : `callable`
+        A function of the shared data, the window starting and ending
+        timestamps and the parameters, as keyword arguments, returning
+        an unrun BacktestTradingSession (or VectorisedBacktest) instance.
+    param_grid : `dict{str: list}`
+        The candidate values of each parameter.
+    start_dt : `pd.Timestamp`
+        The starting datetime (UTC) of the first training window.
+    end_dt : `pd.Timestamp`
+        The ending datetime (UTC) of the final test window.
+    train_periods : `int`
+        The number of sessions in each training window.
+    test_periods : `int`
+        The number of sessions in each test window.
+    data : `object`, optional
+        The shared data, e.g. a list of data sources, passed to the
+        strategy factory.
+    objective : `str`, optional
+        The sweep statistic used to choose the parameters of each
+        window. Defaults to 'sharpe'.
+    maximise : `Boolean`, optional
+        Whether to maximise, rather than minimise, the objective.
+    warmup_periods : `int`, optional
+        The number of prior market closes with which to warm the
+        signals of each window. Defaults to zero.
+    anchored : `Boolean`, optional
+        Whether each training window begins at 'start_dt', rather
+        than rolling forward with the test windows.
+    calendar : `TradingCalendar`, optional
+        The trading calendar providing the sessions. Defaults to
+        all business days, closing at 21:00 UTC. It must also cover
+        the warm-up sessions prior to 'start_dt'.
+    max_workers : `int`, optional
+        The number of worker processes of each training sweep.
+    """
+
+    def __init__(
+        self,
+        strategy_factory,
+        param_grid,
+        start_dt,
+        end_dt,
+        train_periods,
+        test_periods,
+        data=None,
+        objective="sharpe",
+        maximise=True,
+        warmup_periods=0,
+        anchored=False,
+        calendar=None,
+        max_workers=None
+    ):
+        if train_periods < 1 or test_periods < 1:
+            raise ValueError(
+                "Training (%s) and test (%s) windows must each contain at "
+                "least one session." % (train_periods, test_periods)
+            )
+        self.strategy_factory = strategy_factory
+        self.param_grid = param_grid
+        self.start_dt = start_dt
+        self.end_dt = end_dt
+        self.train_periods = train_periods
+        self.test_periods = test_periods
+        self.data = data
+        self.objective = objective
+        self.maximise = maximise
+        self.warmup_periods = warmup_periods
+        self.anchored = anchored
+        self.calendar = calendar
+        self.max_workers = max_workers
+
+        self.opens, self.closes, self.first_session = self._obtain_sessions()
+        self.folds = self._generate_folds()
+        self.fold_results = []
+        self.equity_curve = None
+
+    def _obtain_sessions(self):
+        """
+        Obtain the opening and closing times of the sessions from
+        'warmup_periods' sessions prior to the starting date up to the
+        ending date, along with the position of the first session on
+        or after the starting date.
+
+        Returns
+        -------
+        `tuple(pd.DatetimeIndex, pd.DatetimeIndex, int)`
+            The session opens and closes and the first session position.
+        """
+        if self.calendar is not None:
+            warmup_sessions = self.calendar.sessions_before(
+                self.start_dt, self.warmup_periods
+            )
+            first_date = (
+                warmup_sessions[0] if len(warmup_sessions) > 0 else self.start_dt
+            )
+            opens = self.calendar.session_opens(first_date, self.end_dt)
+            closes = self.calendar.session_closes(first_date, self.end_dt)
+        else:
+            start_day = pd.Timestamp(self.start_dt.date())
+            days = pd.date_range(
+                start_day - BDay(self.warmup_periods), self.end_dt.date(), freq=BDay()
+            ).tz_localize(pytz.UTC)
+            opens = days + pd.Timedelta(hours=14, minutes=30)
+            closes = days + pd.Timedelta(hours=21)
+
+        first_session = int(np.searchsorted(
+            closes.normalize(), self.start_dt.normalize(), side="left"
+        ))
+        return opens, closes, first_session
+
+    def _generate_folds(self):
+        """
+        Split the sessions into consecutive training and test windows,
+        the final test window being truncated at the ending date.
+
+        Returns
+        -------
+        `list[tuple(slice, slice)]`
+            The training and test session slices of each fold.
+        """
+        folds = []
+        train_start = self.first_session
+        while True:
+            test_start = train_start + self.train_periods
+            if self.anchored:
+                test_start = (
+                    self.first_session + self.train_periods +
+                    len(folds) * self.test_periods
+                )
+            if test_start >= len(self.closes):
+                break
+            test_end = min(test_start + self.test_periods, len(self.closes))
+            folds.append((slice(train_start, test_start), slice(test_start, test_end)))
+            if not self.anchored:
+                train_start += self.test_periods
+        if len(folds) == 0:
+            raise ValueError(
+                "The period from %s to %s is too short for a training window "
+                "of %s sessions followed by a test window." % (
+                    self.start_dt, self.end_dt, self.train_periods
+                )
+            )
+        return folds
+
+    def _window_factory(self, window):
+        """
+        Create the strategy factory of the sessions over a
+        window, warming their signals with the prior closes.
+
+        Parameters
+        ----------
+        window : `slice`
+            The session positions of the window.
+
+        Returns
+        -------
+        `_WindowFactory`
+            The strategy factory of the window.
+        """
+        start_dt = self.opens[window.start]
+        end_dt = self.closes[window.stop - 1].normalize() + pd.Timedelta(
+            hours=23, minutes=59
+        )
+        warmup_dts = self.closes[max(window.start - self.warmup_periods, 0):window.start]
+        return _WindowFactory(self.strategy_factory, start_dt, end_dt, warmup_dts)
+
+    def _choose_run(self, results):
+        """
+        Choose the sweep run with the best objective value, runs with
+        an undefined value (e.g. a Sharpe ratio in the absence of
+        trading) ranking last.
+
+        Parameters
+        ----------
+        results : `pd.DataFrame`
+            The results table of the training sweep.
+
+        Returns
+        -------
+        `int`
+            The chosen run number.
+        """
+        objective = results[self.objective].astype(float)
+        if self.maximise:
+            return objective.fillna(-np.inf).idxmax()
+        return objective.fillna(np.inf).idxmin()
+
+    def run(self):
+        """
+        Carry out the walk-forward optimisation, populating the results
+        of each fold and the stitched out-of-sample equity curve.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The date-indexed out-of-sample equity curve.
+        """
+        self.fold_results = []
+        equity_curves = []
+        capital = None
+        for fold, (train, test) in enumerate(self.folds):
+            train_sweep = ParameterSweep(
+                self._window_factory(train),
+                self.param_grid,
+                data=self.data,
+                max_workers=self.max_workers
+            )
+            train_results = train_sweep.run()
+            best_run = self._choose_run(train_results)
+            params = train_sweep.runs[best_run]
+
+            test_session = self._window_factory(test)(self.data, **params)
+            test_session.run()
+            test_equity = test_session.get_equity_curve()
+            if capital is None:
+                capital = test_session.initial_cash
+            test_equity = test_equity / test_session.initial_cash * capital
+            if len(test_equity) > 0:
+                capital = test_equity["Equity"].iloc[-1]
+            equity_curves.append(test_equity)
+
+            fold_result = {
+                "fold": fold,
+                "train_start": self.opens[train.start],
+                "train_end": self.closes[train.stop - 1],
+                "test_start": self.opens[test.start],
+                "test_end": self.closes[test.stop - 1],
+            }
+            fold_result.update(params)
+            fold_result["train_%s" % self.objective] = (
+                train_results.loc[best_run, self.objective]
+            )
+            fold_result.update({
+                "test_%s" % stat: value
+                for stat, value in calculate_run_statistics(
+                    test_session.get_equity_curve()
+                ).items()
+            })
+            self.fold_results.append(fold_result)
+
+            if settings.PRINT_EVENTS:
+                print(
+                    "Walk-forward fold %d of %d (%s to %s): %s" % (
+                        fold + 1, len(self.folds),
+                        fold_result["test_start"].date(), fold_result["test_end"].date(),
+                        ", ".join("%s=%s" % item for item in params.items())
+                    )
+                )
+
+        self.equity_curve = pd.concat(equity_curves)
+        return self.equity_curve
+
+    def get_fold_results(self):
+        """
+        Returns the windows, chosen parameters, training objective and
+        test statistics of each fold.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The fold-indexed results.
+        """
+        return pd.DataFrame(self.fold_results).set_index("fold")
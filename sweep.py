@@ -0,0 +1,108 @@
+import argparse
+import importlib.util
+import os
+import sys
+
+from qstrader.trading.sweep import ParameterSweep
+
+
+def parse_grid_value(value):
+    """Parses a grid value as an int, then a float, falling back to a string."""
+    for parse in (int, float):
+        try:
+            return parse(value)
+        except ValueError:
+            pass
+    return value
+
+
+def parse_grid(grid_args):
+    """Parses 'name=value1,value2,...' arguments into a parameter grid."""
+    param_grid = {}
+    for grid_arg in grid_args:
+        name, sep, values = grid_arg.partition("=")
+        if not sep or not name or not values:
+            raise ValueError(
+                f"Grid argument '{grid_arg}' is not of the form 'name=value1,value2'"
+            )
+        param_grid[name] = [parse_grid_value(value) for value in values.split(",")]
+    return param_grid
+
+
+def load_strategy_module(script):
+    """
+    Loads a strategy script, either a path to a Python file or the name of a
+    script in the backtests directory, which must define a
+    'create_session(data, **params)' factory and may define 'create_data()'.
+    """
+    script_path = script if script.endswith(".py") else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "backtests", f"{script}.py"
+    )
+    if not os.path.isfile(script_path):
+        raise FileNotFoundError(f"Strategy script {script_path} not found")
+
+    module_name = os.path.splitext(os.path.basename(script_path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    if not hasattr(module, "create_session"):
+        raise AttributeError(
+            f"Strategy script {script_path} does not define 'create_session'"
+        )
+    return module
+
+
+def run_sweep(script, param_grid, max_workers=None, output_path=None):
+    """Runs the parameter sweep of a strategy script and returns the results."""
+    module = load_strategy_module(script)
+    data = module.create_data() if hasattr(module, "create_data") else None
+    sweep = ParameterSweep(
+        module.create_session, param_grid, data=data, max_workers=max_workers
+    )
+    print(f"Running {len(sweep.runs)} backtests of {script}")
+    results = sweep.run(output_path=output_path)
+    print(results.to_string())
+    if output_path is not None:
+        print(f"Results saved to {output_path}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest Parameter Sweep Script")
+    parser.add_argument(
+        "script",
+        type=str,
+        help="Strategy script path, or name of a script in the backtests directory.",
+    )
+    parser.add_argument(
+        "--grid",
+        type=str,
+        action="append",
+        default=[],
+        help="Parameter values to sweep, e.g. mom_top_n=2,3,4 (repeatable).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: number of CPUs).",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="CSV file to which results are streamed as each backtest completes.",
+    )
+
+    args = parser.parse_args()
+    run_sweep(
+        args.script,
+        parse_grid(args.grid),
+        max_workers=args.workers,
+        output_path=args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
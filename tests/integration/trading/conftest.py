@@ -1,8 +1,36 @@
 import os
 
+import numpy as np
+import pandas as pd
 import pytest
 
 
 @pytest.fixture
 def etf_filepath():
     return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+@pytest.fixture
+def utc_csv_dir(tmp_path):
+    """
+    Synthetic daily bar CSV files with UTC dates for four assets.
+    """
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    dates = pd.bdate_range("2019-06-03", "2020-06-30", tz="UTC")
+    for seed, symbol in enumerate(["ABC", "DEF", "GHI", "JKL"]):
+        rng = np.random.default_rng(seed)
+        close = 100.0 * np.cumprod(1.0 + rng.normal(0.0005, 0.01, len(dates)))
+        open_ = close * (1.0 + rng.normal(0.0, 0.005, len(dates)))
+        pd.DataFrame(
+            {
+                "Open": open_,
+                "High": np.maximum(open_, close) * 1.01,
+                "Low": np.minimum(open_, close) * 0.99,
+                "Close": close,
+                "Adj Close": close,
+                "Volume": 1e6,
+            },
+            index=pd.Index(dates, name="Date"),
+        ).to_csv(csv_dir / ("%s.csv" % symbol))
+    return csv_dir
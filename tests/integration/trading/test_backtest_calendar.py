@@ -0,0 +1,41 @@
+import pandas as pd
+import pytz
+
+from qstrader.alpha_model.fixed_signals import FixedSignalsAlphaModel
+from qstrader.asset.equity import Equity
+from qstrader.asset.universe.static import StaticUniverse
+from qstrader.data.backtest_data_handler import BacktestDataHandler
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.exchange.trading_calendar import TradingCalendar
+from qstrader.trading.backtest import BacktestTradingSession
+
+
+def test_buy_and_hold_backtest_starting_on_holiday(utc_csv_dir):
+    """
+    Checks that a buy and hold backtest with a trading calendar,
+    starting upon an exchange holiday, rebalances at the market
+    open of the following session.
+    """
+    start_dt = pd.Timestamp("2019-07-04 14:30:00", tz=pytz.UTC)
+    end_dt = pd.Timestamp("2019-08-30 23:59:00", tz=pytz.UTC)
+    universe = StaticUniverse(["EQ:ABC"])
+    data_source = CSVDailyBarDataSource(str(utc_csv_dir), Equity)
+    backtest = BacktestTradingSession(
+        start_dt,
+        end_dt,
+        universe,
+        FixedSignalsAlphaModel({"EQ:ABC": 1.0}),
+        rebalance="buy_and_hold",
+        long_only=True,
+        cash_buffer_percentage=0.01,
+        data_handler=BacktestDataHandler(universe, data_sources=[data_source]),
+        calendar=TradingCalendar(start_dt, end_dt)
+    )
+    backtest.run()
+
+    assert [alloc["Date"] for alloc in backtest.target_allocations] == [
+        pd.Timestamp("2019-07-05 14:30:00", tz=pytz.UTC)
+    ]
+    alloc_df = backtest.get_target_allocations()
+    assert alloc_df.index[0] == pd.Timestamp("2019-07-05").date()
+    assert (alloc_df["EQ:ABC"] == 1.0).all()
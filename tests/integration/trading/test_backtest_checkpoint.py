@@ -0,0 +1,146 @@
+import os
+import zlib
+
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.alpha_model.top_nm_momentum import TopNMomentumAlphaModel
+from qstrader.asset.equity import Equity
+from qstrader.asset.universe.static import StaticUniverse
+from qstrader.broker.fee_model.percent_fee_model import PercentFeeModel
+from qstrader.broker.fee_model.zero_fee_model import ZeroFeeModel
+from qstrader.data.backtest_data_handler import BacktestDataHandler
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.signals.momentum import MomentumSignal
+from qstrader.signals.signals_collection import SignalsCollection
+from qstrader.trading.backtest import BacktestTradingSession
+
+ASSETS = ["EQ:ABC", "EQ:DEF", "EQ:GHI", "EQ:JKL"]
+START_DT = pd.Timestamp("2019-06-03 14:30:00", tz=pytz.UTC)
+BURN_IN_DT = pd.Timestamp("2019-09-02 14:30:00", tz=pytz.UTC)
+END_DT = pd.Timestamp("2020-06-30 23:59:00", tz=pytz.UTC)
+
+
+def _create_session(
+    data_source, end_dt=END_DT, mom_top_n=2, fee_model=ZeroFeeModel(), **kwargs
+):
+    """
+    Construct a top-N momentum backtest with a 'burn in' period
+    over the shared data source.
+    """
+    universe = StaticUniverse(ASSETS)
+    data_handler = BacktestDataHandler(universe, data_sources=[data_source])
+    momentum = MomentumSignal(START_DT, universe, lookbacks=[20])
+    signals = SignalsCollection({"momentum": momentum}, data_handler)
+    alpha_model = TopNMomentumAlphaModel(signals, 20, mom_top_n, universe, data_handler)
+    return BacktestTradingSession(
+        START_DT,
+        end_dt,
+        universe,
+        alpha_model,
+        signals=signals,
+        rebalance="weekly",
+        rebalance_weekday="WED",
+        long_only=True,
+        cash_buffer_percentage=0.01,
+        fee_model=fee_model,
+        burn_in_dt=BURN_IN_DT,
+        data_handler=data_handler,
+        **kwargs
+    )
+
+
+@pytest.fixture
+def data_source(utc_csv_dir):
+    return CSVDailyBarDataSource(str(utc_csv_dir), Equity)
+
+
+@pytest.mark.parametrize("fast_forward", [False, True])
+def test_resumed_backtest_matches_uninterrupted_backtest(
+    data_source, tmp_path, fast_forward
+):
+    """
+    Checks that a backtest resumed from each of its periodic checkpoints
+    produces the same equity curve, target allocations and final
+    portfolio as the uninterrupted backtest.
+    """
+    checkpoint_dir = str(tmp_path / "checkpoints")
+    backtest = _create_session(
+        data_source, fast_forward=fast_forward,
+        checkpoint_dir=checkpoint_dir, checkpoint_frequency=40
+    )
+    backtest.run()
+    assert len(backtest.checkpoints) == len(os.listdir(checkpoint_dir)) > 3
+
+    for checkpoint_path in backtest.checkpoints[1::2]:
+        resumed = _create_session(data_source, fast_forward=fast_forward)
+        resumed.restore_checkpoint(checkpoint_path)
+        assert len(resumed.equity_curve) < len(backtest.equity_curve)
+        resumed.run()
+
+        pd.testing.assert_frame_equal(
+            resumed.get_equity_curve(), backtest.get_equity_curve()
+        )
+        pd.testing.assert_frame_equal(
+            resumed.get_target_allocations(), backtest.get_target_allocations()
+        )
+        assert resumed.broker.get_portfolio_as_dict("000001") == (
+            backtest.broker.get_portfolio_as_dict("000001")
+        )
+
+
+def test_scenarios_branch_off_warmed_up_state(data_source, tmp_path):
+    """
+    Checks that scenarios restored from the state of a session ending
+    at the 'burn in' date match the same scenarios run in full.
+    """
+    warm_up = _create_session(
+        data_source, end_dt=pd.Timestamp("2019-08-30 23:59:00", tz=pytz.UTC)
+    )
+    warm_up.run()
+    checkpoint_path = str(tmp_path / "warm_up.pkl")
+    warm_up.save_checkpoint(checkpoint_path)
+    assert os.path.getsize(checkpoint_path) < 10000
+
+    scenarios = [
+        {"mom_top_n": 1},
+        {"mom_top_n": 2, "fee_model": PercentFeeModel(commission_pct=0.002)},
+        {"mom_top_n": 3, "fee_model": PercentFeeModel(commission_pct=0.002)},
+    ]
+    for scenario in scenarios:
+        branch = _create_session(data_source, **scenario)
+        branch.restore_checkpoint(checkpoint_path, restore_alpha_model=False)
+        branch.run()
+
+        full = _create_session(data_source, **scenario)
+        full.run()
+        pd.testing.assert_frame_equal(
+            branch.get_equity_curve(), full.get_equity_curve()
+        )
+
+
+def test_checkpoints_omit_portfolio_history(data_source, tmp_path):
+    """
+    Checks that checkpoints do not store the ever-growing portfolio
+    event history, leaving that of the running session intact, and
+    that the history of a restored portfolio begins at the checkpoint.
+    """
+    backtest = _create_session(data_source)
+    backtest.run()
+    portfolio = backtest.broker.portfolios["000001"]
+    num_events = len(portfolio.history)
+    assert num_events > 10
+
+    checkpoint_path = str(tmp_path / "final.pkl")
+    backtest.save_checkpoint(checkpoint_path)
+    assert len(portfolio.history) == num_events
+    with open(checkpoint_path, "rb") as checkpoint_file:
+        assert b"PortfolioEvent" not in zlib.decompress(checkpoint_file.read())
+
+    resumed = _create_session(data_source)
+    resumed.restore_checkpoint(checkpoint_path)
+    assert resumed.broker.portfolios["000001"].history == []
+    assert resumed.broker.get_portfolio_as_dict("000001") == (
+        backtest.broker.get_portfolio_as_dict("000001")
+    )
@@ -0,0 +1,109 @@
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.alpha_model.fixed_signals import FixedSignalsAlphaModel
+from qstrader.asset.equity import Equity
+from qstrader.asset.universe.static import StaticUniverse
+from qstrader.broker.simulated_broker import SimulatedBroker
+from qstrader.data.backtest_data_handler import BacktestDataHandler
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.data.streaming_daily_bar_csv import StreamingCSVDailyBarDataSource
+from qstrader.trading.backtest import BacktestTradingSession
+from qstrader.trading.vectorised import VectorisedBacktest
+
+
+def _run_backtest(
+    csv_dir, fast_forward, panel, burn_in_dt=None, data_source=None,
+    session_cls=BacktestTradingSession
+):
+    assets = ["EQ:ABC", "EQ:DEF"]
+    universe = StaticUniverse(assets)
+    if data_source is None:
+        data_source = CSVDailyBarDataSource(str(csv_dir), Equity, panel=panel)
+    backtest = session_cls(
+        pd.Timestamp("2020-01-01 00:00:00", tz=pytz.UTC),
+        pd.Timestamp("2020-06-30 23:59:00", tz=pytz.UTC),
+        universe,
+        FixedSignalsAlphaModel({"EQ:ABC": 0.6, "EQ:DEF": 0.4}),
+        rebalance="end_of_month",
+        long_only=True,
+        cash_buffer_percentage=0.05,
+        burn_in_dt=burn_in_dt,
+        data_handler=BacktestDataHandler(universe, data_sources=[data_source]),
+        fast_forward=fast_forward
+    )
+    backtest.run()
+    return backtest
+
+
+@pytest.mark.parametrize("panel", [True, False])
+@pytest.mark.parametrize(
+    "burn_in_dt", [None, pd.Timestamp("2020-03-15 00:00:00", tz=pytz.UTC)]
+)
+def test_fast_forward_equity_curve_identical(utc_csv_dir, monkeypatch, panel, burn_in_dt):
+    """
+    Checks that a monthly rebalanced backtest run in fast forward mode
+    produces an identical equity curve and holdings, while updating
+    the broker at far fewer events.
+    """
+    updates = []
+    original_update = SimulatedBroker.update
+
+    def counting_update(self, dt):
+        updates.append(dt)
+        original_update(self, dt)
+
+    monkeypatch.setattr(SimulatedBroker, "update", counting_update)
+
+    backtest = _run_backtest(utc_csv_dir, False, panel, burn_in_dt)
+    num_updates = len(updates)
+    updates.clear()
+    fast_backtest = _run_backtest(utc_csv_dir, True, panel, burn_in_dt)
+
+    assert fast_backtest.equity_curve == backtest.equity_curve
+    pd.testing.assert_frame_equal(
+        fast_backtest.get_target_allocations(), backtest.get_target_allocations()
+    )
+    assert (
+        fast_backtest.broker.portfolios["000001"].portfolio_to_dict() ==
+        backtest.broker.portfolios["000001"].portfolio_to_dict()
+    )
+    assert len(updates) < num_updates / 10
+
+
+@pytest.mark.parametrize("session_cls", [BacktestTradingSession, VectorisedBacktest])
+def test_fast_forward_streaming_data_source(utc_csv_dir, session_cls):
+    """
+    Checks that marking positions across many events at once streams
+    the CSV files forward, such that a streaming data source retaining
+    less history than each skipped span produces the same equity curve
+    as the in-memory data source.
+    """
+    backtest = _run_backtest(utc_csv_dir, False, False)
+    stream_backtest = _run_backtest(
+        utc_csv_dir, True, False,
+        data_source=StreamingCSVDailyBarDataSource(
+            str(utc_csv_dir), Equity,
+            chunk_size=pd.DateOffset(weeks=1), lookback=pd.Timedelta(days=10)
+        ),
+        session_cls=session_cls
+    )
+    assert stream_backtest.equity_curve == backtest.equity_curve
+
+
+@pytest.mark.parametrize("fast_forward", [False, True])
+def test_non_positive_skipped_price_raises(utc_csv_dir, fast_forward):
+    """
+    Checks that a zero price upon a bar between rebalances raises in
+    fast forward mode, as it does when updating event by event, rather
+    than being booked into the equity curve.
+    """
+    csv_path = utc_csv_dir / "ABC.csv"
+    bar_df = pd.read_csv(csv_path, index_col="Date")
+    bar_df.loc["2020-02-12 00:00:00+00:00", ["Open", "Close", "Adj Close"]] = 0.0
+    bar_df.to_csv(csv_path)
+
+    data_source = CSVDailyBarDataSource(str(utc_csv_dir), Equity, adjust_prices=False)
+    with pytest.raises(ValueError, match="must be positive"):
+        _run_backtest(utc_csv_dir, fast_forward, False, data_source=data_source)
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.alpha_model.fixed_signals import FixedSignalsAlphaModel
+from qstrader.asset.equity import Equity
+from qstrader.asset.universe.static import StaticUniverse
+from qstrader.data.backtest_data_handler import BacktestDataHandler
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.trading.backtest import BacktestTradingSession
+from qstrader.trading.sweep import (
+    calculate_run_statistics,
+    parameter_grid,
+    ParameterSweep,
+    SWEEP_STATISTICS,
+)
+
+
+def _create_session(data_source, abc_weight=0.5, rebalance="end_of_month"):
+    """
+    Construct a backtest of a two asset fixed weight strategy
+    over the shared data source.
+    """
+    universe = StaticUniverse(["EQ:ABC", "EQ:DEF"])
+    data_handler = BacktestDataHandler(universe, data_sources=[data_source])
+    alpha_model = FixedSignalsAlphaModel(
+        {"EQ:ABC": abc_weight, "EQ:DEF": 1.0 - abc_weight}
+    )
+    return BacktestTradingSession(
+        pd.Timestamp("2019-09-02 14:30:00", tz=pytz.UTC),
+        pd.Timestamp("2020-06-30 23:59:00", tz=pytz.UTC),
+        universe,
+        alpha_model,
+        rebalance=rebalance,
+        rebalance_weekday="WED",
+        long_only=True,
+        cash_buffer_percentage=0.01,
+        data_handler=data_handler,
+    )
+
+
+def test_parameter_grid():
+    """
+    Checks that the grid is expanded into all parameter
+    combinations, varying the final parameter fastest.
+    """
+    assert parameter_grid({"a": [1, 2], "b": ["x", "y"]}) == [
+        {"a": 1, "b": "x"}, {"a": 1, "b": "y"},
+        {"a": 2, "b": "x"}, {"a": 2, "b": "y"},
+    ]
+    assert parameter_grid({}) == [{}]
+
+
+def test_parallel_sweep_matches_individual_backtests(utc_csv_dir, tmp_path):
+    """
+    Checks that a sweep across worker processes sharing a single data
+    source produces the statistics of each backtest run on its own,
+    streaming every row into the results file.
+    """
+    data_source = CSVDailyBarDataSource(str(utc_csv_dir), Equity)
+    param_grid = {"abc_weight": [0.2, 0.8], "rebalance": ["end_of_month", "weekly"]}
+    output_path = str(tmp_path / "results.csv")
+    results = ParameterSweep(
+        _create_session, param_grid, data=data_source, max_workers=2
+    ).run(output_path=output_path)
+
+    assert list(results.index) == [0, 1, 2, 3]
+    assert list(results.columns) == list(param_grid) + SWEEP_STATISTICS
+    assert results["abc_weight"].tolist() == [0.2, 0.2, 0.8, 0.8]
+
+    for run_id, params in enumerate(parameter_grid(param_grid)):
+        backtest = _create_session(data_source, **params)
+        backtest.run()
+        expected = calculate_run_statistics(backtest.get_equity_curve())
+        for stat in SWEEP_STATISTICS:
+            assert results.loc[run_id, stat] == pytest.approx(expected[stat])
+
+    streamed = pd.read_csv(output_path).set_index("run").sort_index()
+    np.testing.assert_allclose(
+        streamed[SWEEP_STATISTICS].to_numpy(dtype=float),
+        results[SWEEP_STATISTICS].to_numpy(dtype=float)
+    )
+
+    serial_results = ParameterSweep(
+        _create_session, param_grid, data=data_source, max_workers=1
+    ).run()
+    pd.testing.assert_frame_equal(serial_results, results)
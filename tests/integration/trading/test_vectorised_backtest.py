@@ -0,0 +1,148 @@
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.alpha_model.fixed_signals import FixedSignalsAlphaModel
+from qstrader.alpha_model.top_nm_momentum import TopNMomentumAlphaModel
+from qstrader.asset.equity import Equity
+from qstrader.asset.universe.static import StaticUniverse
+from qstrader.broker.fee_model.percent_fee_model import PercentFeeModel
+from qstrader.data.backtest_data_handler import BacktestDataHandler
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.portcon.order_sizer.order_sizer import OrderSizer
+from qstrader.signals.momentum import MomentumSignal
+from qstrader.signals.signals_collection import SignalsCollection
+from qstrader.system.qts import QuantTradingSystem
+from qstrader.trading.backtest import BacktestTradingSession
+from qstrader.trading.vectorised import VectorisedBacktest
+
+ASSETS = ["EQ:ABC", "EQ:DEF", "EQ:GHI", "EQ:JKL"]
+
+
+def _fixed_weights(weights):
+    def create_strategy(universe, data_handler):
+        return FixedSignalsAlphaModel(weights), None
+    return create_strategy
+
+
+def _top_n_momentum(universe, data_handler):
+    momentum = MomentumSignal(
+        pd.Timestamp("2019-06-03 14:30:00", tz=pytz.UTC), universe, lookbacks=[20]
+    )
+    signals = SignalsCollection({"momentum": momentum}, data_handler)
+    return TopNMomentumAlphaModel(signals, 20, 2, universe, data_handler), signals
+
+
+def _run_backtest(session_cls, csv_dir, create_strategy, **kwargs):
+    """
+    Run a backtest of the provided strategy over the synthetic data
+    with its own data source, data handler and alpha model.
+    """
+    universe = StaticUniverse(ASSETS)
+    data_handler = BacktestDataHandler(
+        universe, data_sources=[CSVDailyBarDataSource(str(csv_dir), Equity)]
+    )
+    alpha_model, signals = create_strategy(universe, data_handler)
+    backtest = session_cls(
+        pd.Timestamp("2019-09-02 14:30:00", tz=pytz.UTC),
+        pd.Timestamp("2020-06-30 23:59:00", tz=pytz.UTC),
+        universe,
+        alpha_model,
+        signals=signals,
+        data_handler=data_handler,
+        **kwargs
+    )
+    backtest.run()
+    return backtest
+
+
+@pytest.mark.parametrize(
+    "create_strategy,kwargs",
+    [
+        (
+            _fixed_weights({"EQ:ABC": 0.6, "EQ:DEF": 0.4}),
+            {"rebalance": "end_of_month", "long_only": True, "cash_buffer_percentage": 0.05}
+        ),
+        (
+            _fixed_weights({"EQ:ABC": 0.6, "EQ:DEF": 0.4}),
+            {
+                "rebalance": "weekly", "rebalance_weekday": "WED", "long_only": True,
+                "cash_buffer_percentage": 0.01,
+                "fee_model": PercentFeeModel(commission_pct=0.002, tax_pct=0.005),
+                "burn_in_dt": pd.Timestamp("2019-12-02 14:30:00", tz=pytz.UTC)
+            }
+        ),
+        (
+            _fixed_weights({"EQ:ABC": 1.0, "EQ:GHI": -0.7, "EQ:JKL": 0.5}),
+            {"rebalance": "daily", "gross_leverage": 2.0}
+        ),
+        (
+            _fixed_weights({"EQ:JKL": 1.0}),
+            {"rebalance": "buy_and_hold", "long_only": True, "cash_buffer_percentage": 0.01}
+        ),
+        (
+            _top_n_momentum,
+            {
+                "rebalance": "end_of_month", "long_only": True,
+                "cash_buffer_percentage": 0.01,
+                "burn_in_dt": pd.Timestamp("2019-10-01 14:30:00", tz=pytz.UTC)
+            }
+        ),
+    ]
+)
+def test_vectorised_backtest_parity(utc_csv_dir, create_strategy, kwargs):
+    """
+    Checks that the vectorised backtest produces an identical equity
+    curve, target allocations and final holdings to those of the
+    event-driven backtest.
+    """
+    backtest = _run_backtest(BacktestTradingSession, utc_csv_dir, create_strategy, **kwargs)
+    vectorised = _run_backtest(VectorisedBacktest, utc_csv_dir, create_strategy, **kwargs)
+
+    pd.testing.assert_frame_equal(
+        vectorised.get_equity_curve(), backtest.get_equity_curve()
+    )
+    pd.testing.assert_frame_equal(
+        vectorised.get_target_allocations(), backtest.get_target_allocations()
+    )
+    assert len(vectorised.target_allocations) > 0
+
+    final_holdings = vectorised.holdings.iloc[-1]
+    portfolio = backtest.broker.portfolios["000001"].portfolio_to_dict()
+    assert final_holdings[final_holdings != 0].to_dict() == {
+        asset: position["quantity"] for asset, position in portfolio.items()
+    }
+    assert vectorised.holdings.index.equals(
+        pd.DatetimeIndex([dt for dt, equity in backtest.equity_curve])
+    )
+
+
+class _ScaledOrderSizer(OrderSizer):
+    """
+    An order sizer which sizes orders from the broker portfolio
+    equity alone, without a vectorised sizing method.
+    """
+
+    def __call__(self, dt, weights):
+        return {
+            asset: {"quantity": int(weight * 100)}
+            for asset, weight in weights.items()
+        }
+
+
+def test_vectorised_backtest_rejects_unsupported_order_sizer(utc_csv_dir, monkeypatch):
+    """
+    Checks that the vectorised backtest raises for an order sizer unable
+    to size target quantities from a provided total equity, rather than
+    sizing it as another order sizer.
+    """
+    monkeypatch.setattr(
+        QuantTradingSystem, "_create_order_sizer",
+        lambda self, **kwargs: _ScaledOrderSizer()
+    )
+    with pytest.raises(ValueError):
+        _run_backtest(
+            VectorisedBacktest, utc_csv_dir,
+            _fixed_weights({"EQ:ABC": 0.6, "EQ:DEF": 0.4}),
+            rebalance="end_of_month", long_only=True, cash_buffer_percentage=0.05
+        )
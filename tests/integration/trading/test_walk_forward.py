@@ -0,0 +1,161 @@
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.alpha_model.top_nm_momentum import TopNMomentumAlphaModel
+from qstrader.asset.equity import Equity
+from qstrader.asset.universe.static import StaticUniverse
+from qstrader.data.backtest_data_handler import BacktestDataHandler
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.exchange.trading_calendar import TradingCalendar
+from qstrader.signals.momentum import MomentumSignal
+from qstrader.signals.signals_collection import SignalsCollection
+from qstrader.trading.backtest import BacktestTradingSession
+from qstrader.trading.sweep import ParameterSweep
+from qstrader.trading.walk_forward import WalkForwardOptimiser
+
+ASSETS = ["EQ:ABC", "EQ:DEF", "EQ:GHI", "EQ:JKL"]
+
+
+def _create_session(
+    data_source, start_dt, end_dt, mom_lookback=20, mom_top_n=2, burn_in_dt=None
+):
+    """
+    Construct a weekly rebalanced top-N momentum backtest
+    over the shared data source.
+    """
+    universe = StaticUniverse(ASSETS)
+    data_handler = BacktestDataHandler(universe, data_sources=[data_source])
+    momentum = MomentumSignal(start_dt, universe, lookbacks=[mom_lookback])
+    signals = SignalsCollection({"momentum": momentum}, data_handler)
+    alpha_model = TopNMomentumAlphaModel(
+        signals, mom_lookback, mom_top_n, universe, data_handler
+    )
+    return BacktestTradingSession(
+        start_dt,
+        end_dt,
+        universe,
+        alpha_model,
+        signals=signals,
+        rebalance="weekly",
+        rebalance_weekday="WED",
+        long_only=True,
+        cash_buffer_percentage=0.01,
+        burn_in_dt=burn_in_dt,
+        data_handler=data_handler,
+    )
+
+
+@pytest.fixture
+def data_source(utc_csv_dir):
+    return CSVDailyBarDataSource(str(utc_csv_dir), Equity)
+
+
+def test_warmed_window_matches_burnt_in_session(data_source):
+    """
+    Checks that a window session with warmed signals produces the same
+    equity curve as a session begun earlier and burnt in until the
+    start of the window, without simulating the preceding history.
+    """
+    optimiser = WalkForwardOptimiser(
+        _create_session, {"mom_top_n": [1, 2]},
+        pd.Timestamp("2019-09-02 14:30:00", tz=pytz.UTC),
+        pd.Timestamp("2020-06-30 23:59:00", tz=pytz.UTC),
+        train_periods=60, test_periods=40, data=data_source, warmup_periods=25
+    )
+    train, test = optimiser.folds[1]
+    window_session = optimiser._window_factory(test)(data_source, mom_top_n=2)
+    window_session.run()
+
+    burnt_in_session = _create_session(
+        data_source,
+        optimiser.opens[test.start - 25],
+        window_session.end_dt,
+        burn_in_dt=optimiser.opens[test.start]
+    )
+    burnt_in_session.run()
+
+    assert len(window_session.get_target_allocations()) > 0
+    pd.testing.assert_frame_equal(
+        window_session.get_equity_curve(), burnt_in_session.get_equity_curve()
+    )
+
+
+@pytest.mark.parametrize("anchored", [False, True])
+def test_walk_forward_stitches_test_windows(data_source, anchored):
+    """
+    Checks that each fold chooses the best parameters of its training
+    sweep and that the test window equity curves are stitched into a
+    single contiguous out-of-sample equity curve.
+    """
+    param_grid = {"mom_lookback": [10, 20], "mom_top_n": [1, 2]}
+    optimiser = WalkForwardOptimiser(
+        _create_session, param_grid,
+        pd.Timestamp("2019-09-02 14:30:00", tz=pytz.UTC),
+        pd.Timestamp("2020-06-30 23:59:00", tz=pytz.UTC),
+        train_periods=60, test_periods=50, data=data_source,
+        warmup_periods=21, anchored=anchored, max_workers=2
+    )
+    equity_df = optimiser.run()
+    fold_results = optimiser.get_fold_results()
+
+    assert len(fold_results) == len(optimiser.folds) == 4
+    train_starts = fold_results["train_start"]
+    assert (train_starts == train_starts.iloc[0]).all() == anchored
+    assert (
+        fold_results["test_start"].iloc[1:].dt.date.to_numpy() >
+        fold_results["test_end"].iloc[:-1].dt.date.to_numpy()
+    ).all()
+
+    # The equity curve covers every test session once
+    test_dates = pd.DatetimeIndex(
+        optimiser.closes[optimiser.folds[0][1].start:]
+    ).date
+    assert list(equity_df.index) == list(test_dates)
+
+    for fold, (train, test) in enumerate(optimiser.folds):
+        train_results = ParameterSweep(
+            optimiser._window_factory(train), param_grid,
+            data=data_source, max_workers=1
+        ).run()
+        best_run = train_results["sharpe"].idxmax()
+        for name in param_grid:
+            assert fold_results.loc[fold, name] == train_results.loc[best_run, name]
+
+    # The first test window is unscaled and the returns of later
+    # windows are compounded onto the equity of the prior window
+    first_test = optimiser._window_factory(optimiser.folds[0][1])(
+        data_source, **{name: int(fold_results.loc[0, name]) for name in param_grid}
+    )
+    first_test.run()
+    first_equity = first_test.get_equity_curve()
+    pd.testing.assert_frame_equal(equity_df.iloc[:len(first_equity)], first_equity)
+    assert equity_df["Equity"].iloc[-1] / first_test.initial_cash == pytest.approx(
+        (1.0 + fold_results["test_total_return"]).prod()
+    )
+
+
+def test_calendar_sessions_bounded_to_warmup_window(data_source):
+    """
+    Checks that the sessions of a trading calendar are obtained from
+    'warmup_periods' sessions prior to the starting date onwards,
+    rather than from the start of the calendar.
+    """
+    calendar = TradingCalendar(
+        pd.Timestamp("2015-01-01", tz=pytz.UTC), pd.Timestamp("2020-12-31", tz=pytz.UTC)
+    )
+    start_dt = pd.Timestamp("2019-09-03 14:30:00", tz=pytz.UTC)
+    end_dt = pd.Timestamp("2020-06-30 23:59:00", tz=pytz.UTC)
+    optimiser = WalkForwardOptimiser(
+        _create_session, {"mom_top_n": [1, 2]}, start_dt, end_dt,
+        train_periods=60, test_periods=40, data=data_source,
+        warmup_periods=25, calendar=calendar
+    )
+    assert optimiser.first_session == 25
+    assert optimiser.opens[25] == start_dt
+    assert list(optimiser.opens) == list(
+        calendar.session_opens(optimiser.opens[0], end_dt)
+    )
+    assert list(optimiser.opens[:25].normalize()) == list(
+        calendar.sessions_before(start_dt, 25)
+    )
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _write_bar_csv(csv_dir, symbol, start, periods, seed):
+    """
+    Write a synthetic YahooFinance-style daily bar CSV file.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=periods, tz="UTC")
+    close = 100.0 * np.cumprod(1.0 + rng.normal(0.0, 0.01, periods))
+    open_ = close * (1.0 + rng.normal(0.0, 0.005, periods))
+    high = np.maximum(open_, close) * 1.01
+    low = np.minimum(open_, close) * 0.99
+    bar_df = pd.DataFrame(
+        {
+            "Open": open_,
+            "High": high,
+            "Low": low,
+            "Close": close,
+            "Adj Close": close * 0.95,
+            "Volume": rng.integers(1e5, 1e6, periods),
+        },
+        index=pd.Index(dates, name="Date"),
+    )
+    bar_df.to_csv(csv_dir / ("%s.csv" % symbol))
+
+
+@pytest.fixture
+def bar_csv_dir(tmp_path):
+    """
+    A temporary directory containing three daily bar CSV files
+    with partially overlapping date ranges.
+    """
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    _write_bar_csv(csv_dir, "ABC", "2020-01-01", 60, 42)
+    _write_bar_csv(csv_dir, "DEF", "2020-01-15", 50, 43)
+    _write_bar_csv(csv_dir, "GHI", "2020-02-03", 30, 44)
+    return csv_dir
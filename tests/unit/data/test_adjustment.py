@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from qstrader.data.adjustment import (
+    add_adjusted_columns,
+    adjust_csv_file,
+    adjusted_view,
+    raw_view,
+    ADJ_FACTOR_COLUMN,
+)
+from qstrader.data.daily_bar_csv import BAR_FIELDS, CSVDailyBarDataSource
+from qstrader.data.ingestion import CSVFileDataProvider, DataIngester
+
+
+def test_adjusted_and_raw_views_round_trip():
+    """
+    Checks that adjusted prices are scaled by the adjustment factor,
+    volume inversely, and that the raw view reverses the adjustment.
+    """
+    # A 2:1 split between the second and third bars
+    bar_df = pd.DataFrame(
+        {
+            "Open": [100.0, 102.0, 51.0],
+            "High": [104.0, 106.0, 52.0],
+            "Low": [98.0, 100.0, 50.0],
+            "Close": [102.0, 104.0, 51.5],
+            "Adj Close": [51.0, 52.0, 51.5],
+            "Volume": [1000.0, 2000.0, 4000.0],
+        },
+        index=pd.bdate_range("2020-01-01", periods=3),
+    )
+    adjusted_df = adjusted_view(bar_df)
+    assert adjusted_df["Open"].tolist() == [50.0, 51.0, 51.0]
+    assert adjusted_df["Close"].tolist() == bar_df["Adj Close"].tolist()
+    assert adjusted_df["Volume"].tolist() == [2000.0, 4000.0, 4000.0]
+
+    stored_df = add_adjusted_columns(bar_df)
+    assert stored_df[ADJ_FACTOR_COLUMN].tolist() == [0.5, 0.5, 1.0]
+    assert stored_df["Adj High"].tolist() == [52.0, 53.0, 52.0]
+    pd.testing.assert_frame_equal(adjusted_view(stored_df), adjusted_df)
+    pd.testing.assert_frame_equal(
+        raw_view(adjusted_df, stored_df[ADJ_FACTOR_COLUMN]),
+        bar_df.drop(columns=["Adj Close"])
+    )
+
+    # Re-running the stage upon adjusted bars is idempotent
+    pd.testing.assert_frame_equal(add_adjusted_columns(stored_df), stored_df)
+
+
+@pytest.mark.parametrize("adjust_prices", [True, False])
+def test_adjusted_csv_files_match_raw_prices(bar_csv_dir, tmp_path, adjust_prices):
+    """
+    Checks that a data source over CSV files with persisted adjustment
+    factors provides the same prices as one over the raw CSV files.
+    """
+    adjusted_dir = tmp_path / "adjusted"
+    ingester = DataIngester(
+        CSVFileDataProvider(str(bar_csv_dir)), str(adjusted_dir), adjust=True
+    )
+    tickers = ["ABC", "DEF", "GHI"]
+    start_date = pd.Timestamp("2020-01-01")
+    ingester.ingest([(t, start_date, pd.Timestamp("2020-02-15")) for t in tickers])
+    assert ingester.ingest(
+        [(t, start_date, pd.Timestamp("2020-06-01")) for t in tickers]
+    ) == {t: "appended" for t in tickers}
+
+    # The adjustment stage may equally be run upon existing files
+    for ticker in tickers:
+        adjust_csv_file(str(adjusted_dir / ("%s.csv" % ticker)))
+
+    raw_ds = CSVDailyBarDataSource(
+        str(bar_csv_dir), "Equity", adjust_prices=adjust_prices
+    )
+    adjusted_ds = CSVDailyBarDataSource(
+        str(adjusted_dir), "Equity", adjust_prices=adjust_prices
+    )
+    for asset in raw_ds.asset_bar_frames:
+        assert ADJ_FACTOR_COLUMN in adjusted_ds.asset_bar_frames[asset].columns
+        assert "Adj Close" not in adjusted_ds.asset_bar_frames[asset].columns
+        pd.testing.assert_frame_equal(
+            adjusted_ds.asset_bid_ask_frames[asset],
+            raw_ds.asset_bid_ask_frames[asset]
+        )
+        np.testing.assert_allclose(
+            adjusted_ds.get_asset_bars(asset, adjusted=True)[BAR_FIELDS].to_numpy(),
+            raw_ds.get_asset_bars(asset)[BAR_FIELDS].to_numpy() * 0.95
+        )
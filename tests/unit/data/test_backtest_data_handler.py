@@ -0,0 +1,176 @@
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.asset.equity import Equity
+from qstrader.data.backtest_data_handler import (
+    BacktestDataHandler,
+    get_assets_latest_prices,
+)
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+
+
+class PointOnlyDataSourceMock(object):
+    """
+    A data source exposing only single asset lookups.
+    """
+
+    def get_bid(self, dt, asset):
+        if asset != 'EQ:XYZ':
+            raise KeyError(asset)
+        return 12.5
+
+    def get_ask(self, dt, asset):
+        return self.get_bid(dt, asset)
+
+
+class BatchDataSourceMock(PointOnlyDataSourceMock):
+    """
+    A data source without coverage information whose batch lookups
+    raise if any of the assets are unavailable.
+    """
+
+    def get_assets_bid(self, dt, assets):
+        return np.array([self.get_bid(dt, asset) for asset in assets])
+
+    def get_assets_ask(self, dt, assets):
+        return np.array([self.get_ask(dt, asset) for asset in assets])
+
+
+class SingleAssetDataHandlerMock(object):
+    """
+    A data handler exposing only single asset price lookups.
+    """
+
+    def get_asset_latest_mid_price(self, dt, asset):
+        return {'EQ:ABC': 10.0, 'EQ:DEF': 20.0}[asset]
+
+
+@pytest.mark.parametrize("panel", [False, True])
+def test_batched_prices_match_single_asset_prices(bar_csv_dir, panel):
+    """
+    Checks that the batched price methods return prices aligned to
+    the input asset order, identical to the single asset methods,
+    falling back across data sources for assets a source lacks.
+    """
+    ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity, panel=panel)
+    data_handler = BacktestDataHandler(
+        Mock(), data_sources=[ds, PointOnlyDataSourceMock()]
+    )
+
+    dt = pd.Timestamp('2020-02-20 14:30:00', tz=pytz.UTC)
+    assets = ['EQ:GHI', 'EQ:XYZ', 'EQ:ABC', 'EQ:NOPE', 'EQ:DEF']
+    batch_methods = [
+        ('get_assets_latest_bid_prices', 'get_asset_latest_bid_price'),
+        ('get_assets_latest_ask_prices', 'get_asset_latest_ask_price'),
+        ('get_assets_latest_mid_prices', 'get_asset_latest_mid_price'),
+        ('get_assets_latest_open_prices', 'get_asset_latest_open_price'),
+        ('get_assets_latest_high_prices', 'get_asset_latest_high_price'),
+        ('get_assets_latest_low_prices', 'get_asset_latest_low_price'),
+    ]
+    for batch_method, point_method in batch_methods:
+        prices = getattr(data_handler, batch_method)(dt, assets)
+        expected = [getattr(data_handler, point_method)(dt, asset) for asset in assets]
+        np.testing.assert_array_equal(prices, np.array(expected))
+
+    bids = data_handler.get_assets_latest_bid_prices(dt, assets)
+    assert bids[1] == 12.5
+    assert np.isnan(bids[3])
+
+    # Liquidity is unavailable from sources lacking volumes
+    volumes = data_handler.get_assets_latest_volume(dt, assets)
+    np.testing.assert_array_equal(
+        volumes, [ds.get_volume(dt, 'EQ:GHI'), np.nan, ds.get_volume(dt, 'EQ:ABC'),
+                  np.nan, ds.get_volume(dt, 'EQ:DEF')]
+    )
+    assert data_handler.get_asset_latest_volume(dt, 'EQ:ABC') == volumes[2]
+
+
+def test_requests_routed_to_covering_data_source(bar_csv_dir, tmp_path):
+    """
+    Checks that requests are routed to the highest priority data
+    source covering the request timestamp, falling back to lower
+    priority sources outside of its coverage, and that sources
+    lacking an asset are never queried for it.
+    """
+    partial_dir = tmp_path / "partial"
+    partial_dir.mkdir()
+    abc_df = pd.read_csv(bar_csv_dir / "ABC.csv", index_col="Date")
+    (abc_df.iloc[10:30] * 2.0).to_csv(partial_dir / "ABC.csv")
+
+    partial_ds = CSVDailyBarDataSource(str(partial_dir), Equity)
+    full_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity)
+    partial_ds.get_bid = Mock(wraps=partial_ds.get_bid)
+    data_handler = BacktestDataHandler(
+        Mock(), data_sources=[partial_ds, full_ds]
+    )
+
+    inside_dt = pd.Timestamp('2020-01-27 21:00:00', tz=pytz.UTC)
+    before_dt = pd.Timestamp('2020-01-06 21:00:00', tz=pytz.UTC)
+    after_dt = pd.Timestamp('2020-03-20 21:00:00', tz=pytz.UTC)
+
+    assert data_handler.get_asset_latest_bid_price(
+        inside_dt, 'EQ:ABC'
+    ) == partial_ds.get_bid(inside_dt, 'EQ:ABC')
+    assert data_handler.get_asset_latest_bid_price(
+        before_dt, 'EQ:ABC'
+    ) == full_ds.get_bid(before_dt, 'EQ:ABC')
+    assert data_handler.get_asset_latest_bid_price(
+        after_dt, 'EQ:ABC'
+    ) == full_ds.get_bid(after_dt, 'EQ:ABC')
+
+    partial_ds.get_bid.reset_mock()
+    data_handler.get_asset_latest_bid_price(inside_dt, 'EQ:DEF')
+    data_handler.get_asset_latest_bid_price(before_dt, 'EQ:ABC')
+    partial_ds.get_bid.assert_not_called()
+
+    bids = data_handler.get_assets_latest_bid_prices(
+        inside_dt, ['EQ:DEF', 'EQ:ABC']
+    )
+    np.testing.assert_array_equal(
+        bids,
+        [
+            full_ds.get_bid(inside_dt, 'EQ:DEF'),
+            partial_ds.get_bid(inside_dt, 'EQ:ABC'),
+        ]
+    )
+
+
+def test_failed_batch_lookups_of_guarded_sources_fall_back(bar_csv_dir):
+    """
+    Checks that a failed batch lookup from a data source without coverage
+    information is treated, asset by asset, as missing prices rather
+    than raising, with the other data sources still providing prices.
+    """
+    ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity)
+    data_handler = BacktestDataHandler(
+        Mock(), data_sources=[ds, BatchDataSourceMock()]
+    )
+    dt = pd.Timestamp('2020-02-20 14:30:00', tz=pytz.UTC)
+    assets = ['EQ:XYZ', 'EQ:ABC', 'EQ:NOPE']
+
+    bids = data_handler.get_assets_latest_bid_prices(dt, assets)
+    assert bids[0] == 12.5
+    assert bids[1] == data_handler.get_asset_latest_bid_price(dt, 'EQ:ABC')
+    assert np.isnan(bids[2])
+    np.testing.assert_array_equal(
+        data_handler.get_assets_latest_ask_prices(dt, assets),
+        [data_handler.get_asset_latest_ask_price(dt, asset) for asset in assets]
+    )
+
+
+def test_latest_prices_fall_back_to_single_asset_lookups():
+    """
+    Checks that the latest prices of many assets are obtained from data
+    handlers lacking the batch methods via their single asset methods.
+    """
+    dt = pd.Timestamp('2020-02-20 14:30:00', tz=pytz.UTC)
+    np.testing.assert_array_equal(
+        get_assets_latest_prices(
+            SingleAssetDataHandlerMock(), dt, ['EQ:DEF', 'EQ:ABC'], 'mid'
+        ),
+        np.array([20.0, 10.0])
+    )
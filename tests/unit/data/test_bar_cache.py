@@ -0,0 +1,59 @@
+import os
+
+import pandas as pd
+
+from qstrader.asset.equity import Equity
+from qstrader.data.bar_cache import BarCache
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+
+
+def test_warm_start_skips_csv_parsing(bar_csv_dir, tmp_path, monkeypatch):
+    """
+    Checks that a second data source instantiation is served entirely
+    from the binary cache and produces identical DataFrames.
+    """
+    cache_dir = str(tmp_path / "cache")
+    cold_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 3
+
+    def fail_read_csv(*args, **kwargs):
+        raise AssertionError("CSV should not be parsed on a warm start")
+
+    monkeypatch.setattr(pd, "read_csv", fail_read_csv)
+    warm_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity, cache_dir=cache_dir)
+
+    for asset in cold_ds.asset_bar_frames.keys():
+        pd.testing.assert_frame_equal(
+            cold_ds.asset_bar_frames[asset], warm_ds.asset_bar_frames[asset]
+        )
+        pd.testing.assert_frame_equal(
+            cold_ds.asset_bid_ask_frames[asset], warm_ds.asset_bid_ask_frames[asset]
+        )
+
+
+def test_cache_invalidated_by_modification_and_adjustment(bar_csv_dir, tmp_path):
+    """
+    Checks that cache entries are keyed by the adjustment flag and
+    become stale once the underlying CSV file is modified.
+    """
+    cache = BarCache(str(tmp_path / "cache"))
+    csv_path = str(bar_csv_dir / "ABC.csv")
+    ds = CSVDailyBarDataSource(
+        str(bar_csv_dir), Equity, csv_symbols=["ABC"], cache_dir=cache.cache_dir
+    )
+
+    assert cache.load(csv_path, True) is not None
+    assert cache.load(csv_path, False) is None
+
+    with open(csv_path, "a") as csv_file:
+        csv_file.write(
+            "2020-12-31 00:00:00+00:00,1.0,1.0,1.0,1.0,1.0,100\n"
+        )
+    assert cache.load(csv_path, True) is None
+
+    # Reloading re-parses the modified file and refreshes the entry
+    ds = CSVDailyBarDataSource(
+        str(bar_csv_dir), Equity, csv_symbols=["ABC"], cache_dir=cache.cache_dir
+    )
+    bar_df, _ = cache.load(csv_path, True)
+    assert len(bar_df) == len(ds.asset_bar_frames["EQ:ABC"]) == 61
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytz
+
+from qstrader.asset.equity import Equity
+from qstrader.data.cursor import ForwardCursor
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+
+
+def test_forward_cursor_matches_binary_search():
+    """
+    Checks that the cursor locates the same rows as a binary search
+    for forward steps, large forward jumps and backwards moves.
+    """
+    timestamps = np.arange(0, 1000, 10, dtype=np.int64)
+    cursor = ForwardCursor(timestamps)
+
+    queries = [-5, 0, 3, 10, 11, 25, 25, 26, 800, 805, 50, 999, 2000, 1]
+    for ts in queries:
+        expected = np.searchsorted(timestamps, ts, side='right') - 1
+        assert cursor.locate(ts) == expected
+        assert cursor.position == expected
+
+
+def test_cursor_mode_matches_frame_lookups(bar_csv_dir):
+    """
+    Checks that forward cursor lookups, both on per-asset DataFrames
+    and on price panels, match the default lookups in a simulation
+    ordered sweep of timestamps.
+    """
+    default_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity)
+    cursor_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity, cursor=True)
+    panel_ds = CSVDailyBarDataSource(
+        str(bar_csv_dir), Equity, panel=True, cursor=True
+    )
+    assert panel_ds.bid_ask_panel.cursor is not None
+
+    days = pd.bdate_range('2020-02-03', '2020-03-31')
+    for day in days:
+        for time in ['14:30', '21:00']:
+            dt = pd.Timestamp('%s %s' % (day.date(), time), tz=pytz.UTC)
+            for asset in ['EQ:ABC', 'EQ:DEF', 'EQ:GHI']:
+                expected_bid = default_ds.get_bid(dt, asset)
+                expected_open = default_ds.get_open(dt, asset)
+                assert cursor_ds.get_bid(dt, asset) == expected_bid
+                assert cursor_ds.get_open(dt, asset) == expected_open
+                assert panel_ds.get_bid(dt, asset) == expected_bid
+                assert panel_ds.get_open(dt, asset) == expected_open
+
+    # Prior to the first bar of an asset no price is available
+    early_dt = pd.Timestamp('2020-01-02 14:30', tz=pytz.UTC)
+    assert np.isnan(cursor_ds.get_bid(early_dt, 'EQ:GHI'))
+    assert np.isnan(panel_ds.get_ask(early_dt, 'EQ:GHI'))
@@ -0,0 +1,240 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.asset.equity import Equity
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+
+
+def reference_bid_ask_conversion(bar_df, adjust_prices):
+    """
+    The original transpose/unstack based bar to bid/ask conversion,
+    retained here to validate the vectorised implementation against.
+    """
+    bar_df = bar_df.sort_index()
+
+    if adjust_prices:
+        bar_df["Adj Open"] = (bar_df["Adj Close"] / bar_df["Close"]) * bar_df["Open"]
+        bar_df["Adj High"] = (bar_df["Adj Close"] / bar_df["Close"]) * bar_df["High"]
+        bar_df["Adj Low"] = (bar_df["Adj Close"] / bar_df["Close"]) * bar_df["Low"]
+        bar_df = bar_df[["Adj Open", "Adj High", "Adj Low", "Adj Close"]]
+        bar_df.columns = ["Open", "High", "Low", "Close"]
+    else:
+        bar_df = bar_df[["Open", "High", "Low", "Close"]]
+
+    seq_df = bar_df.T.unstack(level=0).reset_index()
+    seq_df.columns = ["Date", "Market", "Price"]
+    seq_df.loc[seq_df["Market"] == "Open", "Date"] += pd.Timedelta(hours=14, minutes=30)
+    seq_df.loc[seq_df["Market"] == "High", "Date"] += pd.Timedelta(hours=17)
+    seq_df.loc[seq_df["Market"] == "Low", "Date"] += pd.Timedelta(hours=19)
+    seq_df.loc[seq_df["Market"] == "Close", "Date"] += pd.Timedelta(hours=21)
+
+    dp_df = seq_df[["Date", "Price"]].copy()
+    dp_df["Bid"] = dp_df["Price"]
+    dp_df["Ask"] = dp_df["Price"]
+    return dp_df.loc[:, ["Date", "Bid", "Ask"]].ffill().set_index("Date").sort_index()
+
+
+def reference_historical_closes(ds, start_dt, end_dt, assets):
+    """
+    The original concatenation based historical closes range,
+    retained here to validate the close panel implementation against.
+    """
+    close_series = []
+    for asset in assets:
+        if asset in ds.asset_bar_frames.keys():
+            asset_close_prices = ds.asset_bar_frames[asset][["Close"]]
+            asset_close_prices.columns = [asset]
+            close_series.append(asset_close_prices)
+
+    prices_df = pd.concat(close_series, axis=1).dropna(how="all")
+    prices_df = prices_df.loc[start_dt:end_dt]
+    return prices_df
+
+
+@pytest.mark.parametrize("adjust_prices", [True, False])
+def test_bid_ask_conversion_matches_reference(bar_csv_dir, adjust_prices):
+    """
+    Checks that the vectorised bar to bid/ask conversion produces
+    output identical to the original implementation, including
+    forward-filling of missing prices.
+    """
+    ds = CSVDailyBarDataSource(
+        str(bar_csv_dir), Equity, adjust_prices=adjust_prices, csv_symbols=["ABC"]
+    )
+    bar_df = ds.asset_bar_frames["EQ:ABC"].copy()
+    bar_df.iloc[3, bar_df.columns.get_loc("High")] = np.nan
+    bar_df.iloc[10, bar_df.columns.get_loc("Close")] = np.nan
+    bar_df = bar_df.iloc[::-1]
+
+    pd.testing.assert_frame_equal(
+        ds._convert_bar_frame_into_bid_ask_df(bar_df),
+        reference_bid_ask_conversion(bar_df, adjust_prices)
+    )
+
+
+def test_bid_ask_timestamps(bar_csv_dir):
+    """
+    Checks that each daily bar is expanded into four intraday
+    timestamps with the bid and ask at the open and close.
+    """
+    ds = CSVDailyBarDataSource(
+        str(bar_csv_dir), Equity, adjust_prices=False, csv_symbols=["ABC"]
+    )
+    bid_ask_df = ds.asset_bid_ask_frames["EQ:ABC"]
+    bar_df = ds.asset_bar_frames["EQ:ABC"]
+    assert len(bid_ask_df) == 4 * len(bar_df)
+
+    day = bar_df.index[0]
+    assert bid_ask_df.index[0] == day + pd.Timedelta(hours=14, minutes=30)
+    assert bid_ask_df.index[3] == day + pd.Timedelta(hours=21)
+    assert bid_ask_df.index.tz == pytz.UTC
+    assert bid_ask_df["Bid"].iloc[0] == bar_df["Open"].iloc[0]
+    assert bid_ask_df["Ask"].iloc[3] == bar_df["Close"].iloc[0]
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_concurrent_loading_matches_sequential(bar_csv_dir, use_processes):
+    """
+    Checks that concurrently loaded DataFrames are identical to
+    sequentially loaded ones and are merged in a deterministic order.
+    """
+    symbols = ["GHI", "ABC", "DEF"]
+    sequential_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity, csv_symbols=symbols)
+    concurrent_ds = CSVDailyBarDataSource(
+        str(bar_csv_dir), Equity, csv_symbols=symbols,
+        max_workers=3, use_processes=use_processes
+    )
+
+    assert list(concurrent_ds.asset_bar_frames.keys()) == ["EQ:GHI", "EQ:ABC", "EQ:DEF"]
+    for asset in sequential_ds.asset_bar_frames.keys():
+        pd.testing.assert_frame_equal(
+            sequential_ds.asset_bar_frames[asset],
+            concurrent_ds.asset_bar_frames[asset]
+        )
+        pd.testing.assert_frame_equal(
+            sequential_ds.asset_bid_ask_frames[asset],
+            concurrent_ds.asset_bid_ask_frames[asset]
+        )
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_loading_failures_reported_together(bar_csv_dir, max_workers):
+    """
+    Checks that all CSV files are attempted and every failure is
+    reported in a single error once loading has completed.
+    """
+    (bar_csv_dir / "BAD.csv").write_text("Date,Open\n2020-01-01,1.0\n")
+
+    with pytest.raises(ValueError) as excinfo:
+        CSVDailyBarDataSource(
+            str(bar_csv_dir), Equity, csv_symbols=["ABC", "BAD", "XYZ"],
+            max_workers=max_workers
+        )
+    message = str(excinfo.value)
+    assert "2 of 3 CSV files" in message
+    assert "BAD.csv" in message
+    assert "XYZ.csv" in message
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_historical_closes_match_reference(bar_csv_dir, lazy):
+    """
+    Checks that historical close ranges sliced from the close panel
+    are identical to the original concatenated ranges, including as
+    the panel is extended by lazily loaded assets.
+    """
+    ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity, lazy=lazy)
+    ranges = [
+        ('2020-01-01', '2020-03-31'),
+        ('2020-02-20', '2020-03-05'),
+        ('2020-03-28', '2020-05-01'),
+    ]
+    asset_lists = [
+        ['EQ:GHI'],
+        ['EQ:ABC', 'EQ:DEF'],
+        ['EQ:DEF', 'EQ:XYZ', 'EQ:ABC', 'EQ:GHI'],
+    ]
+    for assets in asset_lists:
+        for start, end in ranges:
+            start_dt = pd.Timestamp(start, tz=pytz.UTC)
+            end_dt = pd.Timestamp(end, tz=pytz.UTC)
+            pd.testing.assert_frame_equal(
+                ds.get_assets_historical_closes(start_dt, end_dt, assets),
+                reference_historical_closes(ds, start_dt, end_dt, assets),
+                check_freq=False
+            )
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_historical_closes_are_writeable_copies(bar_csv_dir, reverse):
+    """
+    Checks that a historical close range is a writeable copy of the
+    close panel, whether or not the assets occupy consecutive panel
+    columns in order, and that modifying it leaves the panel intact.
+    """
+    ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity)
+    start_dt = pd.Timestamp('2020-02-03', tz=pytz.UTC)
+    end_dt = pd.Timestamp('2020-03-10', tz=pytz.UTC)
+    ds.get_assets_historical_closes(start_dt, end_dt, ['EQ:ABC'])
+
+    assets = ds.close_panel.assets[::-1] if reverse else ds.close_panel.assets
+    prices_df = ds.get_assets_historical_closes(start_dt, end_dt, assets)
+    assert list(prices_df.columns) == assets
+    assert not np.shares_memory(
+        prices_df.to_numpy(), ds.close_panel.fields['Close']
+    )
+    prices_df.iloc[0, 0] = 1.0
+    assert prices_df.iloc[0, 0] == 1.0
+    assert ds.get_assets_historical_closes(
+        start_dt, end_dt, assets
+    ).iloc[0, 0] != 1.0
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize("adjust_prices", [True, False])
+def test_volumes_and_adv_match_reference(bar_csv_dir, lazy, adjust_prices):
+    """
+    Checks that the volume and rolling average volume lookups match
+    those computed from the CSV files, only becoming available once
+    each daily bar has closed.
+    """
+    ds = CSVDailyBarDataSource(
+        str(bar_csv_dir), Equity, adjust_prices=adjust_prices, lazy=lazy,
+        adv_window=5
+    )
+    assets = ['EQ:GHI', 'EQ:XYZ', 'EQ:ABC', 'EQ:DEF']
+    csv_dfs = {
+        asset: pd.read_csv(
+            bar_csv_dir / ("%s.csv" % asset[3:]), index_col="Date", parse_dates=True
+        )
+        for asset in assets if asset != 'EQ:XYZ'
+    }
+
+    for date in pd.bdate_range('2020-02-03', '2020-03-20', tz=pytz.UTC):
+        close_dt = date + pd.Timedelta(hours=21)
+        expected = np.full((3, len(assets)), np.nan)
+        for j, asset in enumerate(assets):
+            if asset not in csv_dfs:
+                continue
+            csv_df = csv_dfs[asset][csv_dfs[asset].index <= date].iloc[-5:]
+            if len(csv_df) == 0:
+                continue
+            volume = csv_df["Volume"] / (0.95 if adjust_prices else 1.0)
+            expected[:, j] = [
+                volume.iloc[-1],
+                volume.mean(),
+                (csv_df["Volume"] * csv_df["Close"]).mean(),
+            ]
+        np.testing.assert_allclose(ds.get_assets_volume(close_dt, assets), expected[0])
+        np.testing.assert_allclose(ds.get_assets_adv(close_dt, assets), expected[1])
+        np.testing.assert_allclose(
+            ds.get_assets_dollar_adv(close_dt, assets), expected[2]
+        )
+
+    # The volume of a bar is unavailable prior to its close
+    dt = pd.Timestamp('2020-02-04 20:59:00', tz=pytz.UTC)
+    assert ds.get_volume(dt, 'EQ:ABC') == ds.get_volume(
+        pd.Timestamp('2020-02-03 21:00:00', tz=pytz.UTC), 'EQ:ABC'
+    )
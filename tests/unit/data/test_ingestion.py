@@ -0,0 +1,232 @@
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from qstrader.data.ingestion import (
+    CSVFileDataProvider,
+    DataIngester,
+    DataProvider,
+    YahooFinanceDataProvider,
+)
+
+
+class FlakyDataProvider(DataProvider):
+    """
+    Wraps a provider, failing the first fetches of each ticker.
+    """
+
+    def __init__(self, provider, failures):
+        self.provider = provider
+        self.failures = failures
+        self.fetches = []
+
+    def fetch(self, ticker, start_date, end_date):
+        self.fetches.append((ticker, start_date, end_date))
+        attempts = sum(1 for fetch in self.fetches if fetch[0] == ticker)
+        if attempts <= self.failures:
+            raise ConnectionError("Connection reset")
+        return self.provider.fetch(ticker, start_date, end_date)
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    """
+    A directory of source CSV files in the format stored by
+    Yahoo Finance downloads.
+    """
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    for ticker, periods in [("ABC", 40), ("DEF", 30)]:
+        dates = pd.bdate_range("2020-01-01", periods=periods)
+        bar_df = pd.DataFrame(
+            {
+                "Adj Close": range(periods),
+                "Close": range(periods),
+                "High": range(periods),
+                "Low": range(periods),
+                "Open": range(periods),
+                "Volume": range(periods),
+            },
+            index=pd.Index(dates, name="Date"),
+        )
+        bar_df.to_csv(source_dir / ("%s.csv" % ticker))
+    return source_dir
+
+
+def test_incremental_ingest_appends_missing_bars(source_dir, tmp_path):
+    """
+    Checks that an incremental ingest fetches only the dates from the
+    last stored bar onwards and appends those after it, producing the
+    same files as a full ingest.
+    """
+    output_dir = tmp_path / "output"
+    provider = FlakyDataProvider(CSVFileDataProvider(str(source_dir)), 0)
+    ingester = DataIngester(provider, str(output_dir), max_workers=2)
+    end_date = pd.Timestamp("2020-03-01")
+
+    first_end = pd.Timestamp("2020-01-20")
+    assert ingester.ingest(
+        [
+            ("ABC", pd.Timestamp("2020-01-01"), first_end),
+            ("DEF", pd.Timestamp("2020-01-01"), first_end),
+        ]
+    ) == {"ABC": "written", "DEF": "written"}
+    assert ingester.last_stored_date("ABC") == pd.Timestamp("2020-01-17")
+
+    provider.fetches = []
+    assert ingester.ingest(
+        [
+            ("ABC", pd.Timestamp("2020-01-01"), end_date),
+            ("DEF", pd.Timestamp("2020-01-01"), end_date),
+            ("XYZ", pd.Timestamp("2020-01-01"), end_date),
+        ]
+    ) == {"ABC": "appended", "DEF": "appended", "XYZ": "empty"}
+    fetch_starts = {fetch[0]: fetch[1] for fetch in provider.fetches}
+    assert fetch_starts["ABC"] == pd.Timestamp("2020-01-17")
+
+    full_dir = tmp_path / "full"
+    DataIngester(
+        CSVFileDataProvider(str(source_dir)), str(full_dir), incremental=False
+    ).ingest([("ABC", pd.Timestamp("2020-01-01"), end_date)])
+    assert (output_dir / "ABC.csv").read_text() == (full_dir / "ABC.csv").read_text()
+
+    provider.fetches = []
+    assert ingester.ingest(
+        [("ABC", pd.Timestamp("2020-01-01"), pd.Timestamp("2020-02-01"))]
+    ) == {"ABC": "up-to-date"}
+    assert provider.fetches == []
+
+
+def test_ingest_retries_failed_downloads(source_dir, tmp_path):
+    """
+    Checks that failed downloads are retried up to the retry limit,
+    with exhausted tickers reported as failed.
+    """
+    date_range = (pd.Timestamp("2020-01-01"), pd.Timestamp("2020-02-01"))
+    flaky_provider = FlakyDataProvider(CSVFileDataProvider(str(source_dir)), 2)
+    ingester = DataIngester(
+        flaky_provider, str(tmp_path / "retry"), max_retries=2, backoff=0.0
+    )
+    assert ingester.ingest([("ABC",) + date_range]) == {"ABC": "written"}
+    assert len(flaky_provider.fetches) == 3
+
+    failing_provider = FlakyDataProvider(CSVFileDataProvider(str(source_dir)), 5)
+    ingester = DataIngester(
+        failing_provider, str(tmp_path / "fail"), max_retries=1, backoff=0.0
+    )
+    assert ingester.ingest([("ABC",) + date_range]) == {"ABC": "failed"}
+    assert len(failing_provider.fetches) == 2
+
+
+@pytest.mark.parametrize("adjust", [False, True])
+def test_incremental_ingest_restates_adjusted_history(source_dir, tmp_path, adjust):
+    """
+    Checks that a corporate action occurring after the last stored bar,
+    which changes the adjustment factor of the stored history, restates
+    the stored adjusted prices to match those of a full ingest.
+    """
+    output_dir = tmp_path / "output"
+    ingester = DataIngester(
+        CSVFileDataProvider(str(source_dir)), str(output_dir), adjust=adjust
+    )
+    end_date = pd.Timestamp("2020-03-01")
+    ingester.ingest([("ABC", pd.Timestamp("2020-01-01"), pd.Timestamp("2020-01-20"))])
+
+    # A dividend after the last stored date halves all prior adjusted closes
+    source_path = source_dir / "ABC.csv"
+    source_df = pd.read_csv(source_path, index_col="Date", parse_dates=True)
+    source_df["Adj Close"] = source_df["Adj Close"].astype(float)
+    source_df.loc[:"2020-01-24", "Adj Close"] = source_df["Close"] * 0.5
+    source_df.to_csv(source_path)
+
+    assert ingester.ingest(
+        [("ABC", pd.Timestamp("2020-01-01"), end_date)]
+    ) == {"ABC": "restated"}
+
+    full_dir = tmp_path / "full"
+    DataIngester(
+        CSVFileDataProvider(str(source_dir)), str(full_dir),
+        incremental=False, adjust=adjust
+    ).ingest([("ABC", pd.Timestamp("2020-01-01"), end_date)])
+    pd.testing.assert_frame_equal(
+        pd.read_csv(output_dir / "ABC.csv", index_col=0),
+        pd.read_csv(full_dir / "ABC.csv", index_col=0)
+    )
+
+
+def test_incremental_ingest_retries_empty_downloads(source_dir, tmp_path):
+    """
+    Checks that an empty incremental download, which must contain the
+    last stored bar, is retried and reported as failed rather than
+    up-to-date.
+    """
+    output_dir = tmp_path / "output"
+    end_date = pd.Timestamp("2020-03-01")
+    DataIngester(CSVFileDataProvider(str(source_dir)), str(output_dir)).ingest(
+        [("ABC", pd.Timestamp("2020-01-01"), pd.Timestamp("2020-01-20"))]
+    )
+
+    empty_provider = FlakyDataProvider(CSVFileDataProvider(str(tmp_path / "empty")), 0)
+    ingester = DataIngester(
+        empty_provider, str(output_dir), max_retries=2, backoff=0.0
+    )
+    assert ingester.ingest(
+        [("ABC", pd.Timestamp("2020-01-01"), end_date)]
+    ) == {"ABC": "failed"}
+    assert len(empty_provider.fetches) == 3
+    assert ingester.last_stored_date("ABC") == pd.Timestamp("2020-01-17")
+
+
+def test_failed_rewrite_leaves_stored_bars_intact(source_dir, tmp_path, monkeypatch):
+    """
+    Checks that an interrupted rewrite of a CSV file, upon appending bars
+    with differing columns, leaves the previously stored file intact.
+    """
+    output_dir = tmp_path / "output"
+    DataIngester(CSVFileDataProvider(str(source_dir)), str(output_dir)).ingest(
+        [("ABC", pd.Timestamp("2020-01-01"), pd.Timestamp("2020-01-20"))]
+    )
+    stored = (output_dir / "ABC.csv").read_text()
+
+    def interrupted_to_csv(self, path, *args, **kwargs):
+        with open(path, "w") as csv_file:
+            csv_file.write("Date,Open\n")
+        raise KeyboardInterrupt
+
+    ingester = DataIngester(
+        CSVFileDataProvider(str(source_dir)), str(output_dir), adjust=True
+    )
+    monkeypatch.setattr(pd.DataFrame, "to_csv", interrupted_to_csv)
+    with pytest.raises(KeyboardInterrupt):
+        ingester.ingest_ticker(
+            "ABC", pd.Timestamp("2020-01-01"), pd.Timestamp("2020-03-01")
+        )
+    assert (output_dir / "ABC.csv").read_text() == stored
+    assert sorted(path.name for path in output_dir.iterdir()) == ["ABC.csv"]
+
+
+@pytest.mark.parametrize(
+    "download",
+    [
+        pd.DataFrame(),
+        pd.DataFrame(
+            {"Close": [np.nan, np.nan]},
+            index=pd.bdate_range("2020-01-01", periods=2)
+        ),
+    ]
+)
+def test_yahoo_finance_failed_downloads_raise(monkeypatch, download):
+    """
+    Checks that the empty or all NaN DataFrame returned by 'yfinance'
+    upon a failed download is raised as an error.
+    """
+    yf = types.ModuleType("yfinance")
+    yf.download = lambda *args, **kwargs: download
+    monkeypatch.setitem(sys.modules, "yfinance", yf)
+    with pytest.raises(IOError):
+        YahooFinanceDataProvider().fetch(
+            "ABC", pd.Timestamp("2020-01-01"), pd.Timestamp("2020-02-01")
+        )
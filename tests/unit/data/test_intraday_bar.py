@@ -0,0 +1,98 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.asset.equity import Equity
+from qstrader.data.backtest_data_handler import BacktestDataHandler
+from qstrader.data.intraday_bar import IntradayBarDataSource
+
+
+@pytest.fixture
+def intraday_store_dir(tmp_path):
+    """
+    A store of five minute bars for two assets, converted from CSV.
+    """
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    rng = np.random.default_rng(42)
+    for ticker, start, periods in [
+        ("ABC", "2020-01-02 14:30", 200), ("DEF", "2020-01-02 15:00", 150)
+    ]:
+        index = pd.date_range(start, periods=periods, freq="5min", tz=pytz.UTC)
+        close = 50.0 + np.cumsum(rng.normal(0.0, 0.1, periods))
+        bar_df = pd.DataFrame(
+            {
+                "Open": close - 0.05,
+                "High": close + 0.1,
+                "Low": close - 0.1,
+                "Close": close,
+                "Volume": rng.integers(100, 1000, periods),
+            },
+            index=pd.Index(index, name="Datetime"),
+        )
+        bar_df.to_csv(csv_dir / ("%s.csv" % ticker))
+    store_dir = tmp_path / "store"
+    IntradayBarDataSource.convert_csv_dir(str(csv_dir), str(store_dir))
+    return store_dir
+
+
+def test_intraday_as_of_lookups(intraday_store_dir):
+    """
+    Checks that bid prices are the open of the current bar, or the
+    close of the latest completed bar, from memory-mapped float32 bars.
+    """
+    ds = IntradayBarDataSource(
+        str(intraday_store_dir), Equity, bar_period=pd.Timedelta(minutes=5)
+    )
+    assert isinstance(ds.asset_bars['EQ:ABC'], np.memmap)
+    assert ds.asset_bars['EQ:ABC'].dtype == np.float32
+
+    bars = ds.asset_bars['EQ:ABC']
+    bar_start = pd.Timestamp('2020-01-02 15:00', tz=pytz.UTC)
+    assert ds.get_bid(bar_start, 'EQ:ABC') == bars[6, 0]
+    assert ds.get_bid(bar_start + pd.Timedelta(minutes=4), 'EQ:ABC') == bars[6, 0]
+    assert ds.get_ask(bar_start + pd.Timedelta(minutes=5), 'EQ:ABC') == bars[7, 0]
+    assert ds.get_high(bar_start + pd.Timedelta(minutes=2), 'EQ:ABC') == bars[6, 1]
+
+    last_bar = pd.Timestamp(int(ds.asset_timestamps['EQ:ABC'][-1]), tz=pytz.UTC)
+    assert ds.get_bid(last_bar + pd.Timedelta(hours=1), 'EQ:ABC') == bars[-1, 3]
+    assert np.isnan(
+        ds.get_bid(bar_start - pd.Timedelta(minutes=1), 'EQ:DEF')
+    )
+    assert np.isnan(
+        ds.get_bid(pd.Timestamp('2020-01-02 14:00', tz=pytz.UTC), 'EQ:ABC')
+    )
+    assert ds.get_asset_coverage('EQ:ABC') == (
+        pd.Timestamp('2020-01-02 14:30', tz=pytz.UTC),
+        last_bar + pd.Timedelta(minutes=5)
+    )
+
+    ds = pickle.loads(pickle.dumps(ds))
+    assert isinstance(ds.asset_bars['EQ:ABC'], np.memmap)
+
+
+def test_intraday_data_handler_and_historical_closes(intraday_store_dir):
+    """
+    Checks that the data source plugs into the data handler and that
+    historical closes are outer-joined across assets.
+    """
+    ds = IntradayBarDataSource(
+        str(intraday_store_dir), Equity, bar_period=pd.Timedelta(minutes=5)
+    )
+    data_handler = BacktestDataHandler(None, data_sources=[ds])
+    dt = pd.Timestamp('2020-01-02 15:07', tz=pytz.UTC)
+    np.testing.assert_array_equal(
+        data_handler.get_assets_latest_bid_prices(dt, ['EQ:DEF', 'EQ:ABC']),
+        [ds.asset_bars['EQ:DEF'][1, 0], ds.asset_bars['EQ:ABC'][7, 0]]
+    )
+
+    closes = ds.get_assets_historical_closes(
+        pd.Timestamp('2020-01-02 14:40', tz=pytz.UTC), dt, ['EQ:ABC', 'EQ:DEF']
+    )
+    assert list(closes.columns) == ['EQ:ABC', 'EQ:DEF']
+    assert len(closes) == 6
+    assert np.isnan(closes['EQ:DEF'].iloc[0])
+    assert closes['EQ:ABC'].iloc[-1] == ds.asset_bars['EQ:ABC'][7, 3]
@@ -0,0 +1,116 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.alpha_model.fixed_signals import FixedSignalsAlphaModel
+from qstrader.asset.equity import Equity
+from qstrader.asset.universe.static import StaticUniverse
+from qstrader.data.backtest_data_handler import BacktestDataHandler
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.trading.backtest import BacktestTradingSession
+
+
+@pytest.mark.parametrize("panel", [False, True])
+def test_lazy_loading_on_demand(bar_csv_dir, panel):
+    """
+    Checks that no CSV files are loaded upon instantiation in lazy
+    mode and that each asset is loaded upon its first request,
+    producing identical prices to eager loading.
+    """
+    eager_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity)
+    lazy_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity, lazy=True, panel=panel)
+    assert lazy_ds.loaded_assets == set()
+
+    dt = pd.Timestamp('2020-03-02 21:00:00', tz=pytz.UTC)
+    assert lazy_ds.get_bid(dt, 'EQ:DEF') == eager_ds.get_bid(dt, 'EQ:DEF')
+    assert lazy_ds.loaded_assets == {'EQ:DEF'}
+
+    assert lazy_ds.get_ask(dt, 'EQ:ABC') == eager_ds.get_ask(dt, 'EQ:ABC')
+    assert lazy_ds.get_high(dt, 'EQ:DEF') == eager_ds.get_high(dt, 'EQ:DEF')
+    assert lazy_ds.loaded_assets == {'EQ:ABC', 'EQ:DEF'}
+
+    start_dt = pd.Timestamp('2020-02-01', tz=pytz.UTC)
+    pd.testing.assert_frame_equal(
+        lazy_ds.get_assets_historical_closes(start_dt, dt, ['EQ:ABC', 'EQ:GHI']),
+        eager_ds.get_assets_historical_closes(start_dt, dt, ['EQ:ABC', 'EQ:GHI'])
+    )
+    assert lazy_ds.loaded_assets == {'EQ:ABC', 'EQ:DEF', 'EQ:GHI'}
+
+    with pytest.raises(KeyError):
+        lazy_ds.get_bid(dt, 'EQ:XYZ')
+
+
+def test_lazy_loading_is_thread_safe(bar_csv_dir):
+    """
+    Checks that concurrent first requests for the same asset
+    only load its CSV file once.
+    """
+    lazy_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity, lazy=True, cursor=True)
+    load_calls = []
+    original_load = lazy_ds._load_csv_into_frames
+
+    def counting_load(csv_file):
+        load_calls.append(csv_file)
+        return original_load(csv_file)
+
+    lazy_ds._load_csv_into_frames = counting_load
+
+    dt = pd.Timestamp('2020-03-02 21:00:00', tz=pytz.UTC)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        bids = list(
+            executor.map(lambda _: lazy_ds.get_bid(dt, 'EQ:ABC'), range(32))
+        )
+    assert load_calls == ['ABC.csv']
+    assert len(set(bids)) == 1
+
+
+def test_data_handler_prefetches_universe_assets(bar_csv_dir):
+    """
+    Checks that the data handler prefetches the universe assets
+    in the background for lazily loaded data sources.
+    """
+    lazy_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity, lazy=True)
+    universe = Mock()
+    universe.get_assets.return_value = ['EQ:ABC', 'EQ:GHI']
+    data_handler = BacktestDataHandler(universe, data_sources=[lazy_ds])
+
+    data_handler.prefetch(pd.Timestamp('2020-02-03', tz=pytz.UTC))
+    data_handler.shutdown_prefetch()
+    assert lazy_ds.loaded_assets == {'EQ:ABC', 'EQ:GHI'}
+    assert lazy_ds.prefetch_executor is None
+
+
+def test_backtest_prefetches_and_shuts_down(bar_csv_dir):
+    """
+    Checks that a backtest prefetches its initial universe assets from
+    a lazily loaded data source and shuts down the background thread
+    once the simulation has finished.
+    """
+    lazy_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity, lazy=True)
+    prefetched = []
+    original_prefetch = lazy_ds.prefetch
+
+    def recording_prefetch(assets):
+        prefetched.append(list(assets))
+        return original_prefetch(assets)
+
+    lazy_ds.prefetch = recording_prefetch
+    universe = StaticUniverse(['EQ:ABC', 'EQ:DEF'])
+    backtest = BacktestTradingSession(
+        pd.Timestamp('2020-02-03 14:30:00', tz=pytz.UTC),
+        pd.Timestamp('2020-02-28 23:59:00', tz=pytz.UTC),
+        universe,
+        FixedSignalsAlphaModel({'EQ:ABC': 0.5, 'EQ:DEF': 0.5}),
+        rebalance='buy_and_hold',
+        long_only=True,
+        cash_buffer_percentage=0.01,
+        data_handler=BacktestDataHandler(universe, data_sources=[lazy_ds])
+    )
+    backtest.run()
+
+    assert prefetched == [['EQ:ABC', 'EQ:DEF']]
+    assert lazy_ds.loaded_assets == {'EQ:ABC', 'EQ:DEF'}
+    assert lazy_ds.prefetch_executor is None
@@ -0,0 +1,81 @@
+from concurrent.futures import ProcessPoolExecutor
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from qstrader.asset.equity import Equity
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.data.memmap_daily_bar import MemmapDailyBarDataSource
+
+ASSETS = ['EQ:ABC', 'EQ:DEF', 'EQ:GHI']
+
+
+def _latest_bids(ds, dt):
+    """
+    Obtain the latest bid prices within a worker process.
+    """
+    return ds.get_assets_bid(dt, ASSETS)
+
+
+def test_memmap_matches_csv_data_source(bar_csv_dir, tmp_path):
+    """
+    Checks that the memory-mapped data source returns identical
+    prices, coverage and historical closes to the CSV data source.
+    """
+    csv_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity, cursor=True)
+    mmap_ds = MemmapDailyBarDataSource.create(
+        str(tmp_path / "prices.qsm"), str(bar_csv_dir), Equity
+    )
+    assert isinstance(mmap_ds.store.values, np.memmap)
+
+    dts = pd.date_range(
+        '2020-01-01 00:00:00', '2020-04-10 21:00:00', freq='5h', tz=pytz.UTC
+    )
+    for dt in dts:
+        for asset in ASSETS:
+            for method in [
+                'get_bid', 'get_ask', 'get_open', 'get_high', 'get_low',
+                'get_volume', 'get_adv', 'get_dollar_adv'
+            ]:
+                np.testing.assert_equal(
+                    getattr(mmap_ds, method)(dt, asset),
+                    getattr(csv_ds, method)(dt, asset)
+                )
+        np.testing.assert_array_equal(
+            mmap_ds.get_assets_ask(dt, ASSETS + ['EQ:XYZ']),
+            csv_ds.get_assets_ask(dt, ASSETS + ['EQ:XYZ'])
+        )
+        np.testing.assert_array_equal(
+            mmap_ds.get_assets_dollar_adv(dt, ASSETS + ['EQ:XYZ']),
+            csv_ds.get_assets_dollar_adv(dt, ASSETS + ['EQ:XYZ'])
+        )
+
+    for asset in ASSETS + ['EQ:XYZ']:
+        assert mmap_ds.get_asset_coverage(asset) == csv_ds.get_asset_coverage(asset)
+
+    start_dt = pd.Timestamp('2020-01-20', tz=pytz.UTC)
+    end_dt = pd.Timestamp('2020-03-20', tz=pytz.UTC)
+    pd.testing.assert_frame_equal(
+        mmap_ds.get_assets_historical_closes(start_dt, end_dt, ASSETS),
+        csv_ds.get_assets_historical_closes(start_dt, end_dt, ASSETS),
+        check_freq=False
+    )
+
+
+def test_memmap_data_source_shared_across_processes(bar_csv_dir, tmp_path):
+    """
+    Checks that pickling the data source only transfers the store
+    path and that worker processes attach to the same store.
+    """
+    mmap_ds = MemmapDailyBarDataSource.create(
+        str(tmp_path / "prices.qsm"), str(bar_csv_dir), Equity
+    )
+    assert len(pickle.dumps(mmap_ds)) < 1024
+
+    dt = pd.Timestamp('2020-03-02 17:00:00', tz=pytz.UTC)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        worker_bids = list(executor.map(_latest_bids, [mmap_ds] * 2, [dt] * 2))
+    for bids in worker_bids:
+        np.testing.assert_array_equal(bids, mmap_ds.get_assets_bid(dt, ASSETS))
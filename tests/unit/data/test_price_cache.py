@@ -0,0 +1,105 @@
+import datetime
+import gc
+import weakref
+
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.asset.equity import Equity
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.data.price_cache import PriceCache
+
+
+class LookupCounter(object):
+    """
+    A point price lookup recording the number of times it is called.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, dt, asset):
+        self.calls += 1
+        return float(dt.day)
+
+
+@pytest.mark.parametrize(
+    "policy,expected_calls", [("lru", 3), ("fifo", 4)]
+)
+def test_price_cache_eviction_policies(policy, expected_calls):
+    """
+    Checks that a full cache evicts the least recently used entry
+    under 'lru' and the oldest entry under 'fifo', while counting
+    hits and misses.
+    """
+    cache = PriceCache(maxsize=2, policy=policy)
+    lookup = LookupCounter()
+    memoised_lookup = cache.memoise(lookup)
+    dt1 = pd.Timestamp('2020-01-01', tz=pytz.UTC)
+    dt2 = pd.Timestamp('2020-01-02', tz=pytz.UTC)
+    dt3 = pd.Timestamp('2020-01-03', tz=pytz.UTC)
+
+    memoised_lookup(dt1, 'EQ:ABC')
+    memoised_lookup(dt2, 'EQ:ABC')
+    assert memoised_lookup(dt1, 'EQ:ABC') == 1.0
+    memoised_lookup(dt3, 'EQ:ABC')
+    memoised_lookup(dt1, 'EQ:ABC')
+
+    assert lookup.calls == expected_calls
+    info = cache.cache_info()
+    assert info.hits == 5 - expected_calls
+    assert info.misses == expected_calls
+    assert info.currsize == 2
+
+    cache.clear()
+    assert cache.cache_info() == (0, 0, 2, 0)
+
+
+def test_price_cache_invalid_arguments():
+    """
+    Checks that unknown eviction policies and negative sizes raise.
+    """
+    with pytest.raises(ValueError):
+        PriceCache(policy='random')
+    with pytest.raises(ValueError):
+        PriceCache(maxsize=-1)
+
+
+def test_data_source_price_cache_is_per_instance(bar_csv_dir):
+    """
+    Checks that each data source holds its own price cache, shared by
+    its lookup methods, and that it does not keep the data source alive.
+    """
+    dt = pd.Timestamp('2020-02-20 14:30:00', tz=pytz.UTC)
+    ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity, price_cache_size=10)
+    other_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity)
+
+    bid = ds.get_bid(dt, 'EQ:ABC')
+    assert ds.get_bid(dt, 'EQ:ABC') == bid
+    ds.get_ask(dt, 'EQ:ABC')
+    assert ds.price_cache.cache_info() == (1, 2, 10, 2)
+    assert other_ds.price_cache.cache_info().currsize == 0
+
+    ds_ref = weakref.ref(ds)
+    del ds
+    gc.collect()
+    assert ds_ref() is None
+
+
+def test_price_cache_accepts_other_timestamp_types(bar_csv_dir):
+    """
+    Checks that memoised lookups accept the timestamp types accepted by
+    the unwrapped lookups, sharing cache entries with equal timestamps.
+    """
+    dt = pd.Timestamp('2020-02-20 14:30:00', tz=pytz.UTC)
+    ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity)
+    uncached_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity, price_cache_size=0)
+
+    bid = uncached_ds.get_bid(dt, 'EQ:ABC')
+    other_dt = dt.to_pydatetime()
+    assert isinstance(other_dt, datetime.datetime)
+    assert uncached_ds.get_bid(other_dt, 'EQ:ABC') == bid
+    assert ds.get_bid(other_dt, 'EQ:ABC') == bid
+    assert ds.get_bid(dt, 'EQ:ABC') == bid
+    assert ds.price_cache.cache_info().misses == 1
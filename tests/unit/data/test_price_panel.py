@@ -0,0 +1,136 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from qstrader.asset.equity import Equity
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.data.price_panel import PricePanel
+
+
+def test_price_panel_pad_alignment():
+    """
+    Checks that assets with differing timestamps are aligned onto the
+    union timestamp axis using the latest value at or before each
+    timestamp, with NaN prior to an asset's first value.
+    """
+    idx_a = pd.DatetimeIndex(['2020-01-01', '2020-01-03'], tz=pytz.UTC)
+    idx_b = pd.DatetimeIndex(['2020-01-02', '2020-01-03'], tz=pytz.UTC)
+    frames = {
+        'EQ:A': pd.DataFrame({'Close': [1.0, 3.0]}, index=idx_a),
+        'EQ:B': pd.DataFrame({'Close': [20.0, 30.0]}, index=idx_b),
+    }
+    panel = PricePanel.from_frames(frames, ['Close'])
+
+    assert len(panel.timestamps) == 3
+    assert panel.fields['Close'].flags['C_CONTIGUOUS']
+    np.testing.assert_array_equal(
+        panel.fields['Close'],
+        np.array([[1.0, np.nan], [1.0, 20.0], [3.0, 30.0]])
+    )
+
+    dt = pd.Timestamp('2020-01-02 12:00:00', tz=pytz.UTC)
+    assert panel.get_value('Close', dt, 'EQ:A') == 1.0
+    np.testing.assert_array_equal(
+        panel.get_cross_section('Close', dt, ['EQ:B', 'EQ:A']),
+        np.array([20.0, 1.0])
+    )
+    assert np.isnan(
+        panel.get_value('Close', pd.Timestamp('2019-12-31', tz=pytz.UTC), 'EQ:A')
+    )
+
+    dts = pd.DatetimeIndex(
+        ['2019-12-31', '2020-01-02 12:00:00', '2020-01-05'], tz=pytz.UTC
+    )
+    np.testing.assert_array_equal(
+        panel.get_cross_sections('Close', dts, ['EQ:B', 'EQ:A']),
+        np.array([[np.nan, np.nan], [20.0, 1.0], [30.0, 3.0]])
+    )
+
+
+def test_price_panel_unpadded_alignment_and_extension():
+    """
+    Checks that an unpadded panel only holds values at each asset's
+    own timestamps, including once extended with a further asset.
+    """
+    idx_a = pd.DatetimeIndex(['2020-01-01', '2020-01-03'], tz=pytz.UTC)
+    idx_b = pd.DatetimeIndex(['2020-01-02', '2020-01-04'], tz=pytz.UTC)
+    panel = PricePanel.from_frames(
+        {'EQ:A': pd.DataFrame({'Close': [1.0, 3.0]}, index=idx_a)},
+        ['Close'], pad=False
+    )
+    panel.add_assets(
+        {'EQ:B': pd.DataFrame({'Close': [20.0, 40.0]}, index=idx_b)}
+    )
+    np.testing.assert_array_equal(
+        panel.fields['Close'],
+        np.array([[1.0, np.nan], [np.nan, 20.0], [3.0, np.nan], [np.nan, 40.0]])
+    )
+
+    range_df = panel.get_range(
+        'Close',
+        pd.Timestamp('2020-01-02', tz=pytz.UTC),
+        pd.Timestamp('2020-01-03', tz=pytz.UTC)
+    )
+    assert list(range_df.index) == list(panel.index[1:3])
+    assert not np.shares_memory(range_df.to_numpy(), panel.fields['Close'])
+
+
+def test_price_panel_readers_see_consistent_state_while_extended():
+    """
+    Checks that concurrent readers always observe a timestamp axis,
+    asset order and field arrays of matching shape while other
+    threads extend the panel with further assets.
+    """
+    idx = pd.date_range('2020-01-01', periods=50, tz=pytz.UTC)
+    panel = PricePanel.from_frames(
+        {'EQ:A0': pd.DataFrame({'Close': np.arange(50.0)}, index=idx)}, ['Close']
+    )
+    new_frames = [
+        {
+            'EQ:A%d' % i: pd.DataFrame(
+                {'Close': np.arange(50.0) + i},
+                index=idx + pd.Timedelta(hours=i)
+            )
+        }
+        for i in range(1, 60)
+    ]
+
+    def read(_):
+        for _ in range(200):
+            range_df = panel.get_range('Close', None, None)
+            assert range_df.shape == (len(range_df.index), len(range_df.columns))
+            frame_df = panel.to_frame('Close')
+            assert frame_df.shape[1] == len(frame_df.columns)
+            cross_section = panel.get_cross_section('Close', idx[-1])
+            assert not np.isnan(cross_section[0])
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        readers = [executor.submit(read, i) for i in range(3)]
+        for frames in new_frames:
+            panel.add_assets(frames)
+        for reader in readers:
+            reader.result()
+    assert len(panel.assets) == 60
+
+
+def test_panel_mode_matches_frame_lookups(bar_csv_dir):
+    """
+    Checks that the panel-backed data source returns identical prices
+    to the per-asset DataFrame lookups across all assets and times.
+    """
+    frame_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity)
+    panel_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity, panel=True)
+    assert panel_ds.asset_bid_ask_frames == {}
+
+    dts = pd.date_range(
+        '2020-02-03 14:30:00', '2020-03-31 21:00:00', freq='7h', tz=pytz.UTC
+    )
+    for asset in ['EQ:ABC', 'EQ:DEF', 'EQ:GHI']:
+        for dt in dts:
+            assert panel_ds.get_bid(dt, asset) == frame_ds.get_bid(dt, asset)
+            assert panel_ds.get_ask(dt, asset) == frame_ds.get_ask(dt, asset)
+            assert panel_ds.get_open(dt, asset) == frame_ds.get_open(dt, asset)
+            assert panel_ds.get_high(dt, asset) == frame_ds.get_high(dt, asset)
+            assert panel_ds.get_low(dt, asset) == frame_ds.get_low(dt, asset)
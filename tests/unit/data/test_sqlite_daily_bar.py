@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytz
+
+from qstrader.asset.equity import Equity
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.data.sqlite_daily_bar import SQLiteDailyBarDataSource
+
+ASSETS = ['EQ:ABC', 'EQ:DEF', 'EQ:GHI']
+
+
+def test_sqlite_matches_csv_data_source(bar_csv_dir, tmp_path):
+    """
+    Checks that the SQLite data source, bulk loaded from a CSV directory,
+    returns identical prices, coverage and historical closes to the CSV
+    data source, including across hot window reloads.
+    """
+    csv_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity, cursor=True)
+    sql_ds = SQLiteDailyBarDataSource.load_csv_dir(
+        str(tmp_path / "bars.db"), str(bar_csv_dir), Equity,
+        window=pd.DateOffset(days=10)
+    )
+    assert sql_ds.symbols == set(ASSETS)
+
+    dts = pd.date_range(
+        '2020-01-01 00:00:00', '2020-04-10 21:00:00', freq='5h', tz=pytz.UTC
+    )
+    for dt in dts:
+        for asset in ASSETS:
+            for method in ['get_bid', 'get_ask', 'get_open', 'get_high', 'get_low']:
+                np.testing.assert_equal(
+                    getattr(sql_ds, method)(dt, asset),
+                    getattr(csv_ds, method)(dt, asset)
+                )
+        np.testing.assert_array_equal(
+            sql_ds.get_assets_bid(dt, ASSETS + ['EQ:XYZ']),
+            csv_ds.get_assets_bid(dt, ASSETS + ['EQ:XYZ'])
+        )
+
+    for asset in ASSETS + ['EQ:XYZ']:
+        assert sql_ds.get_asset_coverage(asset) == csv_ds.get_asset_coverage(asset)
+
+    for assets in [ASSETS, ['EQ:GHI', 'EQ:XYZ', 'EQ:ABC']]:
+        start_dt = pd.Timestamp('2020-01-20', tz=pytz.UTC)
+        end_dt = pd.Timestamp('2020-03-20', tz=pytz.UTC)
+        pd.testing.assert_frame_equal(
+            sql_ds.get_assets_historical_closes(start_dt, end_dt, assets),
+            csv_ds.get_assets_historical_closes(start_dt, end_dt, assets),
+            check_freq=False
+        )
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.asset.equity import Equity
+from qstrader.data.backtest_data_handler import BacktestDataHandler
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.data.streaming_daily_bar_csv import StreamingCSVDailyBarDataSource
+
+
+def test_streaming_matches_in_memory_data_source(bar_csv_dir):
+    """
+    Checks that streaming the CSV files in monthly chunks produces the
+    same prices and historical closes as loading them in full, while
+    only retaining the lookback window.
+    """
+    full_ds = CSVDailyBarDataSource(
+        str(bar_csv_dir), Equity, cursor=True, adv_window=5
+    )
+    stream_ds = StreamingCSVDailyBarDataSource(
+        str(bar_csv_dir),
+        Equity,
+        chunk_size=pd.DateOffset(months=1),
+        lookback=pd.Timedelta(days=20),
+        adv_window=5
+    )
+    full_dh = BacktestDataHandler(None, data_sources=[full_ds])
+    stream_dh = BacktestDataHandler(None, data_sources=[stream_ds])
+
+    assets = ['EQ:ABC', 'EQ:DEF', 'EQ:GHI']
+    dts = pd.date_range(
+        '2020-01-21 14:30:00', '2020-04-10 21:00:00', freq='7h', tz=pytz.UTC
+    )
+    for dt in dts:
+        for asset in assets:
+            for method in [
+                'get_bid', 'get_ask', 'get_open', 'get_high', 'get_low',
+                'get_volume', 'get_adv', 'get_dollar_adv'
+            ]:
+                np.testing.assert_allclose(
+                    getattr(stream_ds, method)(dt, asset),
+                    getattr(full_ds, method)(dt, asset)
+                )
+        np.testing.assert_array_equal(
+            stream_dh.get_assets_latest_mid_prices(dt, assets),
+            full_dh.get_assets_latest_mid_prices(dt, assets)
+        )
+        np.testing.assert_allclose(
+            stream_dh.get_assets_latest_adv(dt, assets),
+            full_dh.get_assets_latest_adv(dt, assets)
+        )
+
+        start_dt = dt - pd.Timedelta(days=14)
+        pd.testing.assert_frame_equal(
+            stream_ds.get_assets_historical_closes(start_dt, dt, assets),
+            full_ds.get_assets_historical_closes(start_dt, dt, assets),
+            check_freq=False
+        )
+        # At most the lookback plus one chunk (and the bar preceding
+        # the window) is retained
+        assert stream_ds.asset_bar_frames['EQ:ABC'].index[0] >= (
+            dt - pd.Timedelta(days=20 + 31 + 3)
+        )
+
+
+def test_streaming_rejects_discarded_history(bar_csv_dir):
+    """
+    Checks that queries prior to the retained window raise.
+    """
+    stream_ds = StreamingCSVDailyBarDataSource(
+        str(bar_csv_dir), Equity, lookback=pd.Timedelta(days=10)
+    )
+    dt = pd.Timestamp('2020-03-02 21:00:00', tz=pytz.UTC)
+    stream_ds.get_bid(dt, 'EQ:ABC')
+    with pytest.raises(ValueError):
+        stream_ds.get_bid(dt - pd.Timedelta(days=30), 'EQ:ABC')
+    with pytest.raises(ValueError):
+        stream_ds.get_assets_historical_closes(
+            dt - pd.Timedelta(days=30), dt, ['EQ:ABC']
+        )
+
+
+def test_streaming_coverage_matches_in_memory_data_source(bar_csv_dir):
+    """
+    Checks that the asset coverage determined from the CSV files
+    matches that of the fully loaded data source.
+    """
+    full_ds = CSVDailyBarDataSource(str(bar_csv_dir), Equity)
+    stream_ds = StreamingCSVDailyBarDataSource(str(bar_csv_dir), Equity)
+    for asset in ['EQ:ABC', 'EQ:DEF', 'EQ:GHI', 'EQ:XYZ']:
+        assert stream_ds.get_asset_coverage(asset) == (
+            full_ds.get_asset_coverage(asset)
+        )
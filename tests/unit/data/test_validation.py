@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import qstrader.data.daily_bar_csv as daily_bar_csv
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.data.validation import repair_bar_frame, validate_bar_frames
+
+
+@pytest.fixture
+def broken_csv_dir(bar_csv_dir):
+    """
+    The daily bar CSV files with a zero price, a missing price,
+    a high below its low and a duplicated date within 'ABC'.
+    """
+    csv_path = bar_csv_dir / "ABC.csv"
+    bar_df = pd.read_csv(csv_path, index_col="Date")
+    bar_df.iloc[5, bar_df.columns.get_loc("Close")] = 0.0
+    bar_df.iloc[10, bar_df.columns.get_loc("Open")] = np.nan
+    bar_df.iloc[15, bar_df.columns.get_loc("High")] = bar_df["Low"].iloc[15] / 2.0
+    bar_df = pd.concat([bar_df.iloc[:21], bar_df.iloc[20:]])
+    bar_df.to_csv(csv_path)
+    return bar_csv_dir
+
+
+def test_validate_bar_frames_counts_issues_per_asset(broken_csv_dir):
+    """
+    Checks that the issues of each asset are counted, with invalid and
+    superseded duplicate rows flagged by the masks.
+    """
+    ds = CSVDailyBarDataSource(str(broken_csv_dir), "Equity")
+    asset_issues, asset_masks = validate_bar_frames(ds.asset_bar_frames)
+
+    assert asset_issues["EQ:ABC"] == {
+        "rows": 61,
+        "missing_price": 1,
+        "non_positive_price": 1,
+        "high_below_low": 1,
+        "duplicate_date": 1,
+    }
+    assert asset_issues["EQ:DEF"]["rows"] == 50
+    invalid, duplicated = asset_masks["EQ:ABC"]
+    assert np.flatnonzero(invalid).tolist() == [5, 10, 15]
+    assert np.flatnonzero(duplicated).tolist() == [20]
+    assert not asset_masks["EQ:GHI"][0].any()
+
+
+def test_validation_policies(broken_csv_dir):
+    """
+    Checks that invalid bars are dropped, forward filled or rejected,
+    leaving the valid assets untouched.
+    """
+    with pytest.raises(ValueError, match="EQ:ABC: 1 missing_price"):
+        CSVDailyBarDataSource(
+            str(broken_csv_dir), "Equity", validation_policy="reject"
+        )
+
+    raw_ds = CSVDailyBarDataSource(str(broken_csv_dir), "Equity")
+    raw_df = raw_ds.asset_bar_frames["EQ:ABC"]
+
+    drop_ds = CSVDailyBarDataSource(
+        str(broken_csv_dir), "Equity", validation_policy="drop"
+    )
+    drop_df = drop_ds.asset_bar_frames["EQ:ABC"]
+    assert len(drop_df) == 57
+    assert drop_df.index.is_unique
+    assert raw_df.index[5] not in drop_df.index
+    assert drop_ds.validation_report.invalid_assets == ["EQ:ABC"]
+    assert drop_ds.validation_report.to_frame().loc["EQ:DEF"].sum() == 50
+
+    ffill_ds = CSVDailyBarDataSource(
+        str(broken_csv_dir), "Equity", validation_policy="ffill"
+    )
+    ffill_df = ffill_ds.asset_bar_frames["EQ:ABC"]
+    assert len(ffill_df) == 60
+    pd.testing.assert_series_equal(
+        ffill_df.iloc[5], raw_df.iloc[4], check_names=False
+    )
+    bid_ask_df = ffill_ds.asset_bid_ask_frames["EQ:ABC"]
+    assert (bid_ask_df.to_numpy() > 0.0).all()
+    pd.testing.assert_frame_equal(
+        ffill_ds.asset_bid_ask_frames["EQ:DEF"], raw_ds.asset_bid_ask_frames["EQ:DEF"]
+    )
+
+
+def test_repair_retains_bars_missing_only_volume():
+    """
+    Checks that a valid bar lacking only its volume is retained, and not
+    forward filled, by both repair policies, with forward filling only
+    dropping the invalid bars without a preceding valid bar.
+    """
+    bar_df = pd.DataFrame(
+        {
+            "Open": [0.0, 10.0, 11.0, np.nan],
+            "High": [1.0, 12.0, 13.0, 14.0],
+            "Low": [1.0, 9.0, 10.0, 11.0],
+            "Close": [1.0, 11.0, 12.0, 13.0],
+            "Adj Close": [1.0, 11.0, 12.0, 13.0],
+            "Volume": [100.0, 200.0, np.nan, 400.0],
+        },
+        index=pd.bdate_range("2020-01-01", periods=4, tz="UTC"),
+    )
+    invalid = np.array([True, False, False, True])
+    duplicated = np.zeros(4, dtype=bool)
+
+    drop_df = repair_bar_frame(bar_df, invalid, duplicated, "drop")
+    pd.testing.assert_frame_equal(drop_df, bar_df.iloc[1:3])
+
+    ffill_df = repair_bar_frame(bar_df, invalid, duplicated, "ffill")
+    assert list(ffill_df.index) == list(bar_df.index[1:])
+    pd.testing.assert_frame_equal(ffill_df.iloc[:2], bar_df.iloc[1:3])
+    pd.testing.assert_series_equal(
+        ffill_df.iloc[2], bar_df.iloc[2], check_names=False
+    )
+
+
+def test_validation_results_are_cached(broken_csv_dir, tmp_path, monkeypatch):
+    """
+    Checks that only CSV files without a cached validation
+    result are validated.
+    """
+    validated = []
+
+    def recording_validate_bar_frames(asset_bar_frames):
+        validated.append(sorted(asset_bar_frames.keys()))
+        return validate_bar_frames(asset_bar_frames)
+
+    monkeypatch.setattr(
+        daily_bar_csv, "validate_bar_frames", recording_validate_bar_frames
+    )
+    cache_dir = str(tmp_path / "cache")
+    kwargs = {"cache_dir": cache_dir, "validation_policy": "drop"}
+    first_ds = CSVDailyBarDataSource(str(broken_csv_dir), "Equity", **kwargs)
+    assert validated == [["EQ:ABC", "EQ:DEF", "EQ:GHI"], ["EQ:ABC"]]
+
+    validated.clear()
+    second_ds = CSVDailyBarDataSource(str(broken_csv_dir), "Equity", **kwargs)
+    assert validated == [[], ["EQ:ABC"]]
+    pd.testing.assert_frame_equal(
+        second_ds.validation_report.to_frame().sort_index(),
+        first_ds.validation_report.to_frame().sort_index()
+    )
+    pd.testing.assert_frame_equal(
+        second_ds.asset_bar_frames["EQ:ABC"], first_ds.asset_bar_frames["EQ:ABC"]
+    )
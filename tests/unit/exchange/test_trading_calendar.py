@@ -0,0 +1,112 @@
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.exchange.simulated_exchange import SimulatedExchange
+from qstrader.exchange.trading_calendar import TradingCalendar
+
+
+@pytest.fixture
+def calendar():
+    return TradingCalendar(
+        pd.Timestamp("2020-01-01", tz=pytz.UTC), pd.Timestamp("2020-12-31", tz=pytz.UTC)
+    )
+
+
+def test_sessions_exclude_weekends_and_holidays(calendar):
+    """
+    Checks that the 2020 NYSE holidays, including observed
+    holidays, are excluded from the trading sessions.
+    """
+    holidays = [
+        "2020-01-01", "2020-01-20", "2020-02-17", "2020-04-10", "2020-05-25",
+        "2020-07-03", "2020-09-07", "2020-11-26", "2020-12-25"
+    ]
+    assert len(calendar.sessions) == 253
+    for holiday in holidays:
+        assert not calendar.is_session(pd.Timestamp(holiday, tz=pytz.UTC))
+    assert not calendar.is_session(pd.Timestamp("2020-01-04", tz=pytz.UTC))
+    assert calendar.is_session(pd.Timestamp("2020-01-02 16:00:00", tz=pytz.UTC))
+    assert calendar.next_session(
+        pd.Timestamp("2020-07-03", tz=pytz.UTC)
+    ) == pd.Timestamp("2020-07-06", tz=pytz.UTC)
+    assert calendar.next_session(pd.Timestamp("2021-01-01", tz=pytz.UTC)) is None
+
+
+def test_sessions_before(calendar):
+    """
+    Checks that the sessions preceding a date are obtained, skipping
+    holidays and truncated at the start of the calendar.
+    """
+    assert list(calendar.sessions_before(
+        pd.Timestamp("2020-01-22 14:30:00", tz=pytz.UTC), 3
+    )) == [
+        pd.Timestamp(day, tz=pytz.UTC)
+        for day in ["2020-01-16", "2020-01-17", "2020-01-21"]
+    ]
+    assert list(calendar.sessions_before(
+        pd.Timestamp("2020-01-06", tz=pytz.UTC), 5
+    )) == [
+        pd.Timestamp(day, tz=pytz.UTC) for day in ["2020-01-02", "2020-01-03"]
+    ]
+    assert len(calendar.sessions_before(pd.Timestamp("2020-06-01", tz=pytz.UTC), 0)) == 0
+
+
+def test_early_closes(calendar):
+    """
+    Checks that the sessions following Thanksgiving and upon
+    Christmas Eve close early.
+    """
+    closes = calendar.session_closes(
+        pd.Timestamp("2020-11-25", tz=pytz.UTC), pd.Timestamp("2020-11-30", tz=pytz.UTC)
+    )
+    assert list(closes) == [
+        pd.Timestamp("2020-11-25 21:00:00", tz=pytz.UTC),
+        pd.Timestamp("2020-11-27 18:00:00", tz=pytz.UTC),
+        pd.Timestamp("2020-11-30 21:00:00", tz=pytz.UTC),
+    ]
+    assert calendar.session_closes(
+        pd.Timestamp("2020-12-24", tz=pytz.UTC), pd.Timestamp("2020-12-24", tz=pytz.UTC)
+    )[0] == pd.Timestamp("2020-12-24 18:00:00", tz=pytz.UTC)
+
+
+@pytest.mark.parametrize(
+    "dt,expected",
+    [
+        ("2020-11-25 14:29:59", False),
+        ("2020-11-25 14:30:00", True),
+        ("2020-11-25 20:59:00", True),
+        ("2020-11-26 15:00:00", False),
+        ("2020-11-27 17:00:00", True),
+        ("2020-11-27 18:00:00", False),
+        ("2020-11-28 15:00:00", False),
+        ("2020-11-30 15:00:00", True),
+    ]
+)
+def test_is_open_with_simulated_exchange(dt, expected):
+    """
+    Checks that the simulated exchange is only open within the
+    market hours of the trading sessions of its calendar.
+    """
+    calendar = TradingCalendar(
+        pd.Timestamp("2020-11-01", tz=pytz.UTC), pd.Timestamp("2020-12-31", tz=pytz.UTC)
+    )
+    exchange = SimulatedExchange(
+        pd.Timestamp("2020-11-01", tz=pytz.UTC), calendar=calendar
+    )
+    assert exchange.is_open_at_datetime(pd.Timestamp(dt, tz=pytz.UTC)) == expected
+
+
+def test_is_open_with_non_monotonic_timestamps(calendar):
+    """
+    Checks that 'is_open' queries remain correct when made
+    with decreasing timestamps.
+    """
+    assert calendar.is_open(pd.Timestamp("2020-12-30 15:00:00", tz=pytz.UTC))
+    assert not calendar.is_open(pd.Timestamp("2020-07-03 15:00:00", tz=pytz.UTC))
+    assert calendar.is_open(pd.Timestamp("2020-03-02 15:00:00", tz=pytz.UTC))
+
+
+def test_invalid_date_range():
+    with pytest.raises(ValueError):
+        TradingCalendar(pd.Timestamp("2020-02-01"), pd.Timestamp("2020-01-01"))
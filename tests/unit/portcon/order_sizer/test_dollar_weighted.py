@@ -1,5 +1,6 @@
 from unittest.mock import Mock
 
+import numpy as np
 import pandas as pd
 import pytest
 import pytz
@@ -137,6 +138,8 @@ def test_call(total_equity, cash_buffer_perc, weights, asset_prices, expected):
 
     data_handler = Mock()
     data_handler.get_asset_latest_ask_price.side_effect = lambda self, x: asset_prices[x]
+    data_handler.get_assets_latest_ask_prices.side_effect = \
+        lambda dt, assets: np.array([asset_prices[asset] for asset in assets])
 
     order_sizer = DollarWeightedCashBufferedOrderSizer(
         broker, broker_portfolio_id, data_handler, cash_buffer_perc
@@ -144,3 +147,27 @@ def test_call(total_equity, cash_buffer_perc, weights, asset_prices, expected):
 
     result = order_sizer(dt, weights)
     assert result == expected
+    assert order_sizer.size_target_quantities(dt, weights, total_equity) == {
+        asset: target["quantity"] for asset, target in expected.items()
+    }
+
+
+@pytest.mark.parametrize("asset_price", [0.0, -10.0, np.inf])
+def test_size_target_quantities_rejects_invalid_prices(asset_price):
+    """
+    Checks that prices which are not positive and finite raise,
+    rather than producing an invalid integral quantity.
+    """
+    dt = pd.Timestamp('2019-01-01 15:00:00', tz=pytz.utc)
+    broker = Mock()
+    broker.fee_model.calc_total_cost.return_value = 0.0
+    data_handler = Mock()
+    data_handler.get_assets_latest_ask_prices.return_value = np.array(
+        [100.0, asset_price]
+    )
+
+    order_sizer = DollarWeightedCashBufferedOrderSizer(broker, "1234", data_handler, 0.05)
+    with pytest.raises(ValueError):
+        order_sizer.size_target_quantities(
+            dt, {'EQ:ABC': 0.5, 'EQ:DEF': 0.5}, 1000000.0
+        )
@@ -0,0 +1,57 @@
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from qstrader.asset.universe.dynamic import DynamicUniverse
+from qstrader.signals.momentum import MomentumSignal
+from qstrader.signals.signals_collection import SignalsCollection
+
+
+def test_warm_up_matches_sequential_updates():
+    """
+    Checks that warming up the signals over many timestamps at once
+    produces the same buffers as updating them at each timestamp,
+    including for an asset entering the universe part way through.
+    """
+    start_dt = pd.Timestamp('2020-01-01 14:30:00', tz=pytz.utc)
+    dts = pd.date_range('2020-01-01 21:00', periods=8, freq='D', tz=pytz.utc)
+    prices = pd.DataFrame(
+        {
+            'EQ:ABC': np.linspace(100.0, 107.0, 8),
+            'EQ:DEF': np.linspace(50.0, 43.0, 8),
+        },
+        index=dts
+    )
+
+    data_handler = Mock()
+    data_handler.get_assets_latest_mid_prices.side_effect = (
+        lambda dt, assets: prices.loc[dt, assets].to_numpy()
+    )
+    data_handler.get_assets_mid_price_history.side_effect = (
+        lambda dts, assets: prices.loc[dts, assets].to_numpy()
+    )
+
+    def create_signals():
+        universe = DynamicUniverse({
+            'EQ:ABC': start_dt,
+            'EQ:DEF': pd.Timestamp('2020-01-04 00:00:00', tz=pytz.utc)
+        })
+        momentum = MomentumSignal(start_dt, universe, lookbacks=[3, 10])
+        return SignalsCollection({'momentum': momentum}, data_handler)
+
+    updated = create_signals()
+    for dt in dts:
+        updated.update(dt)
+    warmed = create_signals()
+    warmed.warm_up(dts)
+
+    assert warmed.warmup == updated.warmup == 8
+    assert warmed['momentum'].assets == updated['momentum'].assets
+    assert warmed['momentum'].buffers.prices.keys() == (
+        updated['momentum'].buffers.prices.keys()
+    )
+    for key, buffer in updated['momentum'].buffers.prices.items():
+        assert list(warmed['momentum'].buffers.prices[key]) == list(buffer)
+    assert len(warmed['momentum'].buffers.prices['EQ:DEF_11']) == 5
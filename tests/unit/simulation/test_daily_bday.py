@@ -2,6 +2,7 @@ import pandas as pd
 import pytest
 import pytz
 
+from qstrader.exchange.trading_calendar import TradingCalendar
 from qstrader.simulation.daily_bday import DailyBusinessDaySimulationEngine
 from qstrader.simulation.event import SimulationEvent
 
@@ -67,3 +68,57 @@ def test_daily_rebalance(
         calculated_event = sim_events[0]
         expected_event = SimulationEvent(pd.Timestamp(sim_events[1][0], tz=pytz.UTC), sim_events[1][1])
         assert calculated_event == expected_event
+
+
+def test_event_timeline_precomputed_and_shared():
+    """
+    Checks that engines over the same date range share a single
+    precomputed timeline, whose events match those created
+    without retaining them.
+    """
+    sd = pd.Timestamp('2019-12-30', tz=pytz.UTC)
+    ed = pd.Timestamp('2020-02-28', tz=pytz.UTC)
+    sim_engine = DailyBusinessDaySimulationEngine(sd, ed)
+    other_engine = DailyBusinessDaySimulationEngine(sd, ed)
+    assert other_engine.timeline is sim_engine.timeline
+    assert list(other_engine)[5] is list(sim_engine)[5]
+
+    timeline = sim_engine.timeline
+    assert len(timeline) == 4 * len(sim_engine.business_days)
+    assert timeline.timestamps.dtype == 'int64'
+    assert timeline.event_codes[:5].tolist() == [0, 1, 2, 3, 0]
+    assert timeline.index[6] == pd.Timestamp('2019-12-31 21:00:00', tz=pytz.UTC)
+
+    uncached_engine = DailyBusinessDaySimulationEngine(sd, ed, cache_events=False)
+    uncached_events = list(uncached_engine)
+    assert uncached_events == list(sim_engine)
+    assert uncached_events[5] is not list(sim_engine)[5]
+
+    no_pre_engine = DailyBusinessDaySimulationEngine(sd, ed, pre_market=False)
+    assert no_pre_engine.timeline is not sim_engine.timeline
+    assert len(no_pre_engine.timeline) == 3 * len(sim_engine.business_days)
+
+
+def test_trading_calendar_events():
+    """
+    Checks that with a trading calendar no events are generated upon
+    exchange holidays and that early closes are observed.
+    """
+    sd = pd.Timestamp('2020-11-25', tz=pytz.UTC)
+    ed = pd.Timestamp('2020-11-30', tz=pytz.UTC)
+    calendar = TradingCalendar(sd, ed)
+    sim_engine = DailyBusinessDaySimulationEngine(
+        sd, ed, pre_market=False, post_market=False, calendar=calendar
+    )
+    assert list(sim_engine) == [
+        SimulationEvent(pd.Timestamp(ts, tz=pytz.UTC), event_type)
+        for ts, event_type in [
+            ('2020-11-25 14:30:00', 'market_open'),
+            ('2020-11-25 21:00:00', 'market_close'),
+            ('2020-11-27 14:30:00', 'market_open'),
+            ('2020-11-27 18:00:00', 'market_close'),
+            ('2020-11-30 14:30:00', 'market_open'),
+            ('2020-11-30 21:00:00', 'market_close'),
+        ]
+    ]
+    assert len(sim_engine.business_days) == 3
@@ -2,6 +2,7 @@ import pandas as pd
 import pytest
 import pytz
 
+from qstrader.exchange.trading_calendar import TradingCalendar
 from qstrader.system.rebalance.buy_and_hold import BuyAndHoldRebalance
 
 
@@ -25,3 +26,15 @@ def test_buy_and_hold_rebalance(start_dt, reb_dt):
 
     assert reb.start_dt == sd
     assert reb.rebalances == [rd]
+
+
+def test_buy_and_hold_rebalance_holiday_start():
+    """
+    Checks that a buy and hold rebalance starting upon an exchange
+    holiday occurs at the same time of day on the following session.
+    """
+    sd = pd.Timestamp('2019-01-01 14:30:00', tz=pytz.UTC)
+    calendar = TradingCalendar(sd, pd.Timestamp('2019-01-31', tz=pytz.UTC))
+    reb = BuyAndHoldRebalance(start_dt=sd, calendar=calendar)
+
+    assert reb.rebalances == [pd.Timestamp('2019-01-02 14:30:00', tz=pytz.UTC)]
@@ -2,6 +2,7 @@ import pandas as pd
 import pytest
 import pytz
 
+from qstrader.exchange.trading_calendar import TradingCalendar
 from qstrader.system.rebalance.end_of_month import EndOfMonthRebalance
 
 
@@ -46,3 +47,20 @@ def test_monthly_rebalance(
     ]
 
     assert actual_datetimes == expected_datetimes
+
+
+def test_monthly_rebalance_with_trading_calendar():
+    """
+    Checks that with a trading calendar the final trading session of
+    each month is used, e.g. prior to Good Friday 2024.
+    """
+    sd = pd.Timestamp('2024-02-01', tz=pytz.UTC)
+    ed = pd.Timestamp('2024-04-30', tz=pytz.UTC)
+    calendar = TradingCalendar(sd, ed)
+    reb = EndOfMonthRebalance(
+        start_dt=sd, end_dt=ed, pre_market=True, calendar=calendar
+    )
+    assert reb.rebalances == [
+        pd.Timestamp('%s 14:30:00' % date, tz=pytz.UTC)
+        for date in ['2024-02-29', '2024-03-28', '2024-04-30']
+    ]
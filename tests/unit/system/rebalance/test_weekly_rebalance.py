@@ -2,6 +2,7 @@ import pandas as pd
 import pytest
 import pytz
 
+from qstrader.exchange.trading_calendar import TradingCalendar
 from qstrader.system.rebalance.weekly import WeeklyRebalance
 
 
@@ -62,3 +63,20 @@ def test_check_weekday_raises_value_error():
         WeeklyRebalance(
             start_date=sd, end_date=ed, weekday=weekday, pre_market=pre_market
         )
+
+
+def test_weekly_rebalance_with_trading_calendar():
+    """
+    Checks that with a trading calendar, weekdays falling upon
+    exchange holidays are rebalanced upon the following session.
+    """
+    sd = pd.Timestamp('2020-03-30', tz=pytz.UTC)
+    ed = pd.Timestamp('2020-04-30', tz=pytz.UTC)
+    calendar = TradingCalendar(sd, ed)
+    reb = WeeklyRebalance(
+        start_date=sd, end_date=ed, weekday='FRI', calendar=calendar
+    )
+    assert reb.rebalances == [
+        pd.Timestamp('%s 21:00:00' % date, tz=pytz.UTC)
+        for date in ['2020-04-03', '2020-04-13', '2020-04-17', '2020-04-24']
+    ]